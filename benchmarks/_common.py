@@ -0,0 +1,118 @@
+"""
+Общие утилиты бенчмарков: пути к src/, перцентили, вывод отчёта в JSON.
+
+Бенчмарки запускаются из корня репозитория:
+    python -m benchmarks.<name> --help
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+# код сервиса живёт в src/ (как PYTHONPATH=/app/src в образе)
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+def subprocess_env() -> dict[str, str]:
+    """Окружение для дочерних процессов бенчмарка (видят src/ и benchmarks/)."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SRC), str(ROOT), env.get("PYTHONPATH")) if p
+    )
+    return env
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией; sorted_values — отсортированы."""
+    if not sorted_values:
+        return math.nan
+    k = (len(sorted_values) - 1) * q / 100
+    lo, hi = math.floor(k), math.ceil(k)
+    if lo == hi:
+        return sorted_values[lo]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples: Iterable[float]) -> dict[str, float]:
+    """Сводка по выборке длительностей в секундах → миллисекунды."""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+def write_report(report: dict, out: str | None) -> None:
+    """Печатает отчёт и (опционально) сохраняет его в JSON-файл."""
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(text + "\n")
+        print(f"report saved to {out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def run_meta() -> dict:
+    """Контекст прогона: коммит, интерпретатор, CPU — чтобы отчёты можно было сравнивать."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def find_regressions(
+    current: dict[str, dict],
+    baseline: dict[str, dict],
+    *,
+    metrics: dict[str, bool],
+    threshold: float,
+) -> list[str]:
+    """
+    Сравнить отчёты по именам кейсов. metrics: имя метрики → True, если рост — это хуже
+    (латентность), False — если хуже падение (throughput). threshold — доля, 0.1 = 10%.
+    """
+    problems = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, higher_is_worse in metrics.items():
+            old, new = base.get(metric), cur.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change if higher_is_worse else -change) > threshold:
+                problems.append(
+                    f"{name}.{metric}: {old:.3f} → {new:.3f} ({change:+.1%})"
+                )
+    return problems
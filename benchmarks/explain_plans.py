@@ -0,0 +1,197 @@
+"""
+Страж планов запросов: горячие запросы репозиториев должны идти по своим индексам.
+
+    python -m benchmarks.explain_plans                   # БД из src/.env, миграции применены
+    python -m benchmarks.explain_plans -k email --out reports/plans.json
+
+Запрос строится настоящим методом репозитория (тот же SQL, что в проде), затем выполняется
+как EXPLAIN (FORMAT JSON) в транзакции, которая откатывается, — данные не меняются.
+В транзакции выключен seq scan (SET LOCAL enable_seqscan = off): на пустой/маленькой таблице
+планировщик и так предпочтёт seq scan, а нас интересует, может ли запрос вообще взять индекс.
+Если выражение в WHERE не совпадает с индексом (например, lower(email) без индекса на
+lower(email)), план всё равно останется Seq Scan — это и есть регрессия, exit 1.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import sqlalchemy as sa
+from sqlalchemy import event
+
+from benchmarks._common import run_meta, write_report
+
+from core.settings import settings
+from core.db_manager import DataBaseManager
+from apps.auth.models import RevokeReason
+from apps.auth.repository import AuthSessionsRepo, RefreshTokensRepo
+from apps.users.repository import UsersRepo
+
+
+class _Captured(Exception):
+    def __init__(self, stmt: sa.Executable) -> None:
+        self.stmt = stmt
+
+
+@dataclass
+class Check:
+    name: str
+    call: Callable[[Any], Awaitable[Any]]  # repo → вызов метода
+    repo: type
+    indexes: tuple[str, ...]  # какие индексы обязан использовать план
+
+
+CHECKS = [
+    Check(
+        "users.get_by_email",
+        lambda r: r.get_by_email("User@Example.com"),
+        UsersRepo,
+        ("ux_users_email_lower",),
+    ),
+    Check(
+        "users.email_exists",
+        lambda r: r.email_exists("User@Example.com"),
+        UsersRepo,
+        ("ux_users_email_lower",),
+    ),
+    Check(
+        "users.get_token_version",
+        lambda r: r.get_token_version(1),
+        UsersRepo,
+        ("users_pkey",),
+    ),
+    Check(
+        "users.search",
+        lambda r: r.search("doe", limit=21),
+        UsersRepo,
+        ("ix_users_email_trgm", "ix_users_full_name_trgm"),
+    ),
+    Check(
+        "sessions.list_active_by_user",
+        lambda r: r.list_active_by_user(1),
+        AuthSessionsRepo,
+        ("ix_auth_sessions_user_active",),
+    ),
+    Check(
+        "sessions.revoke_all_for_user_with_tokens",
+        lambda r: r.revoke_all_for_user_with_tokens(
+            1, reason=RevokeReason.PASSWORD_CHANGE
+        ),
+        AuthSessionsRepo,
+        ("ix_auth_sessions_user_active", "ix_refresh_tokens_user_active"),
+    ),
+    Check(
+        "refresh.revoke_batch_for_user",
+        lambda r: r.revoke_batch_for_user(
+            1, reason=RevokeReason.ADMIN_FORCE, limit=1000
+        ),
+        RefreshTokensRepo,
+        ("ix_refresh_tokens_user_active",),
+    ),
+    Check(
+        "refresh.get_active_by_hash",
+        lambda r: r.get_active_by_hash("0" * 64),
+        RefreshTokensRepo,
+        ("refreshtokens_token_hash_key",),
+    ),
+]
+
+
+async def capture(check: Check) -> sa.Executable:
+    """Statement, который метод репозитория отправил бы в БД (до выполнения)."""
+
+    async def fake_execute(stmt: sa.Executable, *args: Any, **kwargs: Any) -> Any:
+        raise _Captured(stmt)
+
+    repo = check.repo(session=None)
+    repo._execute = fake_execute
+    try:
+        await check.call(repo)
+    except _Captured as e:
+        return e.stmt
+    raise RuntimeError(f"{check.name}: repository method issued no statement")
+
+
+def _explain_prefix(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and context.execution_options.get("explain"):
+        statement = "EXPLAIN (FORMAT JSON) " + statement
+    return statement, parameters
+
+
+def walk(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", ()):
+        nodes += walk(child)
+    return nodes
+
+
+async def explain(db: DataBaseManager, stmt: sa.Executable) -> dict:
+    async with db.engine.connect() as conn:
+        async with conn.begin() as tx:
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            res = await conn.execute(stmt.execution_options(explain=True))
+            raw = res.scalar_one()
+            await tx.rollback()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+def verdict(check: Check, plan: dict) -> dict:
+    nodes = walk(plan)
+    used = sorted({n["Index Name"] for n in nodes if "Index Name" in n})
+    seq_scans = sorted(
+        {n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}
+    )
+    missing = [ix for ix in check.indexes if ix not in used]
+    return {
+        "ok": not missing and not seq_scans,
+        "expected_indexes": list(check.indexes),
+        "used_indexes": used,
+        "missing_indexes": missing,
+        "seq_scans": seq_scans,
+        "total_cost": plan.get("Total Cost"),
+        "nodes": [n["Node Type"] for n in nodes],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    db = DataBaseManager(url=settings.DATABASE.url)
+    event.listen(
+        db.engine.sync_engine, "before_cursor_execute", _explain_prefix, retval=True
+    )
+    results = {}
+    try:
+        for check in CHECKS:
+            if args.k and args.k not in check.name:
+                continue
+            plan = await explain(db, await capture(check))
+            row = verdict(check, plan)
+            results[check.name] = {**row, "plan": plan} if args.plans else row
+            print(
+                f"{'ok  ' if row['ok'] else 'FAIL'} {check.name:<42} "
+                f"indexes={','.join(row['used_indexes']) or '-'} "
+                f"seq_scan={','.join(row['seq_scans']) or '-'}",
+                file=sys.stderr,
+            )
+    finally:
+        await db.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN guard for hot queries")
+    parser.add_argument("-k", help="только проверки с подстрокой в имени")
+    parser.add_argument("--plans", action="store_true", help="полные планы в отчёт")
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    write_report({"meta": run_meta(), "checks": results}, args.out)
+    if not all(r["ok"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
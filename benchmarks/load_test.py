@@ -0,0 +1,303 @@
+"""
+Нагрузочный тест auth-флоу: register / login / me / refresh / logout.
+
+    python -m benchmarks.load_test --users 500 --concurrency 32 --requests 2000 --out reports/load.json
+    python -m benchmarks.load_test --base-url http://localhost:9998 --concurrency 64
+    python -m benchmarks.load_test --baseline reports/load.json --threshold 0.15
+
+- БД — из src/.env (локальный Postgres с применёнными миграциями);
+- приложение поднимается в процессе (httpx.ASGITransport + lifespan) или берётся по --base-url;
+- троттлинг логина в процессе выключен (весь трафик идёт с одного IP), --rate-limit — оставить;
+  для --base-url сервис нужно запускать с LOGIN_RATE_LIMIT_ENABLED=0;
+- сидируются N пользователей (хеш пароля считается один раз) и по сессии + паре токенов на каждого;
+- фазы идут по очереди, каждая — --requests запросов при --concurrency воркерах;
+  один пользователь в каждый момент занят одним воркером (иначе refresh словил бы reuse);
+- отчёт: rps, перцентили и коды ответов по эндпоинту; с --baseline — сравнение
+  p95/rps и exit 1 при регрессии больше --threshold.
+
+Сидированные данные удаляются в конце (--keep — оставить).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+import sqlalchemy as sa
+
+from benchmarks._common import find_regressions, run_meta, summarize, write_report
+
+from core.settings import settings
+from core.db_manager import DataBaseManager
+from core.security import pwd_hasher
+from infra.UoW import UnitOfWork
+from apps.users.models import Users
+from apps.auth.service import AuthService
+
+
+PHASES = ("register", "login", "me", "refresh", "logout")
+PASSWORD = "LoadTest-Passw0rd!"
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    access: str
+    refresh: str
+
+
+# ---- данные ----
+async def seed(db: DataBaseManager, run_id: str, count: int) -> list[VirtualUser]:
+    hashed = pwd_hasher.hash(PASSWORD)
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(count)]
+    async with UnitOfWork(db.session_factory) as uow:
+        res = await uow.session.execute(
+            sa.insert(Users).returning(Users.id, Users.email),
+            [
+                {"email": email, "hashed_password": hashed, "full_name": "Load Test"}
+                for email in emails
+            ],
+        )
+        auth = AuthService(uow=uow)
+        users = []
+        for user_id, email in res.all():
+            pair = await auth.login(
+                user_id=user_id, user_agent="load-test", ip_address="127.0.0.1"
+            )
+            users.append(VirtualUser(email, pair.access_token, pair.refresh_token))
+    return users
+
+
+async def cleanup(db: DataBaseManager, run_id: str) -> int:
+    # сессии и refresh удалятся каскадом
+    async with UnitOfWork(db.session_factory) as uow:
+        res = await uow.session.execute(
+            sa.delete(Users).where(Users.email.like(f"bench-{run_id}-%"))
+        )
+        return res.rowcount
+
+
+# ---- прогон фазы ----
+async def run_phase(
+    requests: int,
+    concurrency: int,
+    call: Callable[[int, VirtualUser | None], Awaitable[httpx.Response]],
+    pool: asyncio.Queue | None,
+    *,
+    consume: bool = False,
+) -> dict:
+    """pool — очередь свободных пользователей (None — фазе пользователь не нужен)."""
+    samples: list[float] = []
+    statuses: Counter = Counter()
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            if pool is not None:
+                if consume and pool.empty():
+                    return
+                user = await pool.get()
+            else:
+                user = None
+            started = time.perf_counter()
+            try:
+                resp = await call(i, user)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            else:
+                samples.append(time.perf_counter() - started)
+                statuses[str(resp.status_code)] += 1
+            finally:
+                if user is not None and not consume:
+                    pool.put_nowait(user)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ok = sum(v for k, v in statuses.items() if k.startswith("2"))
+    return {
+        **summarize(samples),
+        "elapsed_s": elapsed,
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "ok": ok,
+        "statuses": dict(statuses),
+    }
+
+
+def make_calls(client: httpx.AsyncClient, run_id: str) -> dict:
+    prefix = settings.API_V1_PREFIX
+
+    def bearer(token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    registered = itertools.count()  # сквозной номер: прогрев и замер не пересекаются
+
+    async def register(_: int, __: VirtualUser | None) -> httpx.Response:
+        return await client.post(
+            f"{prefix}/users/register",
+            json={
+                "email": f"bench-{run_id}-reg-{next(registered)}@example.com",
+                "password": PASSWORD,
+                "full_name": "Load Test",
+            },
+        )
+
+    async def login(_: int, user: VirtualUser) -> httpx.Response:
+        return await client.post(
+            f"{prefix}/auth/login", json={"email": user.email, "password": PASSWORD}
+        )
+
+    async def me(_: int, user: VirtualUser) -> httpx.Response:
+        return await client.get(f"{prefix}/users/me", headers=bearer(user.access))
+
+    async def refresh(_: int, user: VirtualUser) -> httpx.Response:
+        resp = await client.post(f"{prefix}/auth/refresh", headers=bearer(user.refresh))
+        if resp.status_code == 200:
+            pair = resp.json()
+            user.access, user.refresh = pair["access_token"], pair["refresh_token"]
+        return resp
+
+    async def logout(_: int, user: VirtualUser) -> httpx.Response:
+        return await client.post(f"{prefix}/auth/logout", headers=bearer(user.refresh))
+
+    return {
+        "register": register,
+        "login": login,
+        "me": me,
+        "refresh": refresh,
+        "logout": logout,
+    }
+
+
+async def drive(client: httpx.AsyncClient, args, run_id, users) -> dict:
+    pool: asyncio.Queue[VirtualUser] = asyncio.Queue()
+    for user in users:
+        pool.put_nowait(user)
+    calls = make_calls(client, run_id)
+
+    results = {}
+    for phase in args.phases:
+        uses_pool = phase != "register"
+        consume = phase == "logout"  # после logout токены пользователя мертвы
+        if args.warmup and not consume:
+            await run_phase(
+                args.warmup,
+                args.concurrency,
+                calls[phase],
+                pool if uses_pool else None,
+            )
+        results[phase] = await run_phase(
+            args.requests,
+            args.concurrency,
+            calls[phase],
+            pool if uses_pool else None,
+            consume=consume,
+        )
+        r = results[phase]
+        print(
+            f"{phase:<9} {r['rps']:8.1f} req/s  p50={r.get('p50_ms', 0):7.1f}ms "
+            f"p95={r.get('p95_ms', 0):7.1f}ms p99={r.get('p99_ms', 0):7.1f}ms  "
+            f"{r['statuses']}",
+            file=sys.stderr,
+        )
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    db = DataBaseManager(url=settings.DATABASE.url)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        users = await seed(db, run_id, args.users)
+        print(f"seeded {len(users)} users (run {run_id})", file=sys.stderr)
+
+        if args.base_url:
+            async with httpx.AsyncClient(
+                base_url=args.base_url, limits=limits, timeout=args.timeout
+            ) as client:
+                endpoints = await drive(client, args, run_id, users)
+        else:
+            from asgi_lifespan import LifespanManager
+
+            from main import app
+            from apps.auth.throttling import login_limiter
+
+            login_limiter.enabled = args.rate_limit
+            async with LifespanManager(app):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url="http://load-test",
+                    limits=limits,
+                    timeout=args.timeout,
+                ) as client:
+                    endpoints = await drive(client, args, run_id, users)
+    finally:
+        if not args.keep:
+            await cleanup(db, run_id)
+        await db.dispose()
+
+    return {
+        "meta": run_meta(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Auth flows load test")
+    parser.add_argument(
+        "--base-url", help="бить в запущенный сервис (иначе — in-process)"
+    )
+    parser.add_argument(
+        "--users", type=int, default=200, help="сколько пользователей сидировать"
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="запросов на фазу")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="прогревочных запросов на фазу"
+    )
+    parser.add_argument("--phases", nargs="*", choices=PHASES, default=list(PHASES))
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="не выключать троттлинг логина"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="не удалять сидированные данные"
+    )
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    parser.add_argument("--baseline", help="JSON-отчёт прошлого прогона для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="допустимая деградация (доля)"
+    )
+    args = parser.parse_args()
+
+    if args.users < args.concurrency:
+        parser.error("--users должно быть не меньше --concurrency")
+
+    report = asyncio.run(run(args))
+    write_report(report, args.out)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = find_regressions(
+            report["endpoints"],
+            baseline["endpoints"],
+            metrics={"p95_ms": True, "rps": False},
+            threshold=args.threshold,
+        )
+        for line in problems:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
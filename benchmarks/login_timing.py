@@ -0,0 +1,144 @@
+"""
+Различимость логина по времени: «неверный пароль» против «нет такого пользователя».
+
+    python -m benchmarks.login_timing --rps 20 --seconds 30 --strategy dummy
+    python -m benchmarks.login_timing --strategy sleep --db-latency-ms 1 --max-ks 0.1
+
+Настоящий UsersService.authenticate и pwd_hasher (тот же пул потоков), без БД и сети:
+репозиторий — словарь в памяти, --db-latency-ms имитирует round trip get_by_email.
+Запросы приходят с постоянной частотой --rps (открытая модель: очередь в пуле растёт,
+если verify не успевает), классы попыток перемешаны:
+- known          — email существует, пароль неверный;
+- unknown_fresh  — каждый раз новый email (мимо негативного кэша, с запросом в БД);
+- unknown_repeat — один и тот же несуществующий email (попадание в негативный кэш).
+
+Для каждого класса — сводка латентности и статистика Колмогорова–Смирнова против known
+(0 — распределения совпадают, 1 — не пересекаются). exit 1, если KS больше --max-ks.
+"""
+
+import argparse
+import asyncio
+import bisect
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks._common import run_meta, summarize, write_report
+
+from core.security import TIMING_STRATEGIES, pwd_hasher
+from apps.users.cache import unknown_emails
+from apps.users.service import UsersService
+from api.v1.users.exceptions import UserNotFoundError, WrongPasswordError
+
+CLASSES = ("known", "unknown_fresh", "unknown_repeat")
+
+
+class MemoryUsersRepo:
+    def __init__(self, users: dict[str, SimpleNamespace], latency: float) -> None:
+        self.users = users
+        self.latency = latency
+
+    async def get_by_email(self, email: str) -> SimpleNamespace | None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.users.get(email.strip().lower())
+
+
+def ks_statistic(a: list[float], b: list[float]) -> float:
+    """Двухвыборочная статистика KS: max |F_a(x) - F_b(x)|."""
+    if not a or not b:
+        return float("nan")
+    a, b = sorted(a), sorted(b)
+    return max(
+        abs(bisect.bisect_right(a, x) / len(a) - bisect.bisect_right(b, x) / len(b))
+        for x in a + b
+    )
+
+
+async def attempt(service: UsersService, email: str) -> float:
+    started = time.perf_counter()
+    try:
+        await service.authenticate(email=email, raw_password="wrong-password")
+    except (UserNotFoundError, WrongPasswordError):
+        pass
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> dict:
+    pwd_hasher.configure(bcrypt_rounds=args.bcrypt_rounds)
+    pwd_hasher.timing = args.strategy
+    pwd_hasher.warmup()
+
+    known = SimpleNamespace(id=1, hashed_password=pwd_hasher.hash("right-password"))
+    repo = MemoryUsersRepo({"known@example.com": known}, args.db_latency_ms / 1000)
+    service = UsersService(uow=SimpleNamespace(users=repo))
+
+    # прогрев: EWMA для sleep и сам пул потоков
+    for _ in range(3):
+        await attempt(service, "known@example.com")
+
+    rng = random.Random(args.seed)
+    samples: dict[str, list[float]] = {name: [] for name in CLASSES}
+    tasks = []
+
+    async def one(cls: str, n: int) -> None:
+        email = {
+            "known": "known@example.com",
+            "unknown_fresh": f"nobody-{n}@example.com",
+            "unknown_repeat": "nobody@example.com",
+        }[cls]
+        samples[cls].append(await attempt(service, email))
+
+    interval = 1 / args.rps
+    started = time.perf_counter()
+    for n in range(int(args.rps * args.seconds)):
+        # следующий запрос — по расписанию, а не по завершении предыдущего
+        delay = started + n * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(rng.choice(CLASSES), n)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    await unknown_emails.discard("nobody@example.com")
+
+    return {
+        "strategy": args.strategy,
+        "achieved_rps": len(tasks) / elapsed,
+        "latency": {name: summarize(values) for name, values in samples.items()},
+        "ks_vs_known": {
+            name: ks_statistic(samples["known"], samples[name]) for name in CLASSES[1:]
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login timing side-channel check")
+    parser.add_argument("--strategy", choices=TIMING_STRATEGIES, default="dummy")
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0)
+    parser.add_argument("--max-ks", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    for name, stats in result["latency"].items():
+        ks = result["ks_vs_known"].get(name)
+        print(
+            f"{name:<15} n={stats.get('count', 0):<5} "
+            f"p50={stats.get('p50_ms', 0):7.1f}ms p99={stats.get('p99_ms', 0):7.1f}ms"
+            + (f" ks={ks:.3f}" if ks is not None else ""),
+            file=sys.stderr,
+        )
+    write_report({"meta": run_meta(), "args": vars(args), **result}, args.out)
+    if args.max_ks is not None and any(
+        ks > args.max_ks for ks in result["ks_vs_known"].values()
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
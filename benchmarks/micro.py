@@ -0,0 +1,232 @@
+"""
+Микробенчмарки строительных блоков запроса: JWT, хеш refresh, хеширование паролей, pydantic.
+
+    python -m benchmarks.micro                        # все кейсы
+    python -m benchmarks.micro -k jwt                 # только с подстрокой в имени
+    python -m benchmarks.micro --save main            # сохранить базу в benchmarks/.baselines/main.json
+    python -m benchmarks.micro --compare main         # сравнить с базой (exit 1 при регрессии)
+
+Каждый кейс — timeit: число вызовов подбирается так, чтобы повтор шёл ≥ --min-time,
+в отчёт идут min/median на вызов (мкс) и вызовов/сек по медиане.
+JWT меряется для алгоритма из настроек и для RS256/ES256/EdDSA/HS256 на временных ключах.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from uuid import uuid4
+
+from benchmarks._common import ROOT, find_regressions, run_meta, write_report
+
+from core.settings import settings
+from core.security import PasswordHasher
+from apps.auth.utils import JWTUtil, jwt_util
+from apps.auth.service import _hash_refresh
+from apps.auth.schemas import TokenPair, SessionRead
+from apps.users.schemas import UserRead
+
+
+BASELINES = ROOT / "benchmarks" / ".baselines"
+PASSWORD = "Micro-Benchmark-Passw0rd"
+
+
+def _write_keys(directory: Path, algorithm: str) -> dict:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if algorithm == "HS256":
+        secret = uuid4().hex * 2
+        (directory / "hs.key").write_text(secret)
+        return {
+            "private_key_path": directory / "hs.key",
+            "public_key_path": directory / "hs.key",
+        }
+
+    key = {
+        "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": ed25519.Ed25519PrivateKey.generate,
+    }[algorithm]()
+    private = directory / f"{algorithm}.pem"
+    public = directory / f"{algorithm}.pub.pem"
+    private.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return {"private_key_path": private, "public_key_path": public}
+
+
+def _jwt_cases(util: JWTUtil, label: str) -> dict[str, Callable[[], object]]:
+    extra = {"sid": str(uuid4()), "fam": str(uuid4()), "jti": str(uuid4())}
+    token = util.encode_jwt(
+        user_id=42, token_type=util.refresh_token_type, extra=extra
+    ).token
+    return {
+        f"jwt.encode[{label}]": lambda: util.encode_jwt(
+            user_id=42, token_type=util.refresh_token_type, extra=extra
+        ),
+        f"jwt.decode[{label}]": lambda: util.decode_jwt(token),
+    }
+
+
+def build_cases(tmp: Path, algorithms: list[str]) -> dict[str, Callable[[], object]]:
+    cases: dict[str, Callable[[], object]] = {}
+
+    # ---- JWT ----
+    cases.update(_jwt_cases(jwt_util, f"{jwt_util.algorithm},settings"))
+    for algorithm in algorithms:
+        cfg = settings.AUTH_JWT.model_copy(
+            update={"algorithm": algorithm, **_write_keys(tmp, algorithm)}
+        )
+        cases.update(_jwt_cases(JWTUtil(cfg), algorithm))
+
+    # ---- refresh hash ----
+    refresh = jwt_util.encode_jwt(
+        user_id=42, token_type=jwt_util.refresh_token_type
+    ).token
+    cases["refresh.sha256"] = lambda: _hash_refresh(refresh)
+
+    # ---- пароли (параметры из настроек) ----
+    cfg = settings.PASSWORD
+    for scheme in ("bcrypt", "argon2"):
+        hasher = PasswordHasher(
+            scheme,
+            bcrypt_rounds=cfg.bcrypt_rounds,
+            argon2_memory_cost=cfg.argon2_memory_cost,
+            argon2_time_cost=cfg.argon2_time_cost,
+            argon2_parallelism=cfg.argon2_parallelism,
+        )
+        stored = hasher.hash(PASSWORD)
+        cases[f"password.hash[{scheme}]"] = lambda h=hasher: h.hash(PASSWORD)
+        cases[f"password.verify[{scheme}]"] = lambda h=hasher, s=stored: h.verify(
+            PASSWORD, s
+        )
+
+    # ---- pydantic ----
+    now = datetime.now(timezone.utc)
+    pair = TokenPair(access_token=refresh, refresh_token=refresh, expires_in=900)
+    user = UserRead(
+        id=42,
+        email="user@example.com",
+        full_name="Jane Doe",
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+    session = SessionRead(
+        session_id=uuid4(),
+        user_agent="Mozilla/5.0 (X11; Linux x86_64)",
+        ip_address="203.0.113.7",
+        created_at=now,
+        last_seen_at=now,
+    )
+    for name, model in (
+        ("TokenPair", pair),
+        ("UserRead", user),
+        ("SessionRead", session),
+    ):
+        raw = model.model_dump_json()
+        cases[f"pydantic.dump_json[{name}]"] = model.model_dump_json
+        cases[f"pydantic.validate_json[{name}]"] = (
+            lambda cls=type(model), raw=raw: cls.model_validate_json(raw)
+        )
+    return cases
+
+
+def measure(fn: Callable[[], object], *, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        # подогнать число вызовов под min_time (с запасом)
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    per_call = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    median = statistics.median(per_call)
+    return {
+        "number": number,
+        "min_us": min(per_call) * 1e6,
+        "median_us": median * 1e6,
+        "ops_per_sec": 1 / median if median else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks")
+    parser.add_argument("-k", dest="filter", help="подстрока в имени кейса")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="сек на повтор")
+    parser.add_argument(
+        "--jwt-algorithms",
+        nargs="*",
+        default=["RS256", "ES256", "EdDSA", "HS256"],
+        choices=["RS256", "ES256", "EdDSA", "HS256"],
+    )
+    parser.add_argument("--save", metavar="NAME", help="сохранить как базу")
+    parser.add_argument("--compare", metavar="NAME", help="сравнить с базой")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="допустимый рост (доля)"
+    )
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(Path(tmp), args.jwt_algorithms)
+        if args.filter:
+            cases = {k: v for k, v in cases.items() if args.filter in k}
+
+        baseline = {}
+        if args.compare:
+            baseline = json.loads((BASELINES / f"{args.compare}.json").read_text())[
+                "cases"
+            ]
+
+        results = {}
+        for name, fn in cases.items():
+            results[name] = measure(fn, repeat=args.repeat, min_time=args.min_time)
+            r = results[name]
+            line = f"{name:<36} {r['median_us']:12.2f} µs  {r['ops_per_sec']:12.1f}/s"
+            if name in baseline:
+                old = baseline[name]["median_us"]
+                line += f"  (base {old:.2f} µs, {(r['median_us'] - old) / old:+.1%})"
+            print(line, file=sys.stderr)
+
+    report = {"meta": run_meta(), "cases": results}
+    write_report(report, args.out)
+
+    if args.save:
+        BASELINES.mkdir(parents=True, exist_ok=True)
+        (BASELINES / f"{args.save}.json").write_text(
+            json.dumps(report, indent=2) + "\n"
+        )
+        print(f"baseline saved as {args.save}", file=sys.stderr)
+
+    if baseline:
+        problems = find_regressions(
+            results, baseline, metrics={"median_us": True}, threshold=args.threshold
+        )
+        for line in problems:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
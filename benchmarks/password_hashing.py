@@ -0,0 +1,151 @@
+"""
+Бенчмарк схем хеширования паролей (bcrypt / argon2id) для выбора параметров.
+
+    python -m benchmarks.password_hashing \
+        --bcrypt-rounds 10 11 12 --argon2 19456,2,1 65536,3,4 --threads 1 4
+
+Каждая конфигурация меряется в отдельном процессе (честный peak RSS):
+- verify: латентность одной проверки (p50/p95);
+- throughput: verify/сек при N потоках — сколько логинов в секунду «вытянет» под;
+- peak_rss_mb: пиковая память процесса (argon2 — memory_cost на каждый параллельный хеш).
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._common import ROOT, subprocess_env, summarize, write_report
+
+
+def _rss_mb() -> float:
+    # ru_maxrss в Linux — KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _params_label(stored: str) -> str:
+    # "$2b$12" / "$argon2id$v=19$m=65536,t=3,p=4" — без соли и чексуммы
+    parts = stored.split("$")
+    return "$".join(parts[:3] if parts[1].startswith("2") else parts[:4])
+
+
+def _worker(config: dict, iterations: int, threads: list[int]) -> dict:
+    from core.security import PasswordHasher
+
+    rss_before = _rss_mb()
+    hasher = PasswordHasher(config["scheme"], **config["params"])
+    stored = hasher.hash("benchmark-password")
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        hasher.verify("benchmark-password", stored)
+        samples.append(time.perf_counter() - started)
+
+    throughput = {}
+    for n in threads:
+        total = iterations * n
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            started = time.perf_counter()
+            list(
+                pool.map(
+                    lambda _: hasher.verify("benchmark-password", stored), range(total)
+                )
+            )
+            elapsed = time.perf_counter() - started
+        throughput[str(n)] = total / elapsed
+
+    return {
+        **config,
+        "hash_prefix": _params_label(stored),
+        "verify": summarize(samples),
+        "verify_per_sec_by_threads": throughput,
+        "peak_rss_mb": _rss_mb(),
+        "rss_delta_mb": _rss_mb() - rss_before,
+    }
+
+
+def _configs(args: argparse.Namespace) -> list[dict]:
+    configs = [
+        {"scheme": "bcrypt", "params": {"bcrypt_rounds": rounds}}
+        for rounds in args.bcrypt_rounds
+    ]
+    for spec in args.argon2:
+        memory, time_cost, parallelism = (int(x) for x in spec.split(","))
+        configs.append(
+            {
+                "scheme": "argon2",
+                "params": {
+                    "argon2_memory_cost": memory,
+                    "argon2_time_cost": time_cost,
+                    "argon2_parallelism": parallelism,
+                },
+            }
+        )
+    return configs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing benchmark")
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12])
+    parser.add_argument(
+        "--argon2",
+        nargs="*",
+        default=["19456,2,1", "65536,3,4"],
+        help="memory_kib,time_cost,parallelism",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--threads", type=int, nargs="*", default=sorted({1, os.cpu_count() or 1})
+    )
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(
+            json.dumps(_worker(json.loads(args.worker), args.iterations, args.threads))
+        )
+        return
+
+    results = []
+    for config in _configs(args):
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.password_hashing",
+                "--worker",
+                json.dumps(config),
+                "--iterations",
+                str(args.iterations),
+                "--threads",
+                *map(str, args.threads),
+            ],
+            cwd=ROOT,
+            env=subprocess_env(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        per_sec = ", ".join(
+            f"{n}t={v:.1f}/s" for n, v in result["verify_per_sec_by_threads"].items()
+        )
+        print(
+            f"{result['hash_prefix']:<40} verify p50={result['verify']['p50_ms']:.1f}ms "
+            f"p95={result['verify']['p95_ms']:.1f}ms | {per_sec} | "
+            f"peak RSS={result['peak_rss_mb']:.0f}MB",
+            file=sys.stderr,
+        )
+
+    write_report({"cpu_count": os.cpu_count(), "results": results}, args.out)
+
+
+if __name__ == "__main__":
+    main()
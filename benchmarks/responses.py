@@ -0,0 +1,172 @@
+"""
+CPU на формирование ответа: «dict/ORM + response_model» против готовой модели (PydanticResponse).
+
+    python -m benchmarks.responses --requests 20000 --sessions 10
+
+Два мини-приложения FastAPI с формой ответов /auth/refresh (TokenPair) и /auth/sessions
+(list[SessionRead] из ORM-подобных объектов), без БД и сети: запросы подаются прямо
+в ASGI-приложение, меряется CPU процесса на запрос. Разница — стоимость повторной
+валидации по response_model, jsonable-дампа и json.dumps, которых нет в быстром пути.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from ipaddress import ip_address
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import FastAPI
+
+from benchmarks._common import run_meta, write_report
+
+from core.responses import FastJSONResponse, PydanticResponse
+from apps.auth.schemas import TokenPair, SessionRead, SessionReadList
+
+
+def build_app(fast: bool, sessions: int) -> FastAPI:
+    now = datetime.now(timezone.utc)
+    token = "x" * 600  # длина RS256-токена порядка реальной
+    rows = [
+        SimpleNamespace(
+            session_id=uuid4(),
+            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+            ip_address=ip_address("203.0.113.7"),
+            created_at=now,
+            last_seen_at=now,
+            user_id=42,
+            revoked_at=None,
+        )
+        for _ in range(sessions)
+    ]
+
+    if fast:
+        app = FastAPI(default_response_class=FastJSONResponse)
+
+        @app.post("/refresh", response_model=TokenPair)
+        async def refresh_fast():
+            return PydanticResponse(
+                TokenPair.model_construct(
+                    access_token=token,
+                    refresh_token=token,
+                    token_type="Bearer",
+                    expires_in=900,
+                )
+            )
+
+        @app.get("/sessions", response_model=list[SessionRead])
+        async def sessions_fast():
+            items = SessionReadList.validate_python(rows, from_attributes=True)
+            return PydanticResponse(items, adapter=SessionReadList)
+
+    else:
+        app = FastAPI()
+
+        @app.post("/refresh", response_model=TokenPair)
+        async def refresh_legacy():
+            return {
+                "access_token": token,
+                "refresh_token": token,
+                "token_type": "Bearer",
+                "expires_in": 900,
+            }
+
+        @app.get("/sessions", response_model=list[SessionRead])
+        async def sessions_legacy():
+            return rows
+
+    return app
+
+
+async def call(app: FastAPI, method: str, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.sleep(3600)
+        sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: FastAPI, method: str, path: str, requests: int) -> dict:
+    for _ in range(min(200, requests)):  # прогрев (роутинг, кэши pydantic)
+        assert await call(app, method, path) == 200
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        await call(app, method, path)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    return {
+        "cpu_us_per_request": cpu / requests * 1e6,
+        "wall_us_per_request": wall / requests * 1e6,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    apps = {
+        "legacy": build_app(False, args.sessions),
+        "fast": build_app(True, args.sessions),
+    }
+    results = {}
+    for endpoint, method in (("refresh", "POST"), ("sessions", "GET")):
+        row = {
+            variant: await measure(app, method, f"/{endpoint}", args.requests)
+            for variant, app in apps.items()
+        }
+        legacy, fast = (row[v]["cpu_us_per_request"] for v in ("legacy", "fast"))
+        row["cpu_saved_us"] = legacy - fast
+        row["cpu_saved_pct"] = (legacy - fast) / legacy * 100 if legacy else 0.0
+        results[endpoint] = row
+        print(
+            f"{endpoint:<9} legacy={legacy:8.1f}µs  fast={fast:8.1f}µs  "
+            f"saved={row['cpu_saved_us']:7.1f}µs ({row['cpu_saved_pct']:.0f}%)",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=10, help="строк в /sessions")
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    write_report(
+        {
+            "meta": run_meta(),
+            "config": {"requests": args.requests, "sessions": args.sessions},
+            "endpoints": results,
+        },
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
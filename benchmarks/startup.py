@@ -0,0 +1,187 @@
+"""
+Холодный старт сервиса: импорт, lifespan, первая генерация OpenAPI + отчёт -X importtime.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --budget-ms 1500            # exit 1, если import+lifespan дольше
+    python -m benchmarks.startup --runs 5 --baseline reports/startup.json --threshold 0.15
+
+Каждый прогон — отдельный процесс `python -X importtime` (честный холодный импорт):
+- import_ms   — `import main` (все модули сервиса и зависимостей);
+- lifespan_ms — вход в lifespan до готовности (прогрев ключей JWT и passlib, engine, очередь rehash);
+  БД не нужна — соединения открываются лениво;
+- openapi_ms  — первая сборка схемы (FastAPI строит её лениво, на первом /openapi.json);
+- ready_ms    — import + lifespan: через сколько под начнёт принимать трафик.
+По importtime — самые дорогие модули (кумулятивно и собственное время) и сумма по пакетам
+верхнего уровня; берётся медианный прогон.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks._common import (
+    ROOT,
+    find_regressions,
+    run_meta,
+    subprocess_env,
+    write_report,
+)
+
+
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+STAGES = ("import_ms", "lifespan_ms", "openapi_ms", "ready_ms")
+
+
+def _worker() -> dict:
+    started = time.perf_counter()
+    import main
+
+    import_s = time.perf_counter() - started
+
+    from core.metrics import STARTUP_SECONDS
+
+    async def lifespan() -> float:
+        begin = time.perf_counter()
+        async with main.app.router.lifespan_context(main.app):
+            return time.perf_counter() - begin
+
+    lifespan_s = asyncio.run(lifespan())
+
+    begin = time.perf_counter()
+    main.app.openapi()
+    openapi_s = time.perf_counter() - begin
+
+    return {
+        "import_ms": import_s * 1000,
+        "lifespan_ms": lifespan_s * 1000,
+        "openapi_ms": openapi_s * 1000,
+        "ready_ms": (import_s + lifespan_s) * 1000,
+        "lifespan_stages_ms": {
+            key[0]: value * 1000 for key, value in STARTUP_SECONDS._values.items()
+        },
+    }
+
+
+def parse_importtime(stderr: str, root: str = "main") -> list[tuple[str, int, int]]:
+    """Поддерево импорта root: [(модуль, self_us, cumulative_us)]."""
+    pending: list[tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = int(m[1]), int(m[2]), len(m[3]), m[4]
+        pending.append((name, self_us, cum_us))
+        if indent == 1:  # модуль верхнего уровня: его дети — строки перед ним
+            if name == root:
+                return pending
+            pending = []
+    return pending
+
+
+def import_report(modules: list[tuple[str, int, int]], top: int) -> dict:
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+    return {
+        "top_cumulative_ms": {
+            name: cum / 1000
+            for name, _, cum in sorted(modules, key=lambda m: -m[2])[:top]
+        },
+        "top_self_ms": {
+            name: own / 1000
+            for name, own, _ in sorted(modules, key=lambda m: -m[1])[:top]
+        },
+        "by_package_ms": {
+            pkg: us / 1000
+            for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]
+        },
+    }
+
+
+def run_once() -> tuple[dict, list[tuple[str, int, int]]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--worker"],
+        cwd=ROOT,
+        env=subprocess_env(),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"worker failed with exit code {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(
+        proc.stderr
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start / import time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20, help="строк в топах importtime")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="бюджет ready_ms (медиана), exit 1 при превышении",
+    )
+    parser.add_argument("--out", help="куда сохранить JSON-отчёт")
+    parser.add_argument("--baseline", help="JSON-отчёт прошлого прогона для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="допустимая деградация (доля)"
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker()))
+        return
+
+    runs = []
+    for i in range(args.runs):
+        result, modules = run_once()
+        runs.append((result, modules))
+        print(
+            f"run {i + 1}: import={result['import_ms']:.0f}ms "
+            f"lifespan={result['lifespan_ms']:.0f}ms openapi={result['openapi_ms']:.0f}ms "
+            f"ready={result['ready_ms']:.0f}ms",
+            file=sys.stderr,
+        )
+
+    summary = {stage: statistics.median(r[stage] for r, _ in runs) for stage in STAGES}
+    median_run = min(runs, key=lambda r: abs(r[0]["ready_ms"] - summary["ready_ms"]))
+    report = {
+        "meta": run_meta(),
+        "config": {"runs": args.runs},
+        "startup": {"median": summary},
+        "lifespan_stages_ms": median_run[0]["lifespan_stages_ms"],
+        "imports": import_report(median_run[1], args.top),
+    }
+    write_report(report, args.out)
+
+    problems = []
+    if args.budget_ms is not None and summary["ready_ms"] > args.budget_ms:
+        problems.append(
+            f"ready_ms {summary['ready_ms']:.0f} > budget {args.budget_ms:.0f}"
+        )
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems += find_regressions(
+            report["startup"],
+            baseline["startup"],
+            metrics={stage: True for stage in STAGES},
+            threshold=args.threshold,
+        )
+    for line in problems:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,6 @@ fi
 echo "Running migrations..."
 alembic upgrade head
 
-# Стартуем API
-echo "Starting uvicorn..."
-exec uvicorn main:app --host 0.0.0.0 --port ${SERVICE_PORT:-9998} --app-dir /app/src
+# Стартуем API: SERVICE_WORKERS воркеров uvicorn (по умолчанию — по числу CPU), см. src/server.py
+echo "Starting uvicorn workers..."
+exec python -m server --host 0.0.0.0 --port ${SERVICE_PORT:-9998}
@@ -0,0 +1,177 @@
+"""
+ASGI-middleware уровня приложения.
+
+TracingMiddleware — корневой спан OpenTelemetry на запрос (при включённой трассировке).
+ProfilingMiddleware — сэмплирующий профиль запроса по заголовку (только суперпользователь).
+MetricsMiddleware — чистый ASGI (без BaseHTTPMiddleware, чтобы не добавлять
+лишнюю задачу и копирование тела на каждый запрос): считает запросы «в полёте»
+и пишет латентность в гистограмму с меткой шаблона роута (/users/{id}, а не /users/42).
+"""
+
+import time
+from uuid import uuid4
+
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+from core.profiler import MODES, profiling
+from core.tracing import tracing
+from infra.UoW import UnitOfWork
+from apps.auth.revocation import is_token_current
+from apps.auth.utils import jwt_util
+from apps.users.service import UsersService
+from api.v1.api_depends import check_superuser
+from api.v1.auth.exceptions import TokenExpiredError, TokenInvalidError
+from api.v1.users.exceptions import CurrentUserNotFoundError, UserInactiveError
+from api.v1.admin.exceptions import NotSuperuserError
+
+
+# служебные пути (метрики, пробы оркестратора) — не меряем и не трассируем
+OPS_PATHS = ("/metrics", "/health/live", "/health/ready", "/health/pool")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, *, skip_paths: tuple[str, ...] = OPS_PATHS):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # роутер FastAPI кладёт сматченный роут в scope; не сматчилось — не плодим метки
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status_code),
+            )
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, *, skip_paths: tuple[str, ...] = OPS_PATHS):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not tracing.enabled
+            or scope["type"] != "http"
+            or scope["path"] in self.skip_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        carrier = {
+            k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]
+        }
+        with tracing.server_span(
+            method,
+            carrier,
+            **{"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+
+
+class ProfilingMiddleware:
+    """
+    Профиль одного запроса по заголовку (PROFILING_HEADER: wall | cpu) — только для
+    суперпользователя с access-токеном и при PROFILING_ENABLED=1. Профиль сохраняется
+    в памяти воркера, в ответ уходит его id (X-Profile-Id) для
+    GET /auth_api/v1/admin/profile/requests/{id}.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not profiling.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = profiling.cfg.header.lower().encode("latin-1")
+        headers = dict(scope["headers"])
+        mode = headers.get(header, b"").decode("latin-1").lower()
+        if mode not in MODES or not await self._is_superuser(scope, headers):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = profiling.try_start(
+            mode=mode, interval=profiling.cfg.request_interval_ms / 1000
+        )
+        if profiler is None:  # идёт другая съёмка
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = profiling.finish(profiler)
+            profiling.remember(
+                scope["method"], scope["path"], status_code, profile, profile_id
+            )
+
+    @staticmethod
+    async def _is_superuser(scope: Scope, headers: dict[bytes, bytes]) -> bool:
+        scheme, token = get_authorization_scheme_param(
+            headers.get(b"authorization", b"").decode("latin-1")
+        )
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            payload = jwt_util.decode_jwt(token)
+        except (TokenExpiredError, TokenInvalidError):
+            return False
+        if jwt_util.get_type(payload) != jwt_util.access_token_type:
+            return False
+        # те же проверки, что у AccessJWT + SuperuserDep: отзыв токена и флаги из БД
+        async with UnitOfWork(scope["app"].state.db.session_factory) as uow:
+            if not await is_token_current(payload, uow.users.get_token_version):
+                return False
+            try:
+                await check_superuser(UsersService(uow=uow), int(payload["user_id"]))
+            except (CurrentUserNotFoundError, UserInactiveError, NotSuperuserError):
+                return False
+        return True
@@ -0,0 +1,126 @@
+"""
+Служебные эндпоинты (вне /auth_api/v1 и вне OpenAPI): метрики Prometheus и пробы.
+
+- /health/live  — процесс жив и event loop отвечает; без I/O;
+- /health/ready — БД доступна: результат кэшируется на DB_HEALTH_CACHE_SEC и берётся
+  в том числе от обычного трафика, ping — не чаще раза за этот интервал на воркер
+  (см. DataBaseManager.health); 503, если БД не ответила;
+- /health/pool  — состояние пула соединений воркера; без I/O.
+"""
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from core.settings import settings
+from core.metrics import REGISTRY, CallbackGauge
+from core.responses import FastJSONResponse
+from apps.users.cache import user_cache
+
+
+router = APIRouter(tags=["Ops"], include_in_schema=False)
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PrometheusResponse)
+async def metrics() -> str:
+    return REGISTRY.render()
+
+
+@router.get("/health/live")
+async def health_live() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def health_ready(request: Request) -> FastJSONResponse:
+    db = await request.app.state.db.health(
+        max_age=settings.DATABASE.HEALTH_CACHE_SEC,
+        timeout=settings.DATABASE.HEALTH_TIMEOUT_SEC,
+    )
+    return FastJSONResponse(
+        {"status": "ready" if db.ok else "not_ready", "db": db.as_dict()},
+        status_code=200 if db.ok else 503,
+    )
+
+
+@router.get("/health/pool")
+async def health_pool(request: Request) -> dict:
+    db = request.app.state.db
+    return {
+        **db.pool_stats(),
+        "max_overflow": db.max_overflow,
+        "workers": settings.SERVICE_WORKERS or 1,
+    }
+
+
+def register_app_metrics(app: FastAPI) -> None:
+    """
+    Метрики, которые читают состояние объектов из app.state (пул БД, очереди rehash и аудита).
+    Вызывать в lifespan после их создания.
+    """
+    state = app.state
+    gauges = (
+        CallbackGauge(
+            "db_pool_connections",
+            "DB pool connections by state",
+            lambda: [
+                ({"state": k}, v)
+                for k, v in state.db.pool_stats().items()
+                if k != "size"
+            ],
+            ("state",),
+        ),
+        CallbackGauge(
+            "db_pool_size",
+            "Configured DB pool size",
+            lambda: state.db.pool_stats()["size"],
+        ),
+        CallbackGauge(
+            "rehash_queue_depth",
+            "Pending password rehash jobs",
+            lambda: state.rehash_queue.depth,
+        ),
+        CallbackGauge(
+            "rehash_jobs_total",
+            "Password rehash jobs by outcome",
+            lambda: [
+                ({"outcome": k}, getattr(state.rehash_queue, k))
+                for k in ("enqueued", "dropped", "updated", "skipped", "failed")
+            ],
+            ("outcome",),
+            metric_type="counter",
+        ),
+        CallbackGauge(
+            "audit_queue_depth",
+            "Audit events waiting to be written",
+            lambda: state.audit.depth if state.audit else 0,
+        ),
+        CallbackGauge(
+            "audit_events_total",
+            "Audit events by outcome",
+            lambda: [
+                ({"outcome": k}, getattr(state.audit, k) if state.audit else 0)
+                for k in ("emitted", "dropped", "written", "failed")
+            ],
+            ("outcome",),
+            metric_type="counter",
+        ),
+        CallbackGauge(
+            "user_cache_size",
+            "User profile cache entries",
+            lambda: user_cache.stats()["size"],
+        ),
+        CallbackGauge(
+            "user_cache_evictions_total",
+            "User profile cache LRU evictions",
+            lambda: user_cache.stats()["evictions"],
+            metric_type="counter",
+        ),
+    )
+    for gauge in gauges:
+        # lifespan может подниматься повторно в одном процессе (тесты) — перерегистрируем
+        REGISTRY.unregister(gauge.name)
+        REGISTRY.register(gauge)
@@ -0,0 +1,249 @@
+class SQLStatsPointDoc:
+    summary = "Статистика SQL-запросов воркера"
+    description = (
+        "Агрегаты по нормализованным запросам (параметры и литералы заменены на `?`), "
+        "накопленные с момента старта воркера или последнего сброса.\n\n"
+        "**Требования:**\n"
+        "- `Authorization: Bearer <access_token>` суперпользователя.\n\n"
+        "**Параметры:**\n"
+        "- `order_by` — `total_ms` (по умолчанию), `mean_ms`, `p99_ms`, `max_ms`, `calls`, `rows`;\n"
+        "- `limit` — сколько запросов вернуть (1–500).\n\n"
+        "**Поля:** `calls`, `total_ms`, `mean_ms`, `p99_ms` (по последним замерам), `max_ms`, "
+        "`rows`, `origins` — методы репозиториев, из которых приходил запрос.\n\n"
+        "Статистика ведётся в памяти процесса: при нескольких воркерах каждый отдаёт свою.\n\n"
+        "**Ответы:**\n"
+        "- **200** — отчёт;\n"
+        "- **401** — нет/недействительный токен;\n"
+        "- **403** — пользователь не суперпользователь.\n"
+    )
+    responses = {
+        200: {
+            "description": "OK — агрегаты по запросам",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "since": "2025-08-12T10:15:30+00:00",
+                        "slow_query_ms": 200,
+                        "statements": [
+                            {
+                                "fingerprint": "SELECT users.id, ... FROM users WHERE users.email = ?::VARCHAR",
+                                "calls": 1520,
+                                "total_ms": 1843.2,
+                                "mean_ms": 1.213,
+                                "p99_ms": 4.87,
+                                "max_ms": 31.02,
+                                "rows": 1498,
+                                "origins": ["UsersRepo.get_by_email"],
+                            }
+                        ],
+                    }
+                }
+            },
+        },
+        401: {"description": "Нет/недействительный токен"},
+        403: {
+            "description": "Недостаточно прав",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "not_superuser",
+                            "message": "Superuser privileges required",
+                        }
+                    }
+                }
+            },
+        },
+    }
+
+
+class SQLStatsResetPointDoc:
+    summary = "Сбросить статистику SQL-запросов"
+    description = (
+        "Обнуляет агрегаты текущего воркера (например, перед нагрузочным прогоном).\n\n"
+        "**Ответы:**\n"
+        "- **204** — сброшено;\n"
+        "- **401** — нет/недействительный токен;\n"
+        "- **403** — пользователь не суперпользователь.\n"
+    )
+    responses = {
+        204: {"description": "Статистика сброшена"},
+        401: {"description": "Нет/недействительный токен"},
+        403: {"description": "Недостаточно прав"},
+    }
+
+
+_PROFILE_ERRORS = {
+    401: {"description": "Нет/недействительный токен"},
+    403: {"description": "Недостаточно прав"},
+    404: {
+        "description": "Профилирование выключено / профиль не найден",
+        "content": {
+            "application/json": {
+                "example": {
+                    "error": {
+                        "code": "profiling_disabled",
+                        "message": "Profiling is disabled",
+                    }
+                }
+            }
+        },
+    },
+}
+
+
+class ProfileCapturePointDoc:
+    summary = "Снять сэмплирующий профиль воркера"
+    description = (
+        "Запускает сэмплирующий профайлер потока event loop текущего воркера на `seconds` "
+        "секунд (не больше `PROFILING_MAX_SECONDS`) и возвращает результат.\n\n"
+        "**Требования:** `PROFILING_ENABLED=1`, access-токен суперпользователя.\n\n"
+        "**Параметры:**\n"
+        "- `mode` — `wall` (всё время, включая ожидание I/O) или `cpu` (только CPU потока loop'а);\n"
+        "- `interval_ms` — период сэмплирования (по умолчанию `PROFILING_INTERVAL_MS`);\n"
+        "- `format` — `speedscope` (JSON для https://www.speedscope.app) или `collapsed` "
+        "(текст для flamegraph.pl / inferno).\n\n"
+        "Запрос попадает на один воркер; в профиль входят все запросы, обслуженные им за это время.\n\n"
+        "**Ответы:**\n"
+        "- **200** — профиль;\n"
+        "- **401/403** — нет токена / не суперпользователь;\n"
+        "- **404** — профилирование выключено;\n"
+        "- **409** — на воркере уже идёт съёмка.\n"
+    )
+    responses = {
+        200: {
+            "description": "Профиль",
+            "content": {
+                "application/json": {"example": {"profiles": [{"type": "sampled"}]}},
+                "text/plain": {
+                    "example": "_run_once (asyncio/base_events.py:1910);select (selectors.py:451) 812345\n"
+                },
+            },
+        },
+        **_PROFILE_ERRORS,
+        409: {"description": "Съёмка уже идёт"},
+    }
+
+
+class RequestProfilesPointDoc:
+    summary = "Последние профили запросов"
+    description = (
+        "Профили, снятые по заголовку `X-Profile: wall|cpu` (имя — `PROFILING_HEADER`) "
+        "в запросах суперпользователя. Хранятся последние `PROFILING_KEEP_LAST` в памяти воркера; "
+        "id профиля возвращается в заголовке ответа `X-Profile-Id`.\n\n"
+        "**Ответы:**\n"
+        "- **200** — список (новые сверху);\n"
+        "- **401/403** — нет токена / не суперпользователь;\n"
+        "- **404** — профилирование выключено.\n"
+    )
+    responses = {
+        200: {
+            "description": "Список профилей",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": "3f0c2d0e9b6a4f3c8e1d7a5b2c4e6f80",
+                            "method": "POST",
+                            "path": "/auth_api/v1/auth/refresh",
+                            "status": 200,
+                            "duration_ms": 12.4,
+                            "mode": "wall",
+                            "samples": 3,
+                            "started_at": "2025-08-12T10:15:30+00:00",
+                        }
+                    ]
+                }
+            },
+        },
+        **_PROFILE_ERRORS,
+    }
+
+
+class RequestProfilePointDoc:
+    summary = "Профиль одного запроса"
+    description = (
+        "Профиль запроса по id из заголовка `X-Profile-Id` в формате `speedscope` или `collapsed`.\n\n"
+        "**Ответы:**\n"
+        "- **200** — профиль;\n"
+        "- **401/403** — нет токена / не суперпользователь;\n"
+        "- **404** — профилирование выключено или профиль не найден "
+        "(вытеснен либо снят на другом воркере).\n"
+    )
+    responses = {200: {"description": "Профиль"}, **_PROFILE_ERRORS}
+
+
+class UserSearchPointDoc:
+    summary = "Поиск пользователей (admin)"
+    description = (
+        "Поиск по подстроке в `email` или `full_name` без учёта регистра "
+        "(GIN-индексы триграмм `pg_trgm`).\n\n"
+        "**Требования:**\n"
+        "- `Authorization: Bearer <access_token>` суперпользователя.\n\n"
+        "**Параметры:**\n"
+        "- `q` — подстрока, от 3 символов (короче триграммы не работают);\n"
+        "- `limit` — размер страницы (1–100);\n"
+        "- `cursor` — `next_cursor` из прошлой страницы.\n\n"
+        "Результаты отсортированы по `rank` (похожесть лучшего из полей, 0..1), затем по `id`; "
+        "страницы — keyset, без OFFSET: глубина листания не влияет на время запроса. "
+        "Запрос ограничен `DB_SEARCH_TIMEOUT_MS` — слишком частая подстрока даёт **503**, "
+        "а не долгий запрос к БД.\n\n"
+        "**Ответы:**\n"
+        "- **200** — страница результатов;\n"
+        "- **400** — повреждённый курсор;\n"
+        "- **401/403** — нет токена / не суперпользователь;\n"
+        "- **422** — `q` короче 3 символов;\n"
+        "- **503** — не уложились в таймаут, уточните запрос.\n"
+    )
+    responses = {
+        200: {
+            "description": "Страница результатов",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "items": [
+                            {
+                                "id": 42,
+                                "email": "jane.doe@example.com",
+                                "full_name": "Jane Doe",
+                                "is_active": True,
+                                "is_superuser": False,
+                                "created_at": "2025-08-12T10:15:30+00:00",
+                                "updated_at": "2025-08-12T10:15:30+00:00",
+                                "rank": 0.41,
+                            }
+                        ],
+                        "next_cursor": "WzAuNDEsNDJd",
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Повреждённый курсор",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "invalid_cursor",
+                            "message": "Invalid search cursor",
+                        }
+                    }
+                }
+            },
+        },
+        401: {"description": "Нет/недействительный токен"},
+        403: {"description": "Недостаточно прав"},
+        503: {
+            "description": "Поиск не уложился в таймаут",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "search_timeout",
+                            "message": "Search took too long, refine the query",
+                        }
+                    }
+                }
+            },
+        },
+    }
@@ -0,0 +1,22 @@
+class NotSuperuserError(Exception):
+    """Эндпоинт только для суперпользователей."""
+
+
+class ProfilingDisabledError(Exception):
+    """Профилирование выключено (PROFILING_ENABLED=0)."""
+
+
+class ProfilerBusyError(Exception):
+    """На воркере уже идёт съёмка профиля."""
+
+
+class ProfileNotFoundError(Exception):
+    """Профиль запроса не найден (вытеснен или снят другим воркером)."""
+
+
+class InvalidSearchCursorError(Exception):
+    """Курсор поиска повреждён или выдан не этим эндпоинтом."""
+
+
+class SearchTimeoutError(Exception):
+    """Поиск не уложился в DB_SEARCH_TIMEOUT_MS (слишком частая подстрока)."""
@@ -0,0 +1,35 @@
+"""
+Схемы ответов служебных (admin) эндпоинтов.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SQLStatementStats(BaseModel):
+    fingerprint: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    p99_ms: float
+    max_ms: float
+    rows: int
+    origins: list[str]
+
+
+class SQLStatsReport(BaseModel):
+    since: datetime
+    slow_query_ms: float
+    statements: list[SQLStatementStats]
+
+
+class RequestProfileRead(BaseModel):
+    id: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    mode: str
+    samples: int
+    started_at: datetime
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Query, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from core.responses import PydanticResponse
+from core.settings import settings
+from core.sql_stats import sql_stats
+from core.profiler import FORMATS, MODES, Profile, profiling
+
+from apps.users.schemas import UserSearchPage
+
+from api.v1.api_depends import SuperuserDep, UsersSvcDep
+from api.v1.admin.schemas import SQLStatsReport, RequestProfileRead
+from api.v1.admin.exceptions import (
+    ProfilingDisabledError,
+    ProfilerBusyError,
+    ProfileNotFoundError,
+)
+from api.v1.admin.docs import (
+    SQLStatsPointDoc,
+    SQLStatsResetPointDoc,
+    ProfileCapturePointDoc,
+    RequestProfilesPointDoc,
+    RequestProfilePointDoc,
+    UserSearchPointDoc,
+)
+
+
+router = APIRouter(tags=["Admin"])
+
+
+@router.get(
+    "/sql-stats",
+    response_model=SQLStatsReport,
+    status_code=status.HTTP_200_OK,
+    summary=SQLStatsPointDoc.summary,
+    description=SQLStatsPointDoc.description,
+    responses=SQLStatsPointDoc.responses,
+)
+async def get_sql_stats(
+    _: SuperuserDep,
+    order_by: Literal[sql_stats.ORDER_FIELDS] = "total_ms",
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    return SQLStatsReport(
+        since=sql_stats.since,
+        slow_query_ms=sql_stats.slow_ms,
+        statements=sql_stats.snapshot(order_by=order_by, limit=limit),
+    )
+
+
+@router.delete(
+    "/sql-stats",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary=SQLStatsResetPointDoc.summary,
+    description=SQLStatsResetPointDoc.description,
+    responses=SQLStatsResetPointDoc.responses,
+)
+async def reset_sql_stats(_: SuperuserDep):
+    sql_stats.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _require_profiling() -> None:
+    if not profiling.enabled:
+        raise ProfilingDisabledError()
+
+
+def _render(profile: Profile, fmt: str) -> Response:
+    if fmt == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return JSONResponse(profile.speedscope())
+
+
+@router.post(
+    "/profile",
+    status_code=status.HTTP_200_OK,
+    summary=ProfileCapturePointDoc.summary,
+    description=ProfileCapturePointDoc.description,
+    responses=ProfileCapturePointDoc.responses,
+)
+async def capture_profile(
+    _: SuperuserDep,
+    seconds: float = Query(default=10, gt=0),
+    mode: Literal[MODES] = "wall",
+    interval_ms: float | None = Query(default=None, ge=1, le=1000),
+    format: Literal[FORMATS] = "speedscope",
+):
+    _require_profiling()
+    seconds = min(seconds, profiling.cfg.max_seconds)
+    profiler = profiling.try_start(
+        mode=mode, interval=(interval_ms or profiling.cfg.interval_ms) / 1000
+    )
+    if profiler is None:
+        raise ProfilerBusyError()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = profiling.finish(profiler)
+    return _render(profile, format)
+
+
+@router.get(
+    "/profile/requests",
+    response_model=list[RequestProfileRead],
+    status_code=status.HTTP_200_OK,
+    summary=RequestProfilesPointDoc.summary,
+    description=RequestProfilesPointDoc.description,
+    responses=RequestProfilesPointDoc.responses,
+)
+async def list_request_profiles(_: SuperuserDep):
+    _require_profiling()
+    return [p.summary() for p in reversed(profiling.recent)]
+
+
+@router.get(
+    "/profile/requests/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    summary=RequestProfilePointDoc.summary,
+    description=RequestProfilePointDoc.description,
+    responses=RequestProfilePointDoc.responses,
+)
+async def get_request_profile(
+    profile_id: str,
+    _: SuperuserDep,
+    format: Literal[FORMATS] = "speedscope",
+):
+    _require_profiling()
+    found = profiling.get(profile_id)
+    if found is None:
+        raise ProfileNotFoundError()
+    return _render(found.profile, format)
+
+
+@router.get(
+    "/users/search",
+    response_model=UserSearchPage,
+    status_code=status.HTTP_200_OK,
+    summary=UserSearchPointDoc.summary,
+    description=UserSearchPointDoc.description,
+    responses=UserSearchPointDoc.responses,
+)
+async def search_users(
+    _: SuperuserDep,
+    users: UsersSvcDep,
+    q: str = Query(min_length=3, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=128),
+):
+    page = await users.search(
+        query=q,
+        limit=limit,
+        cursor=cursor,
+        timeout_ms=settings.DATABASE.SEARCH_TIMEOUT_MS,
+    )
+    return PydanticResponse(page)
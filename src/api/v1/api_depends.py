@@ -4,8 +4,14 @@ from fastapi import Request, Depends
 
 from infra.UoW import UnitOfWork
 from apps.users.service import UsersService
+from apps.users.models import Users
 from apps.auth.service import AuthService
 from apps.auth.utils import JWTBearer, VerifiedToken
+from apps.auth.revocation import is_token_current
+
+from api.v1.auth.exceptions import TokenRevokedError
+from api.v1.users.exceptions import CurrentUserNotFoundError, UserInactiveError
+from api.v1.admin.exceptions import NotSuperuserError
 
 from core.settings import settings
 
@@ -20,29 +26,51 @@ async def get_uow(request: Request) -> AsyncIterator[UnitOfWork]:
 UOWDep = Annotated[UnitOfWork, Depends(get_uow)]
 
 
-def get_users_service(uow: UOWDep) -> UsersService:
-    return UsersService(uow=uow)
+def get_users_service(uow: UOWDep, request: Request) -> UsersService:
+    return UsersService(
+        uow=uow,
+        rehash_queue=request.app.state.rehash_queue,
+        audit=request.app.state.audit,
+        revoke_jobs=request.app.state.revoke_jobs,
+    )
 
 
 UsersSvcDep = Annotated[UsersService, Depends(get_users_service)]
 
 
-def get_auth_service(uow: UnitOfWork = Depends(get_uow)) -> AuthService:
-    return AuthService(uow=uow)
+def get_auth_service(
+    request: Request, uow: UnitOfWork = Depends(get_uow)
+) -> AuthService:
+    return AuthService(
+        uow=uow,
+        audit=request.app.state.audit,
+        revoke_jobs=request.app.state.revoke_jobs,
+    )
 
 
 AuthSvcDep = Annotated[AuthService, Depends(get_auth_service)]
 
 
-AccessJWT = Annotated[
-    dict,
-    Depends(
-        JWTBearer(
-            expected_token_type=settings.AUTH_JWT.access_token_type,
-            scheme_name="AccessToken",
-        )
-    ),
-]
+access_bearer = JWTBearer(
+    expected_token_type=settings.AUTH_JWT.access_token_type,
+    scheme_name="AccessToken",
+)
+
+
+async def current_access(
+    token: Annotated[VerifiedToken, Depends(access_bearer)], uow: UOWDep
+) -> VerifiedToken:
+    """
+    Access-токен, не отозванный глобальным выходом. Версия при промахе кэша читается
+    через UoW запроса — тот же, что получают сервисы (зависимость кэшируется FastAPI).
+    """
+    if not await is_token_current(token.payload, uow.users.get_token_version):
+        raise TokenRevokedError()
+    return token
+
+
+AccessJWT = Annotated[VerifiedToken, Depends(current_access)]
+# отзыв refresh проверяет AuthService.rotate(), logout отзывает строку в любом случае
 RefreshJWT = Annotated[
     VerifiedToken,
     Depends(
@@ -52,3 +80,25 @@ RefreshJWT = Annotated[
         )
     ),
 ]
+
+
+async def check_superuser(users: UsersService, user_id: int) -> Users:
+    """
+    Пользователь, если он активный суперпользователь. Флаги читаются из БД, а не из
+    кэша профилей: разжалованный или отключённый теряет доступ сразу, а не через TTL.
+    """
+    user = await users.get(user_id)
+    if not user:
+        raise CurrentUserNotFoundError()
+    if not user.is_active:
+        raise UserInactiveError()
+    if not user.is_superuser:
+        raise NotSuperuserError()
+    return user
+
+
+async def require_superuser(access: AccessJWT, users: UsersSvcDep) -> Users:
+    return await check_superuser(users, int(access.payload["user_id"]))
+
+
+SuperuserDep = Annotated[Users, Depends(require_superuser)]
@@ -13,7 +13,9 @@ class LoginPointDoc:
         "- **200** — возвращена пара токенов и параметры их использования;\n"
         "- **401** — неверные учётные данные (всегда общее сообщение);\n"
         "- **403** — учётная запись деактивирована (`is_active = false`);\n"
-        "- **422** — ошибки валидации входных данных.\n"
+        "- **422** — ошибки валидации входных данных;\n"
+        "- **429** — слишком много попыток с этого IP или для этого email (см. `Retry-After`); "
+        "пароль в этом случае не проверяется.\n"
     )
 
     responses = {
@@ -53,6 +55,25 @@ class LoginPointDoc:
             },
         },
         422: {"description": "Ошибки валидации входных данных"},
+        429: {
+            "description": "Too Many Requests — превышен лимит попыток входа",
+            "headers": {
+                "Retry-After": {
+                    "schema": {"type": "integer"},
+                    "description": "Через сколько секунд можно повторить",
+                }
+            },
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "too_many_login_attempts",
+                            "message": "Too many login attempts, try again later",
+                        }
+                    }
+                }
+            },
+        },
     }
 
     openapi_extra = {
@@ -195,16 +216,38 @@ class LogoutAllPointDoc:
         "**Поведение:**\n"
         "- Все записи сессий помечаются как `revoked` (фиксируется причина), все refresh-токены — отзываются.\n"
         "- Операция **идемпотентна** — повторный вызов с тем же пользователем вернёт `204 No Content`.\n"
-        "- Уже выданные access-токены обычно остаются валидны до истечения `exp` (если не используется доп. проверка версии/сессии на каждом запросе).\n"
-        "  Рекомендуется использовать короткий TTL у access или версионирование токенов для мгновенной инвалидции.\n\n"
+        "- Уже выданные access- и refresh-токены (в т.ч. этот) отклоняются **сразу** — `401 token_revoked`:\n"
+        "  выход увеличивает версию токенов пользователя, токены со старой версией (`ver`) не принимаются.\n"
+        "- При `REVOKE_ALL_MODE=chunked` строки отзываются фоновой задачей пачками: ответ `202`\n"
+        "  со статусом задачи, ход — `GET /logout-all/{job_id}` (с токеном, полученным после выхода).\n\n"
         "**Ответы:**\n"
-        "- **204** — все сессии и refresh-токены отозваны;\n"
+        "- **204** — все сессии и refresh-токены отозваны (`REVOKE_ALL_MODE=inline`);\n"
+        "- **202** — токены уже отклоняются, строки отзываются в фоне (тело — статус задачи);\n"
         "- **401** — отсутствует/недействительный/просроченный access-токен;\n"
         "- **422** — ошибки валидации (не ожидаются, так как тело запроса пустое).\n"
     )
 
     responses = {
         204: {"description": "OK — пользователь разлогинен на всех устройствах"},
+        202: {
+            "description": "Accepted — отзыв идёт пачками в фоне",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "job_id": "6b0e9a1c-3f57-4c1e-9f0a-2d8c51e7b4a9",
+                        "user_id": 42,
+                        "state": "running",
+                        "token_version": 3,
+                        "revoked_before": "2025-08-12T10:15:30+00:00",
+                        "tokens_revoked": 0,
+                        "sessions_revoked": 0,
+                        "batches": 0,
+                        "started_at": "2025-08-12T10:15:30+00:00",
+                        "finished_at": None,
+                    }
+                }
+            },
+        },
         401: {
             "description": "Unauthorized — нет или недействителен access-токен",
             "headers": {
@@ -243,6 +286,42 @@ class LogoutAllPointDoc:
     }
 
 
+class LogoutAllJobPointDoc:
+    summary = "Статус глобального выхода пачками"
+    description = (
+        "Ход задачи, запущенной `POST /logout-all` при `REVOKE_ALL_MODE=chunked`.\n\n"
+        "**Требования:**\n"
+        "- Access-токен того же пользователя, выданный **после** выхода (прежние уже отозваны).\n\n"
+        "**Что возвращается:**\n"
+        "- `state` — `running` | `done` | `failed` | `interrupted` (воркер остановлен;\n"
+        "  повторный `POST /logout-all` дочистит остаток); задача, запущенная во время\n"
+        "  другой, остаётся `running` с нулём пачек, пока та не закончится;\n"
+        "- `tokens_revoked` / `sessions_revoked` / `batches` — сколько отозвано к этому моменту.\n\n"
+        "**Ответы:**\n"
+        "- **200** — статус задачи;\n"
+        "- **401** — отсутствует/недействительный/просроченный/отозванный access-токен;\n"
+        "- **404** — задачи нет, она чужая или статус уже истёк (`REVOKE_ALL_STATUS_TTL_SEC`).\n"
+    )
+
+    responses = {
+        200: {"description": "OK — статус задачи"},
+        401: {"description": "Unauthorized — нет или недействителен access-токен"},
+        404: {
+            "description": "Not Found — нет такой задачи",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": {
+                            "code": "revoke_job_not_found",
+                            "message": "Revoke job not found",
+                        }
+                    }
+                }
+            },
+        },
+    }
+
+
 class SessionsListPointDoc:
     summary = "Список активных сессий текущего пользователя"
     description = (
@@ -32,3 +32,20 @@ class MalformedRefreshTokenError(Exception):
 
 class RefreshReuseDetectedError(Exception):
     """Повторный показ (reuse) уже использованного/отозванного refresh."""
+
+
+class TooManyLoginAttemptsError(Exception):
+    """Слишком много попыток входа с этого IP / для этого email (троттлинг до проверки пароля)."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__()
+        self.retry_after = max(1, int(retry_after + 0.999))
+        self.headers = {"Retry-After": str(self.retry_after)}
+
+
+class TokenRevokedError(Exception):
+    """Токен выдан до глобального выхода пользователя (ver ≠ users.token_version)."""
+
+
+class RevokeJobNotFoundError(Exception):
+    """Нет задачи глобального выхода с таким id (или она чужая / статус истёк)."""
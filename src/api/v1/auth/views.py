@@ -1,7 +1,12 @@
+from uuid import UUID
+
 from fastapi import APIRouter, Request, Response, status
 
+from core.settings import settings
+from core.responses import PydanticResponse
+from apps.auth.throttling import login_limiter
 from apps.users.schemas import UserLogin
-from apps.auth.schemas import TokenPair, SessionRead
+from apps.auth.schemas import TokenPair, SessionRead, SessionReadList, RevokeAllJob
 from api.v1.api_depends import UsersSvcDep, AuthSvcDep, AccessJWT, RefreshJWT
 from api.v1.users.exceptions import UserInactiveError
 
@@ -10,6 +15,7 @@ from api.v1.auth.docs import (
     LogoutPointDoc,
     RefreshPointDoc,
     LogoutAllPointDoc,
+    LogoutAllJobPointDoc,
     SessionsListPointDoc as SessionsDoc,
 )
 
@@ -29,20 +35,29 @@ router = APIRouter(tags=["Auth"])
 async def login(
     payload: UserLogin, request: Request, users: UsersSvcDep, auth: AuthSvcDep
 ):
+    # адрес клиента — от uvicorn: X-Forwarded-For учитывается, только если его
+    # прислал прокси из SERVICE_FORWARDED_ALLOW_IPS (сам заголовок подделывается клиентом)
+    ip = request.client.host if request.client else None
+    # троттлинг до БД и хеширования: отказ стоит микросекунды
+    await login_limiter.check(ip=ip, email=payload.email)
+
     user = await users.authenticate(
         email=payload.email,
         raw_password=payload.password.get_secret_value(),
     )
+    await login_limiter.succeeded(payload.email)
     if not user.is_active:
         raise UserInactiveError()
 
     # создать сессию и выдать пару
     ua = (request.headers.get("user-agent") or "")[:255]
-    ip = request.headers.get("x-forwarded-for", "").split(",")[0].strip() or (
-        request.client.host if request.client else None
+    pair = await auth.login(
+        user_id=user.id,
+        user_agent=ua,
+        ip_address=ip,
+        token_version=user.token_version,
     )
-    pair = await auth.login(user_id=user.id, user_agent=ua, ip_address=ip)
-    return pair
+    return PydanticResponse(pair)
 
 
 @router.post(
@@ -54,7 +69,7 @@ async def login(
     responses=RefreshPointDoc.responses,
 )
 async def refresh(refresh: RefreshJWT, auth: AuthSvcDep):
-    return await auth.rotate(refresh_token=refresh.token)
+    return PydanticResponse(await auth.rotate(refresh_token=refresh.token))
 
 
 @router.post(
@@ -79,8 +94,30 @@ async def logout(refresh: RefreshJWT, auth: AuthSvcDep):
 )
 async def logout_all(access: AccessJWT, auth: AuthSvcDep):
     user_id = int(access.payload["user_id"])
-    await auth.logout_all(user_id=user_id)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    job = await auth.logout_all(
+        user_id=user_id, chunked=settings.REVOKE_ALL.mode == "chunked"
+    )
+    if job is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return PydanticResponse(
+        job,
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"{settings.API_V1_PREFIX}/auth/logout-all/{job.job_id}"},
+    )
+
+
+@router.get(
+    "/logout-all/{job_id}",
+    response_model=RevokeAllJob,
+    status_code=status.HTTP_200_OK,
+    summary=LogoutAllJobPointDoc.summary,
+    description=LogoutAllJobPointDoc.description,
+    responses=LogoutAllJobPointDoc.responses,
+)
+async def logout_all_status(job_id: UUID, access: AccessJWT, auth: AuthSvcDep):
+    user_id = int(access.payload["user_id"])
+    job = await auth.revoke_job_status(user_id=user_id, job_id=job_id)
+    return PydanticResponse(job)
 
 
 @router.get(
@@ -94,4 +131,4 @@ async def logout_all(access: AccessJWT, auth: AuthSvcDep):
 async def list_my_sessions(access: AccessJWT, auth: AuthSvcDep):
     user_id = int(access.payload["user_id"])
     items = await auth.list_sessions(user_id=user_id)
-    return items
+    return PydanticResponse(items, adapter=SessionReadList)
@@ -20,6 +20,18 @@ from api.v1.auth.exceptions import (
     TokenWrongTypeError,
     MalformedRefreshTokenError,
     RefreshReuseDetectedError,
+    TooManyLoginAttemptsError,
+    TokenRevokedError,
+    RevokeJobNotFoundError,
+)
+
+from api.v1.admin.exceptions import (
+    NotSuperuserError,
+    ProfilingDisabledError,
+    ProfilerBusyError,
+    ProfileNotFoundError,
+    InvalidSearchCursorError,
+    SearchTimeoutError,
 )
 
 
@@ -44,10 +56,12 @@ class ExceptionHandlers:
     @staticmethod
     def _problem(spec: ExceptionSpec, exc: BaseException) -> JSONResponse:
         message = str(exc) if spec.use_exc_message and str(exc) else spec.message
+        # исключение может нести свои заголовки (например, Retry-After)
+        headers = {**(spec.headers or {}), **(getattr(exc, "headers", None) or {})}
         return JSONResponse(
             status_code=spec.status_code,
             content={"error": {"code": spec.code, "message": message}},
-            headers=spec.headers or {},
+            headers=headers,
         )
 
     def _make_handler(
@@ -143,5 +157,57 @@ auth_errors_handlers = ExceptionHandlers(
             message="Refresh token reuse detected",
             headers={"WWW-Authenticate": "Bearer"},
         ),
+        TooManyLoginAttemptsError: ExceptionSpec(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            code="too_many_login_attempts",
+            message="Too many login attempts, try again later",
+        ),
+        TokenRevokedError: ExceptionSpec(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            code="token_revoked",
+            message="Token revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        ),
+        RevokeJobNotFoundError: ExceptionSpec(
+            status_code=status.HTTP_404_NOT_FOUND,
+            code="revoke_job_not_found",
+            message="Revoke job not found",
+        ),
+    }
+)
+
+admin_errors_handlers = ExceptionHandlers(
+    {
+        NotSuperuserError: ExceptionSpec(
+            status_code=status.HTTP_403_FORBIDDEN,
+            code="not_superuser",
+            message="Superuser privileges required",
+        ),
+        ProfilingDisabledError: ExceptionSpec(
+            status_code=status.HTTP_404_NOT_FOUND,
+            code="profiling_disabled",
+            message="Profiling is disabled",
+        ),
+        ProfilerBusyError: ExceptionSpec(
+            status_code=status.HTTP_409_CONFLICT,
+            code="profiler_busy",
+            message="Another profile is being captured on this worker",
+        ),
+        ProfileNotFoundError: ExceptionSpec(
+            status_code=status.HTTP_404_NOT_FOUND,
+            code="profile_not_found",
+            message="Profile not found",
+        ),
+        InvalidSearchCursorError: ExceptionSpec(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            code="invalid_cursor",
+            message="Invalid search cursor",
+        ),
+        SearchTimeoutError: ExceptionSpec(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            code="search_timeout",
+            message="Search took too long, refine the query",
+            headers={"Retry-After": "1"},
+        ),
     }
 )
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, status
 
+from core.responses import PydanticResponse
 from apps.users.schemas import UserCreate, UserRead
 
 from api.v1.api_depends import UsersSvcDep, AccessJWT
@@ -25,7 +26,9 @@ async def register_user(payload: UserCreate, svc: UsersSvcDep):
         raw_password=payload.password.get_secret_value(),
         full_name=payload.full_name,
     )
-    return user
+    return PydanticResponse(
+        UserRead.model_validate(user), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -38,9 +41,9 @@ async def register_user(payload: UserCreate, svc: UsersSvcDep):
 )
 async def me(access: AccessJWT, users: UsersSvcDep):
     user_id = int(access.payload["user_id"])
-    user = await users.get(user_id)
+    user = await users.get_profile(user_id)
     if not user:
         raise CurrentUserNotFoundError()
     if not user.is_active:
         raise UserInactiveError()
-    return user
+    return PydanticResponse(user)
@@ -0,0 +1,50 @@
+import uuid
+from enum import StrEnum
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID, INET
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models_mixins import Base
+
+
+class AuditEvent(StrEnum):
+    LOGIN = "login"
+    REFRESH = "refresh"
+    LOGOUT = "logout"
+    LOGOUT_ALL = "logout_all"
+    REUSE_DETECTED = "reuse_detected"
+    PASSWORD_CHANGE = "password_change"
+
+
+class AuditEvents(Base):
+    """
+    Журнал событий auth: только INSERT, секционирован по месяцам (occurred_at).
+
+    Без внешних ключей — запись о событии переживает удаление пользователя,
+    а вставка не проверяет users/authsessions. Старые месяцы удаляются DROP секции.
+    """
+
+    # ключ секционирования обязан входить в первичный ключ
+    id: Mapped[int] = mapped_column(
+        sa.BigInteger, sa.Identity(always=True), primary_key=True
+    )
+    occurred_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), primary_key=True
+    )
+
+    event: Mapped[AuditEvent] = mapped_column(
+        sa.Enum(AuditEvent, name="audit_event_enum"),
+        nullable=False,
+    )
+    user_id: Mapped[int | None] = mapped_column(sa.BigInteger)
+    session_id: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True))
+    ip_address: Mapped[str | None] = mapped_column(INET)
+    user_agent: Mapped[str | None] = mapped_column(sa.String(255))
+    details: Mapped[dict | None] = mapped_column(JSONB)
+
+    __table_args__ = (
+        sa.Index("ix_audit_events_user", "user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Any
+
+import sqlalchemy as sa
+
+from infra.repository import SQLAlchemyRepository
+from apps.audit.models import AuditEvents
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    months = day.year * 12 + day.month - 1 + shift
+    return date(months // 12, months % 12 + 1, 1)
+
+
+class AuditRepo(SQLAlchemyRepository[AuditEvents]):
+    model = AuditEvents
+
+    async def insert_batch(self, rows: list[dict[str, Any]]) -> int:
+        """Пачка событий одним многострочным INSERT ... VALUES (один round trip)."""
+        if not rows:
+            return 0
+        await self._execute(sa.insert(self.model).values(rows))
+        return len(rows)
+
+    async def ensure_partition(self, month: date) -> str | None:
+        """
+        Секция месяца month (IF NOT EXISTS). Имя созданной секции или None — уже была.
+
+        Вызывать в отдельной транзакции на каждый месяц. События месяца, уже попавшие
+        в DEFAULT, переносятся в новую секцию до ATTACH — иначе PostgreSQL отказал бы
+        в создании секции. Параллельные воркеры сериализуются advisory-блокировкой.
+        """
+        table = self.model.__tablename__
+        start, end = month_start(month), month_start(month, 1)
+        name = f"{table}_y{start.year}m{start.month:02d}"
+        await self._execute(
+            sa.select(sa.func.pg_advisory_xact_lock(sa.func.hashtext(table)))
+        )
+        exists = await self._execute(sa.select(sa.func.to_regclass(name).isnot(None)))
+        if exists.scalar_one():
+            return None
+        # DDL не принимает bind-параметры; имя и границы — даты, собранные здесь же
+        bounds = f"('{start.isoformat()}') TO ('{end.isoformat()}')"
+        await self._execute(
+            sa.text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        )
+        await self._execute(
+            sa.text(
+                f"WITH moved AS (DELETE FROM {table}_default "
+                f"WHERE occurred_at >= '{start.isoformat()}' "
+                f"AND occurred_at < '{end.isoformat()}' RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            )
+        )
+        await self._execute(
+            sa.text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM {bounds}"
+            )
+        )
+        return name
@@ -0,0 +1,176 @@
+"""
+Асинхронный журнал событий auth (login/refresh/logout/reuse и т.п.).
+
+AuthService не пишет в БД сам: emit() кладёт событие в ограниченный буфер в памяти
+и сразу возвращается — горячий путь не получает лишнего round trip'а и не зависит
+от доступности таблицы аудита. Фоновый писатель забирает события пачками
+(до batch_size или раз в flush_interval) и вставляет одним многострочным INSERT
+в секционированную таблицу auditevents в отдельной транзакции. Сервисы вызывают emit()
+из UnitOfWork.after_commit: событие попадает в журнал, только если запрос зафиксирован.
+
+Переполнение (БД тормозит или недоступна) не замедляет запросы — срабатывает политика:
+- drop_new    — новое событие отбрасывается (по умолчанию: в буфере — более ранние);
+- drop_oldest — вытесняется самое старое (в буфере — самые свежие).
+Потери видны в счётчиках dropped/failed (метрика audit_events_total) и в логах.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infra.UoW import UnitOfWork
+from apps.audit.models import AuditEvent
+from apps.audit.repository import month_start
+
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("drop_new", "drop_oldest")
+
+
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    event: AuditEvent
+    user_id: int | None = None
+    session_id: UUID | None = None
+    ip_address: str | None = None
+    user_agent: str | None = None
+    details: dict[str, Any] | None = None
+    occurred_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        policy: str = "drop_new",
+        partitions_ahead: int = 2,
+        partitions_interval: float = 3600,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown audit overflow policy {policy!r}")
+        self._session_factory = session_factory
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.partitions_ahead = partitions_ahead
+        self.partitions_interval = partitions_interval
+        self._buffer: deque[AuditRecord] = deque()
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        # счётчики (для логов/метрик)
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    def emit(self, event: AuditEvent, **fields: Any) -> bool:
+        """Записать событие без ожидания. False — отброшено новое (буфер полон, drop_new)."""
+        if len(self._buffer) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == "drop_new":
+                return False
+            self._buffer.popleft()
+        self._buffer.append(AuditRecord(event, **fields))
+        self.emitted += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        await self._ensure_partitions()
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Остановить цикл и дописать буфер (не дольше timeout). Цикл не отменяется
+        посреди flush(): он дописывает текущую пачку, дочищает буфер и выходит сам;
+        отмена — только по истечении timeout.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            logger.warning(
+                "Audit buffer not flushed on shutdown: %d event(s) dropped", self.depth
+            )
+            self.dropped += self.depth
+            self._buffer.clear()
+        self._task = None
+
+    async def _ensure_partitions(self) -> None:
+        """Секции с текущего месяца по +partitions_ahead, каждая — своей транзакцией."""
+        today = datetime.now(timezone.utc).date()
+        for shift in range(self.partitions_ahead + 1):
+            month = month_start(today, shift)
+            try:
+                async with UnitOfWork(self._session_factory) as uow:
+                    created = await uow.audit.ensure_partition(month)
+            except Exception:
+                # секция DEFAULT примет события; месяц повторим на следующей проверке
+                logger.exception("Audit partition for %s was not created", month)
+            else:
+                if created:
+                    logger.info("Audit partition %s created", created)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_partitions = loop.time() + self.partitions_interval
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._drain()
+            # долгоживущий воркер тоже переходит границу месяца
+            if loop.time() >= next_partitions:
+                await self._ensure_partitions()
+                next_partitions = loop.time() + self.partitions_interval
+        # события, пришедшие во время последней пачки
+        await self._drain()
+
+    async def _drain(self) -> None:
+        while self._buffer:
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(self.batch_size, len(self._buffer)))
+            ]
+            await self.flush(batch)
+
+    async def flush(self, batch: list[AuditRecord]) -> None:
+        try:
+            async with UnitOfWork(self._session_factory) as uow:
+                await uow.audit.insert_batch([asdict(r) for r in batch])
+        except asyncio.CancelledError:
+            # stop() по таймауту прервал пачку
+            self.failed += len(batch)
+            raise
+        except Exception:
+            # не повторяем: журнал не должен копить память, пока БД лежит
+            self.failed += len(batch)
+            logger.exception("Audit batch of %d event(s) lost", len(batch))
+        else:
+            self.written += len(batch)
@@ -61,6 +61,12 @@ class AuthSessions(IntPKMixin, TimestampMixin, Base):
 
     __table_args__ = (
         sa.Index("ix_auth_sessions_user", "user_id"),
+        # активные сессии пользователя: список сессий, массовый отзыв
+        sa.Index(
+            "ix_auth_sessions_user_active",
+            "user_id",
+            postgresql_where=sa.text("revoked_at IS NULL"),
+        ),
         sa.Index("ix_auth_sessions_last_seen", "last_seen_at"),
     )
 
@@ -124,6 +130,11 @@ class RefreshTokens(IntPKMixin, Base):
 
     __table_args__ = (
         sa.Index("ix_refresh_tokens_user", "user_id"),
+        sa.Index(
+            "ix_refresh_tokens_user_active",
+            "user_id",
+            postgresql_where=sa.text("revoked_at IS NULL"),
+        ),
         sa.Index("ix_refresh_tokens_session", "session_id"),
         sa.Index("ix_refresh_tokens_family", "family_id"),
     )
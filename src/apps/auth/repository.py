@@ -15,6 +15,47 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _active_for_user(
+    model: type[AuthSessions] | type[RefreshTokens],
+    user_id: int,
+    before: datetime | None,
+) -> list[sa.ColumnElement[bool]]:
+    """Активные строки пользователя; before — только созданные раньше (refresh — по issued_at)."""
+    conditions = [model.user_id == user_id, model.revoked_at.is_(None)]
+    if before is not None:
+        created = model.issued_at if model is RefreshTokens else model.created_at
+        conditions.append(created < before)
+    return conditions
+
+
+def _revoke_batch(
+    model: type[AuthSessions] | type[RefreshTokens],
+    user_id: int,
+    *,
+    reason: RevokeReason,
+    when: datetime,
+    limit: int,
+    before: datetime | None = None,
+) -> sa.Update:
+    """
+    UPDATE не больше limit активных строк пользователя (по id, через частичный индекс).
+    SKIP LOCKED: строки, которые держит параллельная ротация/touch, пачка пропускает —
+    короткая пачка не значит, что строк не осталось (см. has_active_for_user).
+    """
+    ids = (
+        sa.select(model.id)
+        .where(*_active_for_user(model, user_id, before))
+        .order_by(model.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        sa.update(model)
+        .where(model.id.in_(ids))
+        .values(revoked_at=when, revoked_reason=reason)
+    )
+
+
 # ==========================
 #         SESSIONS
 # ==========================
@@ -57,7 +98,7 @@ class AuthSessionsRepo(SQLAlchemyRepository[AuthSessions]):
             .where(self.model.session_id == session_id, self.model.revoked_at.is_(None))
             .values(last_seen_at=when or _utcnow())
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
     async def revoke_session(
@@ -73,7 +114,7 @@ class AuthSessionsRepo(SQLAlchemyRepository[AuthSessions]):
             .where(self.model.session_id == session_id, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
     async def revoke_all_for_user(
@@ -84,9 +125,73 @@ class AuthSessionsRepo(SQLAlchemyRepository[AuthSessions]):
             .where(self.model.user_id == user_id, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
+    async def revoke_batch_for_user(
+        self,
+        user_id: int,
+        *,
+        reason: RevokeReason,
+        limit: int,
+        when: datetime | None = None,
+        before: datetime | None = None,
+    ) -> int:
+        """Отозвать очередную пачку сессий (см. apps.auth.revoke_jobs)."""
+        stmt = _revoke_batch(
+            self.model,
+            user_id,
+            reason=reason,
+            when=when or _utcnow(),
+            limit=limit,
+            before=before,
+        )
+        res = await self._execute(stmt)
+        return int(res.rowcount or 0)
+
+    async def has_active_for_user(
+        self, user_id: int, *, before: datetime | None = None
+    ) -> bool:
+        """Остались ли активные строки, в том числе занятые чужой транзакцией."""
+        stmt = sa.select(
+            sa.exists().where(*_active_for_user(self.model, user_id, before))
+        )
+        res = await self._execute(stmt)
+        return bool(res.scalar())
+
+    async def revoke_all_for_user_with_tokens(
+        self, user_id: int, *, reason: RevokeReason, when: datetime | None = None
+    ) -> tuple[int, int]:
+        """
+        Отозвать все сессии и refresh-токены пользователя одним запросом.
+
+        Два UPDATE в data-modifying CTE (один round trip, один снимок), строки находятся
+        по частичным индексам user_id WHERE revoked_at IS NULL — уже отозванные не читаются.
+        Возвращает (сессий, токенов).
+        """
+        when = when or _utcnow()
+        sessions = (
+            sa.update(AuthSessions)
+            .where(AuthSessions.user_id == user_id, AuthSessions.revoked_at.is_(None))
+            .values(revoked_at=when, revoked_reason=reason)
+            .returning(AuthSessions.id)
+            .cte("revoked_sessions")
+        )
+        tokens = (
+            sa.update(RefreshTokens)
+            .where(RefreshTokens.user_id == user_id, RefreshTokens.revoked_at.is_(None))
+            .values(revoked_at=when, revoked_reason=reason)
+            .returning(RefreshTokens.id)
+            .cte("revoked_tokens")
+        )
+        stmt = sa.select(
+            sa.select(sa.func.count()).select_from(sessions).scalar_subquery(),
+            sa.select(sa.func.count()).select_from(tokens).scalar_subquery(),
+        )
+        res = await self._execute(stmt)
+        n_sessions, n_tokens = res.one()
+        return int(n_sessions), int(n_tokens)
+
 
 # ==========================
 #       REFRESH TOKENS
@@ -143,7 +248,7 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             .where(self.model.jti == jti, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
     async def revoke_family(
@@ -154,7 +259,7 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             .where(self.model.family_id == family_id, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
     async def revoke_by_session(
@@ -165,7 +270,7 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             .where(self.model.session_id == session_id, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
     async def revoke_all_for_user(
@@ -176,9 +281,40 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             .where(self.model.user_id == user_id, self.model.revoked_at.is_(None))
             .values(revoked_at=when or _utcnow(), revoked_reason=reason)
         )
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
 
+    async def revoke_batch_for_user(
+        self,
+        user_id: int,
+        *,
+        reason: RevokeReason,
+        limit: int,
+        when: datetime | None = None,
+        before: datetime | None = None,
+    ) -> int:
+        """Отозвать очередную пачку refresh-токенов (см. apps.auth.revoke_jobs)."""
+        stmt = _revoke_batch(
+            self.model,
+            user_id,
+            reason=reason,
+            when=when or _utcnow(),
+            limit=limit,
+            before=before,
+        )
+        res = await self._execute(stmt)
+        return int(res.rowcount or 0)
+
+    async def has_active_for_user(
+        self, user_id: int, *, before: datetime | None = None
+    ) -> bool:
+        """Остались ли активные строки, в том числе занятые чужой транзакцией."""
+        stmt = sa.select(
+            sa.exists().where(*_active_for_user(self.model, user_id, before))
+        )
+        res = await self._execute(stmt)
+        return bool(res.scalar())
+
     async def rotate_active(
         self,
         *,
@@ -212,7 +348,7 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             )
             .returning(self.model)
         )
-        upd_res: Result = await self.session.execute(upd_stmt)
+        upd_res: Result = await self._execute(upd_stmt)
         old: RefreshTokens | None = upd_res.scalar_one_or_none()
         if old is None:
             # старый не активен → reuse/expired/unknown
@@ -238,7 +374,7 @@ class RefreshTokensRepo(SQLAlchemyRepository[RefreshTokens]):
             )
             .returning(self.model)
         )
-        ins_res: Result = await self.session.execute(ins_stmt)
+        ins_res: Result = await self._execute(ins_stmt)
         new_row = ins_res.scalar_one_or_none()
         if new_row is None:
             # крайне маловероятно, но на всякий случай
@@ -0,0 +1,121 @@
+"""
+Мгновенный отзыв всех токенов пользователя: эпоха токенов (users.token_version)
+и отметка «отозваны выданные до» (revoked_before).
+
+Каждый access и refresh несёт claim ver — версию пользователя на момент выдачи.
+Глобальный выход — один UPDATE users SET token_version = token_version + 1;
+AccessJWT (api.v1.api_depends) и AuthService.rotate() отклоняют токены, у которых ver не совпадает
+с текущей версией. Строки refreshtokens/authsessions для этого трогать не нужно
+(их отзыв — учёт, см. apps.auth.revoke_jobs).
+
+Текущая версия читается через кэш (TTLCache воркера или общий бэкенд): на запрос —
+один get, в БД — только при промахе. После bump новая версия сразу кладётся в кэш;
+воркер с отставшим кэшем (кэш в памяти, STATE_BACKEND_URL=memory://) видит её
+не позже чем через TTL (при нескольких воркерах — TOKEN_VERSION_LOCAL_TTL_SEC), а токен с ver новее закэшированного перечитывает версию
+из БД сразу — вход после выхода работает везде. Токены без ver (выданные до
+появления колонки) считаются версией 0.
+
+Отметка revoked_before:<user_id> — момент последнего глобального выхода, только в кэше.
+Токен с iat раньше отметки отклоняется одним get, до проверки версии и без БД даже
+при промахе кэша версий; фоновая задача отзыва берёт отметку границей — сессии и
+refresh, созданные после выхода, она не трогает. iat — целые секунды, поэтому токен,
+выданный в ту же секунду, отметкой не отсекается (его отсекает ver). Отметка живёт
+refresh_token_expire: всё, что выдано раньше, к этому времени истекло.
+"""
+
+from datetime import datetime
+
+from typing import Awaitable, Callable
+
+from core.cache import CacheBackend, TTLCache
+from core.settings import settings
+
+
+VersionLoader = Callable[[int], Awaitable[int | None]]
+
+
+class TokenVersions:
+    def __init__(self, *, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.backend: CacheBackend = self._local
+
+    def use_backend(self, backend: CacheBackend | None) -> None:
+        """Общий бэкенд (None — вернуться к своему TTLCache в памяти воркера)."""
+        self.backend = backend or self._local
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"token_ver:{user_id}"
+
+    async def set(self, user_id: int, version: int) -> None:
+        await self.backend.set(self._key(user_id), str(version), self.ttl)
+
+    async def load(self, user_id: int, loader: VersionLoader) -> int | None:
+        """Версия из БД (и в кэш). None — пользователя нет."""
+        version = await loader(user_id)
+        if version is not None:
+            await self.set(user_id, version)
+        return version
+
+    async def get(self, user_id: int, loader: VersionLoader) -> int | None:
+        raw = await self.backend.get(self._key(user_id))
+        if raw is not None:
+            return int(raw)
+        return await self.load(user_id, loader)
+
+    async def is_current(self, payload: dict, loader: VersionLoader) -> bool:
+        user_id = int(payload["user_id"])
+        ver = int(payload.get("ver") or 0)
+        current = await self.get(user_id, loader)
+        if current is not None and ver > current:
+            # токен выдан после bump, который этот кэш ещё не видел
+            current = await self.load(user_id, loader)
+        return current is not None and ver == current
+
+
+class RevokedBefore:
+    def __init__(self, *, ttl: float, maxsize: int = 100_000) -> None:
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.backend: CacheBackend = self._local
+
+    def use_backend(self, backend: CacheBackend | None) -> None:
+        """Общий бэкенд (None — вернуться к своему TTLCache в памяти воркера)."""
+        self.backend = backend or self._local
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"revoked_before:{user_id}"
+
+    async def mark(self, user_id: int, when: datetime) -> None:
+        await self.backend.set(self._key(user_id), str(int(when.timestamp())), self.ttl)
+
+    async def is_revoked(self, payload: dict) -> bool:
+        raw = await self.backend.get(self._key(int(payload["user_id"])))
+        return raw is not None and int(payload["iat"]) < int(raw)
+
+
+async def is_token_current(payload: dict, loader: VersionLoader) -> bool:
+    """Токен не отозван глобальным выходом: сначала отметка (без БД), затем ver."""
+    if await revoked_before.is_revoked(payload):
+        return False
+    return await token_versions.is_current(payload, loader)
+
+
+async def publish_revocation(user_id: int, version: int | None, when: datetime) -> None:
+    """
+    Глобальный выход (logout-all, смена пароля) — в кэш: отметка и новая версия.
+    Только после COMMIT bump'а, иначе другой воркер перечитает из БД старую версию.
+    """
+    await revoked_before.mark(user_id, when)
+    if version is not None:
+        await token_versions.set(user_id, version)
+
+
+# Экземпляры
+token_versions = TokenVersions(
+    ttl=settings.CACHE.token_version_ttl,
+    maxsize=settings.CACHE.token_version_maxsize,
+)
+revoked_before = RevokedBefore(ttl=settings.AUTH_JWT.refresh_token_expire * 60)
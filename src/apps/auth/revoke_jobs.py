@@ -0,0 +1,213 @@
+"""
+Глобальный выход пачками (REVOKE_ALL_MODE=chunked).
+
+У сервисных аккаунтов — миллионы строк refreshtokens: два UPDATE без ограничения
+держат блокировки секундами и выдают весь WAL одним куском. Здесь строки отзываются
+пачками по id (batch_size, каждая — своя короткая транзакция, SKIP LOCKED) с паузой
+между ними, в фоновой задаче воркера. Токены пользователя к этому моменту уже
+недействительны — users.token_version увеличена (apps.auth.revocation), задача
+только приводит строки в соответствие (список сессий, аудит). Отзываются лишь строки,
+созданные до отметки revoked_before: вход сразу после выхода задача не разлогинит.
+
+Статус задачи (RevokeAllJob) лежит в кэше под revoke_job:<id> и обновляется после
+каждой пачки; с общим STATE_BACKEND_URL его видно из любого воркера. Если воркер
+остановился посреди задачи, статус станет interrupted (или останется running при
+падении процесса) — повторный logout-all дочистит остаток: отзыв идемпотентен.
+Повторный выход во время задачи ставит следующую, со своей отметкой: она ждёт
+предыдущую и дочищает строки, созданные между двумя выходами.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import CacheBackend, TTLCache
+from infra.UoW import UnitOfWork
+from apps.auth.models import RevokeReason
+from apps.auth.revocation import publish_revocation
+from apps.auth.schemas import RevokeAllJob
+
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RevokeAllJobs:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        batch_size: int = 1000,
+        pause: float = 0.02,
+        status_ttl: float = 86_400,
+        maxsize: int = 10_000,
+    ) -> None:
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self.status_ttl = status_ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=status_ttl)
+        self.backend: CacheBackend = self._local
+        self._tasks: dict[UUID, asyncio.Task] = {}
+        self._by_user: dict[int, asyncio.Task] = {}  # последняя задача пользователя
+
+    def use_backend(self, backend: CacheBackend | None) -> None:
+        """Общий бэкенд для статусов (None — свой TTLCache в памяти воркера)."""
+        self.backend = backend or self._local
+
+    @staticmethod
+    def _key(job_id: UUID) -> str:
+        return f"revoke_job:{job_id}"
+
+    async def _save(self, job: RevokeAllJob) -> None:
+        await self.backend.set(
+            self._key(job.job_id), job.model_dump_json(), self.status_ttl
+        )
+
+    async def get(self, job_id: UUID) -> RevokeAllJob | None:
+        raw = await self.backend.get(self._key(job_id))
+        return RevokeAllJob.model_validate_json(raw) if raw is not None else None
+
+    @staticmethod
+    def new(
+        user_id: int, *, token_version: int, revoked_before: datetime
+    ) -> RevokeAllJob:
+        """Задача без запуска: её статус отдаётся клиенту до COMMIT выхода."""
+        return RevokeAllJob(
+            job_id=uuid4(),
+            user_id=user_id,
+            token_version=token_version,
+            revoked_before=revoked_before,
+            started_at=_utcnow(),
+        )
+
+    async def start(self, job: RevokeAllJob, *, reason: RevokeReason) -> RevokeAllJob:
+        """
+        Запустить отзыв в фоне. Если для пользователя задача уже идёт, новая (со своими
+        отметкой, версией и причиной) встаёт за ней и начнёт пачки, когда та закончит.
+        """
+        user_id = job.user_id
+        previous = self._by_user.get(user_id)
+        await self._save(job)
+        task = asyncio.create_task(
+            self._run(job, reason, previous), name=f"revoke-all-{job.job_id}"
+        )
+        self._tasks[job.job_id] = task
+        self._by_user[user_id] = task
+        return job
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _batch(self, job: RevokeAllJob, reason: RevokeReason) -> int:
+        async with UnitOfWork(self._session_factory) as uow:
+            # сначала refresh-токены: именно по ним выпускаются новые access
+            tokens = await uow.refresh.revoke_batch_for_user(
+                job.user_id,
+                reason=reason,
+                limit=self.batch_size,
+                before=job.revoked_before,
+            )
+            sessions = 0
+            if tokens < self.batch_size:
+                sessions = await uow.sessions.revoke_batch_for_user(
+                    job.user_id,
+                    reason=reason,
+                    limit=self.batch_size - tokens,
+                    before=job.revoked_before,
+                )
+        job.tokens_revoked += tokens
+        job.sessions_revoked += sessions
+        job.batches += 1
+        return tokens + sessions
+
+    async def _remaining(self, job: RevokeAllJob) -> bool:
+        async with UnitOfWork(self._session_factory) as uow:
+            if await uow.refresh.has_active_for_user(
+                job.user_id, before=job.revoked_before
+            ):
+                return True
+            return await uow.sessions.has_active_for_user(
+                job.user_id, before=job.revoked_before
+            )
+
+    async def _run(
+        self,
+        job: RevokeAllJob,
+        reason: RevokeReason,
+        previous: asyncio.Task | None = None,
+    ) -> None:
+        try:
+            if previous is not None:
+                # две задачи одного пользователя делили бы одни строки — ждём прежнюю
+                await asyncio.wait([previous])
+            while True:
+                revoked = await self._batch(job, reason)
+                # короткая пачка — не конец: SKIP LOCKED пропускает строки, которые
+                # держит ротация или touch; завершаемся, только когда их не осталось
+                if revoked < self.batch_size and not await self._remaining(job):
+                    break
+                await self._save(job)
+                # остались только занятые строки — ждём, пока их отпустят
+                await asyncio.sleep(self.pause if revoked else max(self.pause, 0.5))
+            job.state = "done"
+        except asyncio.CancelledError:
+            job.state = "interrupted"
+        except Exception:
+            job.state = "failed"
+            logger.exception("Revoke-all job %s failed", job.job_id)
+        finally:
+            job.finished_at = _utcnow()
+            self._tasks.pop(job.job_id, None)
+            if self._by_user.get(job.user_id) is asyncio.current_task():
+                del self._by_user[job.user_id]
+            try:
+                await self._save(job)
+            except Exception:
+                logger.exception("Revoke-all job %s status not saved", job.job_id)
+        logger.info(
+            "Revoke-all job %s %s: %d token(s), %d session(s) in %d batch(es)",
+            job.job_id,
+            job.state,
+            job.tokens_revoked,
+            job.sessions_revoked,
+            job.batches,
+        )
+
+
+async def revoke_all_for_user(
+    uow: UnitOfWork,
+    user_id: int,
+    *,
+    reason: RevokeReason,
+    jobs: RevokeAllJobs | None = None,
+) -> tuple[RevokeAllJob | None, dict]:
+    """
+    Глобальный выход (logout-all, смена пароля) в транзакции uow, без своего COMMIT:
+    +1 к users.token_version, после COMMIT — отметка и версия в кэш.
+
+    jobs=None: строки сессий и refresh отзываются здесь же, одним запросом (CTE);
+    иначе — фоновой задачей пачками, она стартует после COMMIT (откат её не запустит).
+    Возвращает задачу (или None) и детали для аудита.
+    """
+    now = _utcnow()
+    version = await uow.users.bump_token_version(user_id)
+    uow.after_commit(lambda: publish_revocation(user_id, version, now))
+    if jobs is None:
+        sessions, tokens = await uow.sessions.revoke_all_for_user_with_tokens(
+            user_id, reason=reason, when=now
+        )
+        return None, {"sessions": sessions, "tokens": tokens}
+
+    job = jobs.new(user_id, token_version=version or 0, revoked_before=now)
+    uow.after_commit(lambda: jobs.start(job, reason=reason))
+    return job, {"job_id": str(job.job_id)}
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, ConfigDict, IPvAnyAddress
+from pydantic import BaseModel, ConfigDict, IPvAnyAddress, TypeAdapter
+from typing import Literal
 from uuid import UUID
 
 from datetime import datetime
@@ -51,3 +52,25 @@ class SessionRead(BaseModel):
     last_seen_at: datetime | None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# список сессий: валидация ORM-строк и сериализация одним проходом
+SessionReadList = TypeAdapter(list[SessionRead])
+
+
+# ==== Глобальный выход пачками ====
+
+
+class RevokeAllJob(BaseModel):
+    job_id: UUID
+    user_id: int
+    state: Literal["running", "done", "failed", "interrupted"] = "running"
+    # токены с другой версией отклоняются сразу, не дожидаясь задачи
+    token_version: int
+    # граница задачи: строки, созданные позже (вход после выхода), не отзываются
+    revoked_before: datetime
+    tokens_revoked: int = 0
+    sessions_revoked: int = 0
+    batches: int = 0
+    started_at: datetime
+    finished_at: datetime | None = None
@@ -7,14 +7,28 @@ from datetime import datetime, timezone
 
 from fastapi import HTTPException
 
+from core.tracing import traced
 from infra.UoW import UnitOfWork
 from apps.auth.utils import jwt_util
-from apps.auth.models import RevokeReason, AuthSessions
+from apps.audit.models import AuditEvent
+from apps.audit.writer import AuditWriter
+from apps.auth.models import RevokeReason
+from apps.auth.revocation import is_token_current
+from apps.auth.revoke_jobs import RevokeAllJobs, revoke_all_for_user
+from apps.auth.schemas import (
+    JWTSchema,
+    TokenPair,
+    SessionRead,
+    SessionReadList,
+    RevokeAllJob,
+)
 from api.v1.auth.exceptions import (
     RefreshNotActiveError,
     MalformedRefreshTokenError,
     RefreshReuseDetectedError,
     TokenWrongTypeError,
+    TokenRevokedError,
+    RevokeJobNotFoundError,
 )
 
 
@@ -26,20 +40,43 @@ def _hash_refresh(token: str) -> str:
     return sha256(token.encode("utf-8")).hexdigest()
 
 
+def _token_pair(access: JWTSchema, refresh: JWTSchema) -> TokenPair:
+    # поля собраны нами же из JWTSchema — повторная валидация не нужна
+    return TokenPair.model_construct(
+        access_token=access.token,
+        refresh_token=refresh.token,
+        token_type="Bearer",
+        expires_in=int((access.expires_at - access.issued_at).total_seconds()),
+    )
+
+
 @dataclass
 class AuthService:
     uow: UnitOfWork
+    # журнал событий; None — не пишем (CLI/скрипты/бенчмарки)
+    audit: AuditWriter | None = None
+    # фоновый глобальный выход пачками; None — только inline
+    revoke_jobs: RevokeAllJobs | None = None
+
+    def _audit(self, event: AuditEvent, **fields) -> None:
+        # после COMMIT запроса: откаченный вход/выход не должен попасть в журнал
+        if self.audit is not None:
+            audit = self.audit
+            self.uow.after_commit(lambda: audit.emit(event, **fields))
 
     # ----- LOGIN -----
+    @traced("auth.login")
     async def login(
         self,
         *,
         user_id: int,
         user_agent: Optional[str],
         ip_address: Optional[str],
-    ) -> dict:
+        token_version: int = 0,
+    ) -> TokenPair:
         """
         Создаёт сессию (sid), первый refresh (fam/jti), и возвращает пару токенов.
+        token_version — users.token_version (claim ver в обоих токенах).
         """
         sid = uuid4()
         fam = uuid4()
@@ -58,13 +95,18 @@ class AuthService:
         access = jwt_util.encode_jwt(
             user_id=user_id,
             token_type=jwt_util.access_token_type,
-            extra={"sid": str(sid)},
+            extra={"sid": str(sid), "ver": token_version},
         )
 
         refresh = jwt_util.encode_jwt(
             user_id=user_id,
             token_type=jwt_util.refresh_token_type,
-            extra={"sid": str(sid), "fam": str(fam), "jti": str(jti)},
+            extra={
+                "sid": str(sid),
+                "fam": str(fam),
+                "jti": str(jti),
+                "ver": token_version,
+            },
         )
 
         # 3) сохранить refresh в БД (только хэш)
@@ -78,16 +120,19 @@ class AuthService:
             expires_at=refresh.expires_at,
         )
 
+        self._audit(
+            AuditEvent.LOGIN,
+            user_id=user_id,
+            session_id=sid,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
         # UoW закоммитит при выходе из deps, явный commit не обязателен
-        return {
-            "access_token": access.token,
-            "refresh_token": refresh.token,
-            "token_type": "Bearer",
-            "expires_in": int((access.expires_at - access.issued_at).total_seconds()),
-        }
+        return _token_pair(access, refresh)
 
     # ----- REFRESH (ротация) -----
-    async def rotate(self, *, refresh_token: str) -> dict:
+    @traced("auth.rotate")
+    async def rotate(self, *, refresh_token: str) -> TokenPair:
         # 1) валидируем и парсим payload
         payload = jwt_util.decode_jwt(refresh_token)
 
@@ -102,20 +147,30 @@ class AuthService:
 
         uid = int(payload["user_id"])
 
-        # 2) генерим новые токены
+        # 2) глобальный выход после выдачи — не ротируем (и это не reuse)
+        if not await is_token_current(payload, self.uow.users.get_token_version):
+            raise TokenRevokedError()
+        ver = int(payload.get("ver") or 0)
+
+        # 3) генерим новые токены
         new_jti = uuid4()
         new_refresh = jwt_util.encode_jwt(
             user_id=uid,
             token_type=jwt_util.refresh_token_type,
-            extra={"sid": payload["sid"], "fam": payload["fam"], "jti": str(new_jti)},
+            extra={
+                "sid": payload["sid"],
+                "fam": payload["fam"],
+                "jti": str(new_jti),
+                "ver": ver,
+            },
         )
         new_access = jwt_util.encode_jwt(
             user_id=uid,
             token_type=jwt_util.access_token_type,
-            extra={"sid": payload["sid"]},
+            extra={"sid": payload["sid"], "ver": ver},
         )
 
-        # 3) атомарная ротация в БД
+        # 4) атомарная ротация в БД
         try:
             await self.uow.refresh.rotate_active(
                 old_token_hash=_hash_refresh(refresh_token),
@@ -132,21 +187,24 @@ class AuthService:
             await self.uow.sessions.revoke_session(
                 sid, reason=RevokeReason.REUSE_DETECTED
             )
+            self._audit(
+                AuditEvent.REUSE_DETECTED,
+                user_id=uid,
+                session_id=sid,
+                details={"family_id": str(fam)},
+            )
+            # ошибка ниже откатит транзакцию UoW — ревокацию (и аудит) фиксируем до неё
+            await self.uow.commit()
             raise RefreshReuseDetectedError()
 
-        # 4) touch last_seen
+        # 5) touch last_seen
         await self.uow.sessions.touch(sid)
 
-        return {
-            "access_token": new_access.token,
-            "refresh_token": new_refresh.token,
-            "token_type": "Bearer",
-            "expires_in": int(
-                (new_access.expires_at - new_access.issued_at).total_seconds()
-            ),
-        }
+        self._audit(AuditEvent.REFRESH, user_id=uid, session_id=sid)
+        return _token_pair(new_access, new_refresh)
 
     # ----- LOGOUT -----
+    @traced("auth.logout_by_refresh")
     async def logout_by_refresh(self, *, refresh_token: str) -> None:
         """Отозвать текущий refresh + пометить сессию как отозванную."""
         payload = jwt_util.decode_jwt(refresh_token)
@@ -160,16 +218,37 @@ class AuthService:
 
         await self.uow.refresh.revoke_by_jti(jti, reason=RevokeReason.USER_LOGOUT)
         await self.uow.sessions.revoke_session(sid, reason=RevokeReason.USER_LOGOUT)
+        self._audit(AuditEvent.LOGOUT, user_id=payload.get("user_id"), session_id=sid)
 
-    async def logout_all(self, *, user_id: int) -> None:
-        """Отозвать все refresh и сессии пользователя (глобальный выход)."""
-        await self.uow.refresh.revoke_all_for_user(
-            user_id, reason=RevokeReason.ADMIN_FORCE
-        )
-        await self.uow.sessions.revoke_all_for_user(
-            user_id, reason=RevokeReason.ADMIN_FORCE
+    @traced("auth.logout_all")
+    async def logout_all(
+        self, *, user_id: int, chunked: bool = False
+    ) -> RevokeAllJob | None:
+        """
+        Глобальный выход: +1 к users.token_version — все выданные токены недействительны;
+        отметка revoked_before отсекает их без БД и ограничивает фоновую задачу.
+
+        Строки сессий и refresh после этого — учёт (список сессий, аудит):
+        chunked=False: отзываются здесь же, двумя UPDATE в транзакции запроса;
+        chunked=True: фоновой задачей пачками после COMMIT, возвращается её статус.
+        """
+        job, details = await revoke_all_for_user(
+            self.uow,
+            user_id,
+            reason=RevokeReason.ADMIN_FORCE,
+            jobs=self.revoke_jobs if chunked else None,
         )
+        self._audit(AuditEvent.LOGOUT_ALL, user_id=user_id, details=details)
+        return job
+
+    async def revoke_job_status(self, *, user_id: int, job_id: UUID) -> RevokeAllJob:
+        job = await self.revoke_jobs.get(job_id) if self.revoke_jobs else None
+        if job is None or job.user_id != user_id:
+            raise RevokeJobNotFoundError()
+        return job
 
-    async def list_sessions(self, *, user_id: int) -> list[AuthSessions]:
+    @traced("auth.list_sessions")
+    async def list_sessions(self, *, user_id: int) -> list[SessionRead]:
         """Активные (не отозванные) сессии пользователя, по убыванию last_seen."""
-        return await self.uow.sessions.list_active_by_user(user_id)
+        rows = await self.uow.sessions.list_active_by_user(user_id)
+        return SessionReadList.validate_python(rows, from_attributes=True)
@@ -1,4 +1,5 @@
 import jwt
+from jwt.algorithms import get_default_algorithms
 from typing import Any, Dict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -8,6 +9,8 @@ from fastapi.security import HTTPBearer
 from fastapi.security.utils import get_authorization_scheme_param
 
 from core.settings import settings
+from core.metrics import JWT_SECONDS
+from core.tracing import tracing
 from apps.auth.schemas import JWTSchema
 
 from api.v1.auth.exceptions import (
@@ -28,14 +31,19 @@ class VerifiedToken:
 class JWTUtil:
     """
     Обёртка над PyJWT (RS256).
-    - Читает ключи из SettingsAuth (settings.auth_jwt)
+    - Читает ключи из SettingsAuth (settings.auth_jwt) — лениво, при первом использовании
+      или в lifespan (load_keys), а не на импорте
+    - Держит готовые объекты ключей: PEM-строку PyJWT разбирал бы на каждом вызове
+      (для RSA это десятки мс — проверка ключа при загрузке)
     - Генерирует access/refresh по типу токена
     - Возвращает JWTSchema с метаданными (issued_at/expires_at)
     """
 
     def __init__(self, auth_settings) -> None:
-        self.private_key = auth_settings.private_key_path.read_text()
-        self.public_key = auth_settings.public_key_path.read_text()
+        self.private_key_path = auth_settings.private_key_path
+        self.public_key_path = auth_settings.public_key_path
+        self._private_key = None
+        self._public_key = None
         self.algorithm = auth_settings.algorithm
         self.access_token_expire = auth_settings.access_token_expire
         self.refresh_token_expire = auth_settings.refresh_token_expire
@@ -43,6 +51,24 @@ class JWTUtil:
         self.access_token_type = auth_settings.access_token_type
         self.refresh_token_type = auth_settings.refresh_token_type
 
+    def load_keys(self) -> None:
+        """Прочитать PEM и подготовить ключи под алгоритм (RSA/EC/Ed25519 — объекты, HS — bytes)."""
+        algorithm = get_default_algorithms()[self.algorithm]
+        self._private_key = algorithm.prepare_key(self.private_key_path.read_text())
+        self._public_key = algorithm.prepare_key(self.public_key_path.read_text())
+
+    @property
+    def private_key(self):
+        if self._private_key is None:
+            self.load_keys()
+        return self._private_key
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self.load_keys()
+        return self._public_key
+
     def _now(self) -> datetime:
         return datetime.now(timezone.utc)
 
@@ -72,9 +98,10 @@ class JWTUtil:
         if extra:
             payload.update(extra)
 
-        token_value = jwt.encode(
-            payload, key=self.private_key, algorithm=self.algorithm
-        )
+        with tracing.span("jwt.encode"), JWT_SECONDS.time(op="encode"):
+            token_value = jwt.encode(
+                payload, key=self.private_key, algorithm=self.algorithm
+            )
         return JWTSchema(
             user_id=user_id,
             token=token_value,
@@ -85,12 +112,13 @@ class JWTUtil:
 
     def decode_jwt(self, token: str) -> dict:
         try:
-            return jwt.decode(
-                token,
-                key=self.public_key,
-                algorithms=[self.algorithm],
-                options={"require": ["exp", "iat"], "verify_aud": False},
-            )
+            with tracing.span("jwt.decode"), JWT_SECONDS.time(op="decode"):
+                return jwt.decode(
+                    token,
+                    key=self.public_key,
+                    algorithms=[self.algorithm],
+                    options={"require": ["exp", "iat"], "verify_aud": False},
+                )
         except jwt.ExpiredSignatureError:
             raise TokenExpiredError()
         except jwt.InvalidTokenError as e:
@@ -116,6 +144,14 @@ class JWTBearer(HTTPBearer):
         self.expected_token_type = expected_token_type
 
     async def __call__(self, request: Request) -> VerifiedToken:
+        with tracing.span(
+            "jwt.bearer", **{"auth.token_type": self.expected_token_type}
+        ):
+            # только подпись и тип: отзыв проверяется через UoW запроса —
+            # current_access (api_depends) для access, AuthService.rotate() для refresh
+            return self._verify(request)
+
+    def _verify(self, request: Request) -> VerifiedToken:
         auth: str | None = request.headers.get("Authorization")
         if not auth:
             raise AuthHeaderMissingError()
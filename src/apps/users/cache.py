@@ -0,0 +1,133 @@
+"""
+Кэши пользователей.
+
+Read-through кэш профилей (UserRead) по id.
+
+По умолчанию — TTLCache в памяти воркера; через use_backend() можно подключить
+общий бэкенд (значение хранится как JSON, чтобы его можно было положить куда угодно).
+Инвалидация — из UsersRepo при любом UPDATE пользователя, сразу и ещё раз после
+COMMIT; TTL ограничивает устаревание, если запись поменяли в обход сервиса.
+Кэш только для отображения (/users/me): в памяти воркера другие воркеры об
+инвалидации не узнают и отдают старый профиль до TTL — для решений о доступе
+он не годится.
+
+Негативный кэш логина (UnknownEmailCache): email, для которых get_by_email ничего
+не нашёл. Повторные попытки по несуществующим адресам отвечают без запроса в БД;
+register() удаляет запись после COMMIT. Удаление видят все воркеры только с общим
+бэкендом: при кэше в памяти и нескольких воркерах lifespan негативный кэш выключает —
+иначе только что зарегистрированный пользователь до TTL не смог бы войти.
+"""
+
+import hashlib
+
+from core.cache import CacheBackend, TTLCache
+from core.metrics import REGISTRY, Counter
+from core.settings import settings
+from apps.users.schemas import UserRead
+from apps.users.utils import normalize_email
+
+
+USER_CACHE_REQUESTS = REGISTRY.register(
+    Counter("user_cache_requests_total", "User profile cache lookups", ("result",))
+)
+UNKNOWN_EMAIL_HITS = REGISTRY.register(
+    Counter(
+        "unknown_email_cache_hits_total",
+        "Logins for unknown emails answered without a DB lookup",
+    )
+)
+
+
+class UserCache:
+    def __init__(self, *, ttl: float, maxsize: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.backend: CacheBackend = self._local
+        self.hits = 0
+        self.misses = 0
+
+    def use_backend(self, backend: CacheBackend | None) -> None:
+        """Общий бэкенд (None — вернуться к своему TTLCache в памяти воркера)."""
+        self.backend = backend or self._local
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def get(self, user_id: int) -> UserRead | None:
+        if not self.enabled:
+            return None
+        raw = await self.backend.get(self._key(user_id))
+        if raw is None:
+            self.misses += 1
+            USER_CACHE_REQUESTS.inc(result="miss")
+            return None
+        self.hits += 1
+        USER_CACHE_REQUESTS.inc(result="hit")
+        return UserRead.model_validate_json(raw)
+
+    async def set(self, user: UserRead) -> None:
+        if self.enabled:
+            await self.backend.set(self._key(user.id), user.model_dump_json(), self.ttl)
+
+    async def invalidate(self, *user_ids: int) -> None:
+        if self.enabled and user_ids:
+            await self.backend.delete(*(self._key(uid) for uid in user_ids))
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.backend) if isinstance(self.backend, TTLCache) else -1,
+            "evictions": getattr(self.backend, "evictions", 0),
+        }
+
+
+class UnknownEmailCache:
+    def __init__(self, *, ttl: float, maxsize: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.backend: CacheBackend = self._local
+
+    def use_backend(self, backend: CacheBackend | None) -> None:
+        """Общий бэкенд (None — вернуться к своему TTLCache в памяти воркера)."""
+        self.backend = backend or self._local
+
+    @staticmethod
+    def _key(email: str) -> str:
+        # хэш, а не адрес: в общем бэкенде не лежат чужие email
+        digest = hashlib.sha256(normalize_email(email).encode()).hexdigest()[:32]
+        return f"nouser:{digest}"
+
+    async def contains(self, email: str) -> bool:
+        if not self.enabled:
+            return False
+        if await self.backend.get(self._key(email)) is None:
+            return False
+        UNKNOWN_EMAIL_HITS.inc()
+        return True
+
+    async def add(self, email: str) -> None:
+        if self.enabled:
+            await self.backend.set(self._key(email), "1", self.ttl)
+
+    async def discard(self, email: str) -> None:
+        if self.enabled:
+            await self.backend.delete(self._key(email))
+
+
+# Экземпляры
+user_cache = UserCache(
+    ttl=settings.CACHE.user_ttl,
+    maxsize=settings.CACHE.user_maxsize,
+    enabled=settings.CACHE.user_enabled,
+)
+unknown_emails = UnknownEmailCache(
+    ttl=settings.CACHE.unknown_email_ttl,
+    maxsize=settings.CACHE.unknown_email_maxsize,
+    enabled=settings.CACHE.unknown_email_enabled,
+)
@@ -9,11 +9,10 @@ from core.models_mixins import Base, IntPKMixin, TimestampMixin, ActiveFlagMixin
 
 class Users(IntPKMixin, TimestampMixin, ActiveFlagMixin, Base):
 
+    # уникальность и поиск — без учёта регистра, по индексу на lower(email)
     email: Mapped[str] = mapped_column(
         sa.String(255),
-        unique=True,
         nullable=False,
-        index=True,
     )
 
     hashed_password: Mapped[str] = mapped_column(
@@ -32,5 +31,27 @@ class Users(IntPKMixin, TimestampMixin, ActiveFlagMixin, Base):
         server_default=sa.text("false"),
     )
 
+    # эпоха токенов (claim ver): +1 — все выданные access/refresh недействительны
+    token_version: Mapped[int] = mapped_column(
+        sa.Integer,
+        nullable=False,
+        server_default=sa.text("0"),
+    )
+
+    __table_args__ = (
+        sa.Index("ux_users_email_lower", sa.text("lower(email)"), unique=True),
+        # поиск по подстроке (admin): LIKE '%…%' по триграммам, расширение pg_trgm
+        sa.Index(
+            "ix_users_email_trgm",
+            sa.text("lower(email) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        sa.Index(
+            "ix_users_full_name_trgm",
+            sa.text("lower(full_name) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email!r}>"
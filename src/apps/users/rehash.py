@@ -0,0 +1,117 @@
+"""
+Фоновое перехеширование паролей (мягкая миграция вне запроса логина).
+
+Логин только ставит задачу в ограниченную очередь и сразу отвечает;
+воркеры хешируют пароль в пуле потоков PasswordHasher и пишут новый хеш
+через compare-and-set (UPDATE ... WHERE hashed_password = <старый>),
+поэтому повторная/устаревшая задача ничего не перезапишет.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infra.UoW import UnitOfWork
+from core.security import PasswordHasher, pwd_hasher
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RehashJob:
+    user_id: int
+    old_hash: str
+    # сырой пароль живёт в памяти только до обработки задачи
+    raw_password: str
+
+
+class RehashQueue:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        maxsize: int = 1000,
+        workers: int = 2,
+        hasher: PasswordHasher = pwd_hasher,
+    ) -> None:
+        self._session_factory = session_factory
+        self._hasher = hasher
+        self._workers = workers
+        self._queue: asyncio.Queue[RehashJob] = asyncio.Queue(maxsize=maxsize)
+        self._pending: set[int] = set()  # user_id, уже стоящие в очереди
+        self._tasks: list[asyncio.Task] = []
+
+        # счётчики (для логов/метрик)
+        self.enqueued = 0
+        self.dropped = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, *, user_id: int, old_hash: str, raw_password: str) -> bool:
+        """
+        Поставить задачу без ожидания. False — задача не принята
+        (уже в очереди или очередь переполнена); перехешируем при следующем логине.
+        """
+        if user_id in self._pending:
+            return False
+        try:
+            self._queue.put_nowait(RehashJob(user_id, old_hash, raw_password))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._pending.add(user_id)
+        self.enqueued += 1
+        return True
+
+    async def start(self) -> None:
+        for i in range(self._workers):
+            self._tasks.append(
+                asyncio.create_task(self._worker(), name=f"rehash-worker-{i}")
+            )
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Дать воркерам дожать очередь (не дольше timeout), затем остановить."""
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Rehash queue not drained on shutdown: %d job(s) dropped",
+                    self._queue.qsize(),
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception:
+                self.failed += 1
+                logger.exception("Rehash failed for user_id=%s", job.user_id)
+            finally:
+                self._pending.discard(job.user_id)
+                self._queue.task_done()
+
+    async def _process(self, job: RehashJob) -> None:
+        new_hash = await self._hasher.ahash(job.raw_password)
+        async with UnitOfWork(self._session_factory) as uow:
+            rows = await uow.users.set_password_if_unchanged(
+                job.user_id, old_hash=job.old_hash, new_hash=new_hash
+            )
+        if rows:
+            self.updated += 1
+        else:
+            # пароль успели сменить — старый хеш уже неактуален
+            self.skipped += 1
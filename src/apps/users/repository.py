@@ -1,19 +1,87 @@
-from typing import Optional
+import re
+from typing import Any, Optional
+
+import sqlalchemy as sa
 
 from infra.repository import SQLAlchemyRepository
 
 from apps.users.models import Users
+from apps.users.cache import user_cache
+from apps.users.utils import normalize_email
+
+
+_LIKE_SPECIAL = re.compile(r"[\\%_]")
 
 
 class UsersRepo(SQLAlchemyRepository[Users]):
     model = Users
 
+    async def _invalidate(self, *user_ids: int) -> None:
+        # сразу — этот же запрос не прочитает старый профиль из кэша; и после COMMIT —
+        # параллельное чтение могло закэшировать строку до фиксации изменений
+        await user_cache.invalidate(*user_ids)
+        self._after_commit(lambda: user_cache.invalidate(*user_ids))
+
+    def _email_is(self, email: str) -> sa.ColumnElement[bool]:
+        # lower(email) = :email — ровно выражение уникального индекса ux_users_email_lower
+        return sa.func.lower(self.model.email) == normalize_email(email)
+
     # ---- READ ----
     async def get_by_email(self, email: str) -> Optional[Users]:
-        return await self.one_or_none(self.model.email == email)
+        return await self.one_or_none(self._email_is(email))
 
     async def email_exists(self, email: str) -> bool:
-        return await self.exists(self.model.email == email)
+        return await self.exists(self._email_is(email))
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        after: tuple[float, int] | None = None,
+        timeout_ms: int | None = None,
+    ) -> list[tuple[Users, float]]:
+        """
+        Поиск по подстроке email/full_name: [(user, rank)] по убыванию rank, затем id.
+
+        LIKE '%query%' по lower(...) берёт GIN-индексы триграмм (ix_users_*_trgm),
+        rank — similarity() лучшего из полей. after — (rank, id) последней строки
+        прошлой страницы (keyset). timeout_ms — SET LOCAL statement_timeout на
+        остаток транзакции: запрос по слишком частой подстроке обрывается, а не грузит БД.
+        """
+        needle = query.strip().lower()
+        pattern = "%" + _LIKE_SPECIAL.sub(r"\\\g<0>", needle) + "%"
+        email = sa.func.lower(self.model.email)
+        full_name = sa.func.lower(self.model.full_name)
+        rank = sa.func.greatest(
+            sa.func.similarity(email, needle),
+            sa.func.coalesce(sa.func.similarity(full_name, needle), 0),
+        )
+
+        stmt = (
+            sa.select(self.model, rank)
+            .where(
+                sa.or_(
+                    email.like(pattern, escape="\\"),
+                    full_name.like(pattern, escape="\\"),
+                )
+            )
+            .order_by(rank.desc(), self.model.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                sa.tuple_(rank, self.model.id)
+                < sa.tuple_(sa.literal(after[0], sa.Float), sa.literal(after[1]))
+            )
+        if timeout_ms:
+            await self._execute(
+                sa.select(
+                    sa.func.set_config("statement_timeout", str(int(timeout_ms)), True)
+                )
+            )
+        res = await self._execute(stmt)
+        return [(user, float(r)) for user, r in res.all()]
 
     async def list_active(
         self,
@@ -28,6 +96,19 @@ class UsersRepo(SQLAlchemyRepository[Users]):
             offset=offset,
         )
 
+    async def password_batch(
+        self, *, after_id: int, limit: int
+    ) -> list[tuple[int, str]]:
+        """Keyset-батч (id, hashed_password) с id > after_id — для офлайн-миграций."""
+        stmt = (
+            sa.select(self.model.id, self.model.hashed_password)
+            .where(self.model.id > after_id)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        res = await self._execute(stmt)
+        return [(row.id, row.hashed_password) for row in res]
+
     # ---- CREATE ----
     async def create_user(
         self,
@@ -39,7 +120,7 @@ class UsersRepo(SQLAlchemyRepository[Users]):
     ) -> Users:
         return await self.create(
             {
-                "email": email,
+                "email": normalize_email(email),
                 "hashed_password": hashed_password,
                 "full_name": full_name,
                 "is_superuser": is_superuser,
@@ -47,9 +128,80 @@ class UsersRepo(SQLAlchemyRepository[Users]):
         )
 
     # ---- UPDATE ----
+    async def update_by_id(self, id_: int, data: dict[str, Any]) -> Users:
+        # set_password/activate/deactivate/set_superuser идут через этот метод
+        user = await super().update_by_id(id_, data)
+        await self._invalidate(id_)
+        return user
+
     async def set_password(self, user_id: int, hashed_password: str) -> Users:
         return await self.update_by_id(user_id, {"hashed_password": hashed_password})
 
+    async def set_password_if_unchanged(
+        self, user_id: int, *, old_hash: str, new_hash: str
+    ) -> int:
+        """
+        compare-and-set: меняем хеш, только если в БД всё ещё лежит old_hash.
+        Возвращает число обновлённых строк (0/1).
+        """
+        stmt = (
+            sa.update(self.model)
+            .where(self.model.id == user_id, self.model.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        res = await self._execute(stmt)
+        rows = int(res.rowcount or 0)
+        if rows:
+            await self._invalidate(user_id)  # поменялся updated_at
+        return rows
+
+    async def bulk_set_password_if_unchanged(
+        self, rows: list[tuple[int, str, str]]
+    ) -> int:
+        """
+        Пакетный compare-and-set одним UPDATE ... FROM (VALUES ...).
+        rows — (user_id, old_hash, new_hash). Возвращает число обновлённых строк.
+        """
+        if not rows:
+            return 0
+        v = sa.values(
+            sa.column("id", sa.BigInteger),
+            sa.column("old_hash", sa.String),
+            sa.column("new_hash", sa.String),
+            name="v",
+        ).data(rows)
+        stmt = (
+            sa.update(self.model)
+            .where(self.model.id == v.c.id, self.model.hashed_password == v.c.old_hash)
+            .values(hashed_password=v.c.new_hash)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        res = await self._execute(stmt)
+        updated = list(res.scalars())
+        if updated:
+            await self._invalidate(*updated)
+        return len(updated)
+
+    async def get_token_version(self, user_id: int) -> int | None:
+        stmt = sa.select(self.model.token_version).where(self.model.id == user_id)
+        res = await self._execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def bump_token_version(self, user_id: int) -> int | None:
+        """+1 к эпохе токенов пользователя (глобальный выход). None — нет пользователя."""
+        stmt = (
+            sa.update(self.model)
+            .where(self.model.id == user_id)
+            .values(token_version=self.model.token_version + 1)
+            .returning(self.model.token_version)
+        )
+        res = await self._execute(stmt)
+        version = res.scalar_one_or_none()
+        if version is not None:
+            await self._invalidate(user_id)  # поменялся updated_at
+        return version
+
     async def activate(self, user_id: int) -> Users:
         return await self.update_by_id(user_id, {"is_active": True})
 
@@ -60,5 +212,9 @@ class UsersRepo(SQLAlchemyRepository[Users]):
         return await self.update_by_id(user_id, {"is_superuser": value})
 
     # ---- DELETE ----
+    async def delete_by_id(self, id_: int) -> None:
+        await super().delete_by_id(id_)
+        await self._invalidate(id_)
+
     async def delete_by_email(self, email: str) -> int:
-        return await self.delete_where(self.model.email == email)
+        return await self.delete_where(self._email_is(email))
@@ -7,6 +7,7 @@
 - UserUpdate: частичное обновление профиля
 - PasswordChange: смена пароля (текущий + новый)
 - AdminUpdate: админские флаги (is_active/is_superuser)
+- UserSearchHit / UserSearchPage: admin-поиск (ранжированная страница + курсор)
 
 Все схемы настроены на работу с ORM (from_attributes=True).
 """
@@ -91,3 +92,16 @@ class PasswordChange(BaseModel):
 class AdminUpdate(BaseModel):
     is_active: Optional[bool] = None
     is_superuser: Optional[bool] = None
+
+
+# ==== Admin-поиск ====
+
+
+class UserSearchHit(UserRead):
+    rank: float  # similarity() лучшего из полей email/full_name, 0..1
+
+
+class UserSearchPage(BaseModel):
+    items: list[UserSearchHit]
+    # непрозрачный курсор следующей страницы; None — дальше пусто
+    next_cursor: Optional[str] = None
@@ -1,10 +1,23 @@
+import base64
+import binascii
+import json
 from typing import Optional
 
 from dataclasses import dataclass
 
+from sqlalchemy.exc import DBAPIError
+
+from core.tracing import traced
 from infra.UoW import UnitOfWork
 
+from apps.auth.models import RevokeReason
+from apps.auth.revoke_jobs import RevokeAllJobs, revoke_all_for_user
+from apps.audit.models import AuditEvent
+from apps.audit.writer import AuditWriter
 from apps.users.models import Users
+from apps.users.rehash import RehashQueue
+from apps.users.cache import user_cache, unknown_emails
+from apps.users.schemas import UserRead, UserSearchHit, UserSearchPage
 
 from api.v1.users.exceptions import (
     EmailAlreadyUsedError,
@@ -12,21 +25,92 @@ from api.v1.users.exceptions import (
     WrongPasswordError,
 )
 
+from api.v1.admin.exceptions import InvalidSearchCursorError, SearchTimeoutError
+
 from core.security import pwd_hasher
 
 
+QUERY_CANCELED = "57014"  # SQLSTATE: сработал statement_timeout
+
+
+def _encode_cursor(rank: float, user_id: int) -> str:
+    raw = json.dumps([rank, user_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, user_id = json.loads(raw)
+        return float(rank), int(user_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidSearchCursorError() from e
+
+
 @dataclass
 class UsersService:
     uow: UnitOfWork
+    # None — перехешируем синхронно в транзакции запроса (CLI/скрипты)
+    rehash_queue: RehashQueue | None = None
+    # журнал событий; None — не пишем
+    audit: AuditWriter | None = None
+    # фоновый отзыв строк сессий/refresh при chunked; None — только в транзакции запроса
+    revoke_jobs: RevokeAllJobs | None = None
 
     # ---- READ ----
     async def get(self, user_id: int) -> Optional[Users]:
         return await self.uow.users.get_by_id(user_id)
 
+    @traced("users.get_profile")
+    async def get_profile(self, user_id: int) -> Optional[UserRead]:
+        """Профиль для ответа наружу: read-through через user_cache."""
+        cached = await user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        user = await self.uow.users.get_by_id(user_id)
+        if user is None:
+            return None
+        profile = UserRead.model_validate(user)
+        await user_cache.set(profile)
+        return profile
+
     async def get_by_email(self, email: str) -> Optional[Users]:
         return await self.uow.users.get_by_email(email)
 
+    @traced("users.search")
+    async def search(
+        self,
+        *,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        timeout_ms: int | None = None,
+    ) -> UserSearchPage:
+        """Admin-поиск по подстроке email/full_name, keyset-страницами по rank."""
+        after = _decode_cursor(cursor) if cursor else None
+        try:
+            rows = await self.uow.users.search(
+                query, limit=limit + 1, after=after, timeout_ms=timeout_ms
+            )
+        except DBAPIError as e:
+            if getattr(e.orig, "sqlstate", None) == QUERY_CANCELED:
+                raise SearchTimeoutError() from e
+            raise
+        page = rows[:limit]
+        items = [
+            UserSearchHit.model_validate(
+                {**UserRead.model_validate(user).model_dump(), "rank": rank}
+            )
+            for user, rank in page
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last_user, last_rank = page[-1]
+            next_cursor = _encode_cursor(last_rank, last_user.id)
+        return UserSearchPage(items=items, next_cursor=next_cursor)
+
     # ---- CREATE / REGISTER ----
+    @traced("users.register")
     async def register(
         self,
         *,
@@ -39,7 +123,7 @@ class UsersService:
         if await self.uow.users.email_exists(email):
             raise EmailAlreadyUsedError(email)
 
-        hashed = pwd_hasher.hash(raw_password)
+        hashed = await pwd_hasher.ahash(raw_password)
 
         user = await self.uow.users.create_user(
             email=email,
@@ -51,36 +135,76 @@ class UsersService:
         if activate and not user.is_active:
             user = await self.uow.users.activate(user.id)
 
+        # адрес мог попасть в негативный кэш попытками логина до регистрации;
+        # удаляем после COMMIT — до него логин ещё не видит строку и вернул бы адрес в кэш
+        self.uow.after_commit(lambda: unknown_emails.discard(email))
         return user
 
     # ---- AUTH / PASSWORDS ----
+    @traced("users.authenticate")
     async def authenticate(self, *, email: str, raw_password: str) -> Users:
+        # неизвестный email: без запроса в БД, если уже искали; verify впустую в любом
+        # случае — по времени ответа нельзя отличить «нет пользователя» от «не тот пароль»
+        if await unknown_emails.contains(email):
+            await pwd_hasher.adummy_verify(raw_password)
+            raise UserNotFoundError(email)
         user = await self.uow.users.get_by_email(email)
         if not user:
+            await unknown_emails.add(email)
+            await pwd_hasher.adummy_verify(raw_password)
             raise UserNotFoundError(email)
-        if not pwd_hasher.verify(raw_password, user.hashed_password):
+        if not await pwd_hasher.averify(raw_password, user.hashed_password):
             raise WrongPasswordError()
 
-        # мягкая миграция
+        # мягкая миграция: по возможности — в фоне, чтобы не удваивать время логина
         if pwd_hasher.needs_rehash(user.hashed_password):
-            new_hash = pwd_hasher.hash(raw_password)
-            async with self.uow.savepoint():
-                await self.uow.users.set_password(user.id, new_hash)
+            if self.rehash_queue is not None:
+                self.rehash_queue.submit(
+                    user_id=user.id,
+                    old_hash=user.hashed_password,
+                    raw_password=raw_password,
+                )
+            else:
+                new_hash = await pwd_hasher.ahash(raw_password)
+                async with self.uow.savepoint():
+                    await self.uow.users.set_password(user.id, new_hash)
 
         return user
 
+    @traced("users.change_password")
     async def change_password(
-        self, *, user_id: int, current_password: str, new_password: str
+        self,
+        *,
+        user_id: int,
+        current_password: str,
+        new_password: str,
+        chunked: bool = False,
     ) -> Users:
         user = await self.uow.users.get_by_id(user_id)
         if not user:
             raise UserNotFoundError(user_id)
-        if not pwd_hasher.verify(current_password, user.hashed_password):
+        if not await pwd_hasher.averify(current_password, user.hashed_password):
             raise WrongPasswordError()
 
-        new_hash = pwd_hasher.hash(new_password)
+        new_hash = await pwd_hasher.ahash(new_password)
 
-        return await self.uow.users.set_password(user_id, new_hash)
+        # старый пароль мог утечь — глобальный выход, как logout-all (и с тем же
+        # chunked): новая версия токенов в одной транзакции с паролем
+        user = await self.uow.users.set_password(user_id, new_hash)
+        _, details = await revoke_all_for_user(
+            self.uow,
+            user_id,
+            reason=RevokeReason.PASSWORD_CHANGE,
+            jobs=self.revoke_jobs if chunked else None,
+        )
+        if self.audit is not None:
+            audit = self.audit
+            self.uow.after_commit(
+                lambda: audit.emit(
+                    AuditEvent.PASSWORD_CHANGE, user_id=user_id, details=details
+                )
+            )
+        return user
 
     # ---- UPDATE PROFILE ----
     async def update_profile(
@@ -0,0 +1,8 @@
+def normalize_email(email: str) -> str:
+    """
+    Канонический вид email для хранения и поиска: без пробелов по краям, в нижнем регистре.
+
+    Должен совпадать с выражением индекса ux_users_email_lower (lower(email)) —
+    иначе запрос по email пройдёт мимо индекса.
+    """
+    return email.strip().lower()
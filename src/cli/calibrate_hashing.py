@@ -0,0 +1,56 @@
+"""
+Калибровка параметров хеширования паролей под текущую машину.
+
+Запуск (из src/ или с PYTHONPATH=src):
+    python -m cli.calibrate_hashing --target-ms 250 --cores 4
+
+Печатает рекомендованные параметры (строки для .env), фактическое время verify
+и ожидаемую пропускную способность логина на ядро / на под.
+"""
+
+import argparse
+import json
+import os
+
+from core.settings import settings
+from core.hash_calibration import calibrate
+
+
+_ENV_NAMES = {
+    "bcrypt_rounds": "PWD_BCRYPT_ROUNDS",
+    "argon2_memory_cost": "PWD_ARGON2_MEMORY_KIB",
+    "argon2_time_cost": "PWD_ARGON2_TIME_COST",
+    "argon2_parallelism": "PWD_ARGON2_PARALLELISM",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"))
+    parser.add_argument("--target-ms", type=float)
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="вывод в JSON")
+    args = parser.parse_args()
+
+    cfg = settings.PASSWORD
+    if args.target_ms:
+        cfg = cfg.model_copy(update={"target_verify_ms": args.target_ms})
+    result = calibrate(cfg, scheme=args.scheme)
+
+    if args.json:
+        print(json.dumps({**result.as_dict(), "cores": args.cores}))
+        return
+
+    print(f"PWD_SCHEME={result.scheme}")
+    for name, value in result.params.items():
+        print(f"{_ENV_NAMES[name]}={value}")
+    per_core = result.verifies_per_sec_per_core
+    print(
+        f"# verify={result.verify_ms:.1f}ms (target {result.target_ms:.0f}ms); "
+        f"~{per_core:.1f} logins/s per core, ~{per_core * args.cores:.1f} logins/s "
+        f"on {args.cores} core(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Офлайн-миграция паролей: хеширование «сырых» (plaintext) паролей в users.
+
+Запуск (из src/ или с PYTHONPATH=src):
+    python -m cli.rehash_passwords --batch-size 500 --processes 8
+
+- users читается keyset-батчами по id (без OFFSET), каждый батч — своя короткая транзакция;
+- хеширование — в пуле процессов (bcrypt/argon2 — CPU-bound);
+- запись — одним UPDATE ... FROM (VALUES ...) на батч с проверкой старого значения,
+  поэтому параллельный логин/смена пароля не перезаписываются;
+- прогресс сохраняется в checkpoint-файл после каждого батча — повторный запуск
+  продолжит с последнего id (--restart — начать заново).
+
+Хеши с устаревшими параметрами (needs_rehash) офлайн пересоздать нельзя — нужен
+исходный пароль; они только считаются в отчёте и обновятся при следующем логине.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core.settings import settings
+from core.security import pwd_hasher
+from core.db_manager import DataBaseManager
+from infra.UoW import UnitOfWork
+
+
+logger = logging.getLogger("cli.rehash_passwords")
+
+
+def _hash_chunk(raw_passwords: list[str]) -> list[str]:
+    # выполняется в дочернем процессе
+    return [pwd_hasher.hash(raw) for raw in raw_passwords]
+
+
+def _chunks(items: list, n: int) -> list[list]:
+    size = max(1, -(-len(items) // n))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_id": 0, "scanned": 0, "updated": 0, "outdated": 0}
+
+
+def _save_checkpoint(path: Path, state: dict) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)  # атомарно
+
+
+async def run(args: argparse.Namespace) -> dict:
+    checkpoint = Path(args.checkpoint)
+    if args.restart and checkpoint.exists():
+        checkpoint.unlink()
+    state = _load_checkpoint(checkpoint)
+    if state["last_id"]:
+        logger.info("Resuming from id > %d", state["last_id"])
+
+    db = DataBaseManager(url=settings.DATABASE.url)
+    pool = ProcessPoolExecutor(
+        max_workers=args.processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    hashed_total = 0
+    try:
+        while True:
+            async with UnitOfWork(db.session_factory) as uow:
+                batch = await uow.users.password_batch(
+                    after_id=state["last_id"], limit=args.batch_size
+                )
+            if not batch:
+                break
+
+            plaintext = [
+                (uid, stored)
+                for uid, stored in batch
+                if not pwd_hasher.is_hashed(stored)
+            ]
+            state["outdated"] += sum(
+                1
+                for _, stored in batch
+                if pwd_hasher.is_hashed(stored) and pwd_hasher.needs_rehash(stored)
+            )
+
+            updated = 0
+            if plaintext and not args.dry_run:
+                raws = [stored for _, stored in plaintext]
+                parts = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, _hash_chunk, chunk)
+                        for chunk in _chunks(raws, args.processes)
+                    )
+                )
+                new_hashes = [h for part in parts for h in part]
+                async with UnitOfWork(db.session_factory) as uow:
+                    updated = await uow.users.bulk_set_password_if_unchanged(
+                        [
+                            (uid, old, new)
+                            for (uid, old), new in zip(plaintext, new_hashes)
+                        ]
+                    )
+                hashed_total += len(raws)
+
+            state["last_id"] = batch[-1][0]
+            state["scanned"] += len(batch)
+            state["updated"] += updated
+            if not args.dry_run:
+                _save_checkpoint(checkpoint, state)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "last_id=%d scanned=%d plaintext=%d updated=%d outdated=%d | "
+                "%.0f rows/s, %.1f hashes/s",
+                state["last_id"],
+                state["scanned"],
+                len(plaintext),
+                state["updated"],
+                state["outdated"],
+                state["scanned"] / elapsed,
+                hashed_total / elapsed,
+            )
+    finally:
+        pool.shutdown()
+        await db.dispose()
+
+    logger.info("Done: %s", state)
+    return state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default=".rehash_passwords.checkpoint.json")
+    parser.add_argument(
+        "--restart", action="store_true", help="игнорировать checkpoint"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="только посчитать, ничего не писать"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Кэши в памяти процесса.
+
+- CacheBackend — протокол бэкенда (in-process или общий для нескольких воркеров/подов);
+- TTLCache — LRU с TTL на OrderedDict: O(1) get/set, вытеснение самых старых по доступу.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Protocol
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+    async def delete(self, *keys: str) -> None: ...
+
+
+class TTLCache:
+    """LRU-кэш с TTL. Не потокобезопасен — рассчитан на один event loop."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ---- sync API (для горячих путей без await) ----
+    def get_nowait(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set_nowait(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete_nowait(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    # ---- CacheBackend ----
+    async def get(self, key: str) -> Any | None:
+        return self.get_nowait(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set_nowait(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self.delete_nowait(*keys)
@@ -1,6 +1,13 @@
+import asyncio
+import time
 from asyncio import current_task
+from dataclasses import dataclass
 from typing import AsyncIterator
 
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,23 +16,90 @@ from sqlalchemy.ext.asyncio import (
     async_scoped_session,
 )
 
+from core.metrics import DB_POOL_WAIT_SECONDS
+from core.settings import SettingsDataBase
+from core.sql_stats import SQLStats
+
+
+def pool_limits(cfg: SettingsDataBase, workers: int = 1) -> tuple[int, int]:
+    """
+    (pool_size, max_overflow) одного воркера. Без бюджета — как в настройках;
+    с бюджетом — на воркер приходится budget // workers соединений, из них
+    до DB_POOL_SIZE постоянных, остальное — overflow.
+    """
+    if not cfg.CONNECTION_BUDGET:
+        return cfg.POOL_SIZE, cfg.MAX_OVERFLOW
+    per_worker = max(1, cfg.CONNECTION_BUDGET // max(1, workers))
+    pool_size = min(cfg.POOL_SIZE, per_worker)
+    return pool_size, per_worker - pool_size
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который меряет ожидание свободного соединения и считает ждущих."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.waiting -= 1
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+
+@dataclass(frozen=True)
+class DBHealth:
+    ok: bool
+    checked_at: float  # time.monotonic()
+    source: str  # traffic — успешный checkout из пула, ping — собственная проверка
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "source": self.source,
+            "age_ms": round((time.monotonic() - self.checked_at) * 1000, 1),
+            "error": self.error,
+        }
+
 
 class DataBaseManager:
-    def __init__(self, url: str, echo: bool = False) -> None:
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        sql_stats: SQLStats | None = None,
+        *,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+    ) -> None:
         self.engine: AsyncEngine = create_async_engine(
             url=url,
             echo=echo,
+            poolclass=TimedQueuePool,
             pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_recycle=1800,
         )
+        self.pool_size, self.max_overflow = pool_size, max_overflow
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
+        if sql_stats is not None:
+            sql_stats.attach(self.engine.sync_engine)
+
+        # health: checkout с pool_pre_ping уже доказывает, что БД отвечает
+        self._health: DBHealth | None = None
+        self._health_ping: asyncio.Task | None = None
+        event.listen(self.engine.sync_engine.pool, "checkout", self._on_checkout)
 
     # === Режим 1: обычная сессия на запрос (рекомендуется) ===
     async def session_dependency(self) -> AsyncIterator[AsyncSession]:
@@ -65,6 +139,56 @@ class DataBaseManager:
             # remove() — синхронный
             scoped.remove()
 
+    def pool_stats(self) -> dict[str, int]:
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": getattr(pool, "waiting", 0),
+        }
+
+    # === Readiness ===
+    async def ping(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(sa.text("SELECT 1"))
+
+    async def wait_ready(self, timeout: float, interval: float = 0.5) -> None:
+        """Ждать, пока БД ответит на ping; по истечении timeout — последняя ошибка."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return await self.ping()
+            except Exception:
+                if time.monotonic() + interval >= deadline:
+                    raise
+            await asyncio.sleep(interval)
+
+    def _on_checkout(self, *_) -> None:
+        self._health = DBHealth(True, time.monotonic(), "traffic")
+
+    async def _probe(self, timeout: float) -> DBHealth:
+        try:
+            await asyncio.wait_for(self.ping(), timeout)
+        except Exception as e:
+            return DBHealth(False, time.monotonic(), "ping", type(e).__name__)
+        return DBHealth(True, time.monotonic(), "ping")
+
+    async def health(self, *, max_age: float, timeout: float) -> DBHealth:
+        """
+        Состояние БД для readiness-проб. Свежий (моложе max_age) результат отдаётся
+        без I/O — в том числе от обычного трафика; иначе один ping на всех
+        одновременных вызывающих (single-flight), так что частые пробы не нагружают БД.
+        """
+        health = self._health
+        if health is not None and time.monotonic() - health.checked_at < max_age:
+            return health
+        if self._health_ping is None or self._health_ping.done():
+            self._health_ping = asyncio.ensure_future(self._probe(timeout))
+        self._health = await asyncio.shield(self._health_ping)
+        return self._health
+
     # === Shutdown ===
     async def dispose(self) -> None:
         """Грохнуть пул соединений (вызывать на shutdown приложения)."""
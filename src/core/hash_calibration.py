@@ -0,0 +1,149 @@
+"""
+Калибровка стоимости хеширования паролей под текущее железо.
+
+Меряем verify на этой машине и подбираем cost так, чтобы одна проверка
+укладывалась в целевое время (PWD_TARGET_VERIFY_MS), не выходя за границы из настроек:
+- bcrypt: время ~ 2^rounds → rounds = r0 + floor(log2(target / t(r0)));
+- argon2id: память/параллелизм — это бюджет пода (не трогаем), время ~ time_cost.
+"""
+
+import json
+import math
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+
+from core.security import PasswordHasher
+from core.settings import SettingsPassword
+
+
+_PROBE_PASSWORD = "calibration-password"
+
+# результат калибровки, снятый один раз в мастер-процессе (server.py) — воркеры
+# берут его отсюда, а не меряют параллельно друг другу на тех же ядрах
+RESULT_ENV = "PWD_CALIBRATION_RESULT"
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    scheme: str
+    params: dict[str, int]
+    verify_ms: float
+    target_ms: float
+
+    @property
+    def verifies_per_sec_per_core(self) -> float:
+        return 1000 / self.verify_ms if self.verify_ms else math.inf
+
+    def as_dict(self) -> dict:
+        return {
+            "scheme": self.scheme,
+            "params": self.params,
+            "verify_ms": round(self.verify_ms, 2),
+            "target_ms": self.target_ms,
+            "verifies_per_sec_per_core": round(self.verifies_per_sec_per_core, 2),
+        }
+
+
+def export_result(result: CalibrationResult) -> None:
+    os.environ[RESULT_ENV] = json.dumps(asdict(result))
+
+
+def exported_result() -> CalibrationResult | None:
+    raw = os.environ.get(RESULT_ENV)
+    return CalibrationResult(**json.loads(raw)) if raw else None
+
+
+def measure_verify_ms(hasher: PasswordHasher, samples: int = 3) -> float:
+    """Медиана времени одной verify (мс) для текущих параметров hasher."""
+    stored = hasher.hash(_PROBE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.verify(_PROBE_PASSWORD, stored)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def calibrate_bcrypt(
+    target_ms: float, *, min_rounds: int, max_rounds: int, samples: int = 3
+) -> CalibrationResult:
+    probe_ms = measure_verify_ms(
+        PasswordHasher("bcrypt", bcrypt_rounds=min_rounds), samples
+    )
+    extra = math.floor(math.log2(target_ms / probe_ms)) if probe_ms < target_ms else 0
+    rounds = max(min_rounds, min(max_rounds, min_rounds + extra))
+    verify_ms = (
+        probe_ms
+        if rounds == min_rounds
+        else measure_verify_ms(PasswordHasher("bcrypt", bcrypt_rounds=rounds), samples)
+    )
+    return CalibrationResult("bcrypt", {"bcrypt_rounds": rounds}, verify_ms, target_ms)
+
+
+def calibrate_argon2(
+    target_ms: float,
+    *,
+    memory_cost: int,
+    parallelism: int,
+    min_time_cost: int,
+    max_time_cost: int,
+    samples: int = 3,
+) -> CalibrationResult:
+    def hasher(time_cost: int) -> PasswordHasher:
+        return PasswordHasher(
+            "argon2",
+            argon2_memory_cost=memory_cost,
+            argon2_time_cost=time_cost,
+            argon2_parallelism=parallelism,
+        )
+
+    per_pass_ms = measure_verify_ms(hasher(1), samples)
+    time_cost = max(
+        min_time_cost, min(max_time_cost, math.floor(target_ms / per_pass_ms))
+    )
+    return CalibrationResult(
+        "argon2",
+        {
+            "argon2_memory_cost": memory_cost,
+            "argon2_time_cost": time_cost,
+            "argon2_parallelism": parallelism,
+        },
+        measure_verify_ms(hasher(time_cost), samples),
+        target_ms,
+    )
+
+
+def calibrate(cfg: SettingsPassword, scheme: str | None = None) -> CalibrationResult:
+    """Подобрать параметры основной схемы (или scheme) под cfg.target_verify_ms."""
+    scheme = scheme or cfg.scheme
+    if scheme == "bcrypt":
+        return calibrate_bcrypt(
+            cfg.target_verify_ms,
+            min_rounds=cfg.bcrypt_rounds_min,
+            max_rounds=cfg.bcrypt_rounds_max,
+        )
+    return calibrate_argon2(
+        cfg.target_verify_ms,
+        memory_cost=cfg.argon2_memory_cost,
+        parallelism=cfg.argon2_parallelism,
+        min_time_cost=cfg.argon2_time_cost_min,
+        max_time_cost=cfg.argon2_time_cost_max,
+    )
+
+
+def apply_calibration(
+    hasher: PasswordHasher, result: CalibrationResult, cfg: SettingsPassword
+) -> None:
+    """
+    Применить подобранные параметры. Хеши с cost в границах из настроек
+    не помечаются на rehash — иначе поды на разном железе перехешировали бы
+    пароли друг за другом при каждом логине.
+    """
+    hasher.configure(
+        result.scheme,
+        **result.params,
+        bcrypt_rounds_bounds=(cfg.bcrypt_rounds_min, cfg.bcrypt_rounds_max),
+        argon2_time_cost_bounds=(cfg.argon2_time_cost_min, cfg.argon2_time_cost_max),
+    )
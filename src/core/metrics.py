@@ -0,0 +1,245 @@
+"""
+Метрики в формате Prometheus (text exposition 0.0.4) без внешних зависимостей.
+
+- Counter / Gauge / Histogram с метками; Histogram.time() — контекст-менеджер для замеров;
+- CallbackGauge — значение считается в момент скрейпа (размер пула, статистика кэша);
+- REGISTRY.render() — текст для GET /metrics.
+
+Метрики живут в памяти воркера: при нескольких воркерах каждый отдаёт свои.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    @abstractmethod
+    def samples(self) -> list[str]: ...
+
+    def render(self) -> list[str]:
+        return self._header() + self.samples()
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()  # hash/verify пишут метрики из пула потоков
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_num(v)}" for key, v in items
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(_Metric):
+    """
+    fn() → число или список (labels, value); вызывается на скрейпе.
+    metric_type="counter" — для монотонных счётчиков, которые уже ведёт сам объект.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        fn: Callable,
+        labelnames: tuple[str, ...] = (),
+        metric_type: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._fn = fn
+        self.type = metric_type
+
+    def samples(self) -> list[str]:
+        try:
+            value = self._fn()
+        except Exception:
+            return []
+        if isinstance(value, (int, float)):
+            return [f"{self.name} {_num(value)}"]
+        return [
+            f"{self.name}{_labels(self.labelnames, self._key(labels))} {_num(v)}"
+            for labels, v in value
+        ]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → [counts по бакетам..., +Inf, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()  # hash/verify пишут метрики из пула потоков
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[bisect_left(self.buckets, value)] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            snapshot = [(key, list(row)) for key, row in self._values.items()]
+        for key, row in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), row):
+                cumulative += count
+                le = 'le="' + _num(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_num(row[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ==========================
+#   Метрики сервиса (стадии)
+# ==========================
+HTTP_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served")
+)
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency",
+        ("method", "route", "status"),
+    )
+)
+PASSWORD_HASH_SECONDS = REGISTRY.register(
+    Histogram(
+        "password_hash_seconds",
+        "PasswordHasher hash/verify time",
+        ("op", "scheme"),
+    )
+)
+JWT_SECONDS = REGISTRY.register(
+    Histogram("jwt_seconds", "JWTUtil sign/verify time", ("op",))
+)
+DB_STATEMENT_SECONDS = REGISTRY.register(
+    Histogram(
+        "db_statement_seconds",
+        "Repository statement time (incl. round trip)",
+        ("repo", "method"),
+    )
+)
+UOW_COMMIT_SECONDS = REGISTRY.register(
+    Histogram("uow_commit_seconds", "UnitOfWork commit time")
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.register(
+    Histogram("db_pool_checkout_wait_seconds", "Time waiting for a pooled connection")
+)
+STARTUP_SECONDS = REGISTRY.register(
+    Gauge("app_startup_seconds", "Lifespan startup time by stage", ("stage",))
+)
@@ -0,0 +1,258 @@
+"""
+Сэмплирующий профайлер работающего воркера (без внешних зависимостей).
+
+Раз в interval снимается стек потока event loop (по SIGALRM, см. SamplingProfiler)
+и копятся веса по уникальным стекам:
+- wall — вес = прошедшее время (видно и ожидание: select/await в БД);
+- cpu  — вес = CPU-время потока loop'а с прошлого сэмпла (простой не попадает).
+
+Выход: collapsed-стеки (flamegraph.pl, speedscope, inferno) или JSON speedscope.
+Стек снимается с потока loop'а целиком: в профиль попадают все запросы,
+которые воркер обслуживал в это время, не только «свой».
+"""
+
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import CodeType, FrameType
+from uuid import uuid4
+
+from core.settings import SettingsProfiling, settings
+
+
+MODES = ("wall", "cpu")
+FORMATS = ("speedscope", "collapsed")
+
+Stack = tuple[str, ...]
+
+
+@dataclass
+class Profile:
+    mode: str
+    interval: float
+    started_at: datetime
+    duration: float = 0.0
+    samples: int = 0
+    weights: Counter = field(default_factory=Counter)  # стек (root → leaf) → мкс
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{';'.join(stack)} {weight}\n"
+            for stack, weight in self.weights.most_common()
+        )
+
+    def speedscope(self, name: str = "auth-service") -> dict:
+        frames: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, weight in self.weights.items():
+            samples.append([frames.setdefault(f, len(frames)) for f in stack])
+            weights.append(weight)
+        total = sum(weights)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": f} for f in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{name} ({self.mode}, {self.started_at.isoformat()})",
+                    "unit": "microseconds",
+                    "startValue": 0,
+                    "endValue": total,
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "auth-service core.profiler",
+        }
+
+    def render(self, fmt: str) -> str | dict:
+        return self.collapsed() if fmt == "collapsed" else self.speedscope()
+
+
+class SamplingProfiler:
+    """
+    Сэмплы снимаются по таймеру SIGALRM (ITIMER_REAL): обработчик сигнала получает
+    кадр, который выполнялся в момент тика, — и в Python-коде, и в ожидании I/O.
+    Поток-сэмплер здесь не годится: он получает GIL только когда loop его отпускает
+    (select, I/O), и профиль смещается к этим точкам.
+
+    Сигналы доступны только из главного потока (uvicorn держит loop именно там);
+    из другого потока — запасной вариант через sys._current_frames() с этим смещением.
+    """
+
+    def __init__(
+        self, thread_id: int, *, interval: float = 0.005, mode: str = "wall"
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.mode = mode
+        self.profile = Profile(mode, interval, datetime.now(timezone.utc))
+        self._labels: dict[CodeType, str] = {}
+        self._use_signals = (
+            hasattr(signal, "setitimer")
+            and thread_id == threading.main_thread().ident
+            and threading.get_ident() == thread_id
+        )
+        self._prev_handler = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._clock = time.perf_counter
+        self._last = 0.0
+        self._started = 0.0
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename.rsplit("/site-packages/", 1)[-1]
+            label = self._labels[code] = (
+                f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+            )
+        return label
+
+    def _stack(self, frame: FrameType | None) -> Stack:
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _make_clock(self):
+        if self.mode == "wall":
+            return time.perf_counter
+        try:
+            clock_id = time.pthread_getcpuclockid(self.thread_id)
+            return lambda: time.clock_gettime(clock_id)
+        except (AttributeError, OSError):  # не Linux — CPU всего процесса
+            return time.process_time
+
+    def _sample(self, frame: FrameType | None) -> None:
+        now = self._clock()
+        weight = int((now - self._last) * 1_000_000)
+        self._last = now
+        # cpu: поток loop'а простаивал с прошлого тика — ничего не пишем
+        if weight <= 0 or frame is None:
+            return
+        self.profile.weights[self._stack(frame)] += weight
+        self.profile.samples += 1
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        self._sample(frame)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample(sys._current_frames().get(self.thread_id))
+
+    def start(self) -> "SamplingProfiler":
+        self._clock = self._make_clock()
+        self._last = self._clock()
+        self._started = time.perf_counter()
+        if self._use_signals:
+            self._prev_handler = signal.signal(signal.SIGALRM, self._on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(
+                target=self._run, name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> Profile:
+        if self._use_signals:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._prev_handler or signal.SIG_DFL)
+        else:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    profile: Profile
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 3),
+            "mode": self.profile.mode,
+            "samples": self.profile.samples,
+            "started_at": self.profile.started_at,
+        }
+
+
+class Profiling:
+    """
+    Точка входа для API: одна съёмка на воркер за раз (профайлеры не вкладываются —
+    каждый сэмплирует весь поток loop'а), последние профили запросов — в памяти.
+    """
+
+    def __init__(self, cfg: SettingsProfiling) -> None:
+        self.cfg = cfg
+        self._busy = threading.Lock()
+        self.recent: deque[RequestProfile] = deque(maxlen=cfg.keep_last)
+
+    @property
+    def enabled(self) -> bool:
+        return self.cfg.enabled
+
+    def try_start(self, *, mode: str, interval: float) -> SamplingProfiler | None:
+        """Запустить профайлер на текущем (loop) потоке; None — уже идёт другая съёмка."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            return SamplingProfiler(
+                threading.get_ident(), interval=interval, mode=mode
+            ).start()
+        except BaseException:
+            self._busy.release()
+            raise
+
+    def finish(self, profiler: SamplingProfiler) -> Profile:
+        try:
+            return profiler.stop()
+        finally:
+            self._busy.release()
+
+    def remember(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        profile: Profile,
+        profile_id: str | None = None,
+    ) -> str:
+        rp = RequestProfile(
+            profile_id or uuid4().hex,
+            method,
+            path,
+            status,
+            profile.duration * 1000,
+            profile,
+        )
+        self.recent.append(rp)
+        return rp.id
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        return next((p for p in self.recent if p.id == profile_id), None)
+
+
+# Экземпляр
+profiling = Profiling(settings.PROFILING)
@@ -0,0 +1,65 @@
+"""
+Token bucket для ограничения частоты (логин и т.п.).
+
+- TokenBuckets — протокол бэкенда: take() списывает cost токенов из корзины key и
+  возвращает, через сколько секунд повторить (0 — разрешено);
+- MemoryTokenBuckets — корзины в памяти воркера (OrderedDict, LRU-вытеснение по maxsize);
+- общие для всех воркеров/подов корзины — у бэкенда состояния (infra.state, RedisTokenBuckets).
+
+Корзина ёмкостью capacity пополняется со скоростью refill_per_sec: разрешает всплеск до capacity
+попыток, дальше — не чаще refill_per_sec в среднем. Отказ токены не списывает.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Protocol
+
+
+class TokenBuckets(Protocol):
+    async def take(
+        self, key: str, *, capacity: float, refill_per_sec: float, cost: float = 1
+    ) -> float: ...
+    async def reset(self, *keys: str) -> None: ...
+
+
+class MemoryTokenBuckets:
+    """Не потокобезопасен — рассчитан на один event loop (как TTLCache)."""
+
+    def __init__(
+        self, maxsize: int = 100_000, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def take_nowait(
+        self, key: str, *, capacity: float, refill_per_sec: float, cost: float = 1
+    ) -> float:
+        now = self._clock()
+        tokens, updated_at = self._data.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_sec)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / refill_per_sec
+        self._data[key] = (tokens, now)
+        self._data.move_to_end(key)
+        # вытесненная корзина «забывается» полной — это не хуже, чем новый ключ
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return retry_after
+
+    async def take(
+        self, key: str, *, capacity: float, refill_per_sec: float, cost: float = 1
+    ) -> float:
+        return self.take_nowait(
+            key, capacity=capacity, refill_per_sec=refill_per_sec, cost=cost
+        )
+
+    async def reset(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
@@ -0,0 +1,40 @@
+"""
+Быстрые JSON-ответы.
+
+- PydanticResponse — тело из готовой pydantic-модели (или списка через TypeAdapter),
+  сериализованное сразу в bytes сериализатором pydantic-core. Если view возвращает
+  Response, FastAPI не прогоняет результат повторно через response_model
+  (validate → dump → json.dumps); response_model в декораторе остаётся для OpenAPI.
+- FastJSONResponse — default_response_class приложения: orjson (в зависимостях сервиса).
+"""
+
+from typing import Any, Mapping
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from fastapi.responses import JSONResponse, Response
+
+
+class PydanticResponse(Response):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel | Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        *,
+        adapter: TypeAdapter | None = None,
+    ) -> None:
+        self._adapter = adapter
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        if self._adapter is not None:
+            return self._adapter.dump_json(content)
+        return content.__pydantic_serializer__.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
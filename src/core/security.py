@@ -1,41 +1,223 @@
+import asyncio
+import hmac
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from core.settings import settings
+from core.metrics import PASSWORD_HASH_SECONDS
+from core.tracing import tracing
+
+
+# поддерживаемые схемы; первая в списке контекста — основная (default),
+# остальные только проверяются и помечаются на перехеширование
+SCHEMES = ("bcrypt", "argon2")
+
+# как уравнивать время ответа «пользователь не найден» с «неверный пароль»:
+# dummy — verify против служебного хеша в том же пуле потоков (та же очередь и CPU);
+# sleep — пауза длиной в скользящее среднее реальных averify (включая ожидание пула),
+#         без CPU; дешевле под перебором, но хуже повторяет хвосты распределения;
+# off   — не уравнивать (тесты, внутренние вызовы)
+TIMING_STRATEGIES = ("dummy", "sleep", "off")
+
 
 class PasswordHasher:
     """
-    Обёртка над passlib с единственной схемой bcrypt.
-    ✓ hash()        — хеширует пароль
-    ✓ verify()      — проверяет пароль; поддерживает мягкую миграцию с plaintext
-    ✓ needs_rehash()— сигналит, что хеш стоит пересоздать (например, подняли rounds)
+    Обёртка над passlib: основная схема (bcrypt или argon2id) + проверка второй.
+    ✓ hash()        — хеширует пароль основной схемой
+    ✓ verify()      — проверяет пароль любой из схем; поддерживает мягкую миграцию с plaintext
+    ✓ needs_rehash()— сигналит, что хеш стоит пересоздать (другая схема / поменяли параметры)
+    ✓ ahash()/averify() — то же самое, но в пуле потоков (не блокируем event loop)
+    ✓ warmup()      — собрать контекст и загрузить бэкенды заранее (lifespan), а не на первом логине
+    ✓ dummy_verify()— verify той же стоимости против служебного хеша: ответ «нет такого
+                      пользователя» не должен быть быстрее ответа «неверный пароль»
+    ✓ adummy_verify()— то же в async-пути; стратегия — timing (TIMING_STRATEGIES)
     """
 
-    def __init__(self, rounds: int = 12) -> None:
-        self.ctx = CryptContext(
-            schemes=["bcrypt"],
+    def __init__(
+        self,
+        scheme: str = "bcrypt",
+        *,
+        bcrypt_rounds: int = 12,
+        argon2_memory_cost: int = 64 * 1024,
+        argon2_time_cost: int = 3,
+        argon2_parallelism: int = 4,
+        bcrypt_rounds_bounds: tuple[int, int] | None = None,
+        argon2_time_cost_bounds: tuple[int, int] | None = None,
+        threads: int | None = None,
+        timing: str = "dummy",
+    ) -> None:
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password scheme {scheme!r}, expected {SCHEMES}")
+        if timing not in TIMING_STRATEGIES:
+            raise ValueError(
+                f"Unknown timing strategy {timing!r}, expected {TIMING_STRATEGIES}"
+            )
+        self.scheme = scheme
+        self.timing = timing
+        # скользящее среднее averify (сек, с ожиданием пула) — для timing="sleep"
+        self._verify_ewma: float | None = None
+        # bounds — хеши с cost в этих пределах не перехешируются (калибровка на
+        # разном железе не должна гонять rehash туда-обратно)
+        self.params: dict = {
+            "bcrypt_rounds": bcrypt_rounds,
+            "argon2_memory_cost": argon2_memory_cost,
+            "argon2_time_cost": argon2_time_cost,
+            "argon2_parallelism": argon2_parallelism,
+            "bcrypt_rounds_bounds": bcrypt_rounds_bounds,
+            "argon2_time_cost_bounds": argon2_time_cost_bounds,
+        }
+        # CryptContext собирается при первом обращении (не на импорте модуля)
+        self._ctx: CryptContext | None = None
+        self._dummy_hash: str | None = None
+        # bcrypt/argon2 отпускают GIL, поэтому пул потоков реально параллелит хеширование
+        self._threads = threads
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def ctx(self) -> CryptContext:
+        if self._ctx is None:
+            self._ctx = self._build_context(self.scheme, self.params)
+        return self._ctx
+
+    def warmup(self) -> None:
+        # passlib выбирает и загружает бэкенд схемы (bcrypt/argon2-cffi) на первом hash/verify
+        for scheme in self.ctx.schemes():
+            self.ctx.handler(scheme).get_backend()
+        # служебный хеш для dummy_verify — один hash() на старте, а не на первом логине
+        _ = self.dummy_hash
+
+    @property
+    def dummy_hash(self) -> str:
+        """Хеш основной схемы с текущими параметрами — та же стоимость verify, что у живых."""
+        if self._dummy_hash is None:
+            self._dummy_hash = self.ctx.hash("dummy-password-for-timing")
+        return self._dummy_hash
+
+    @staticmethod
+    def _build_context(scheme: str, params: dict) -> CryptContext:
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password scheme {scheme!r}, expected {SCHEMES}")
+        options = {
+            "bcrypt__rounds": params["bcrypt_rounds"],
+            "argon2__type": "ID",
+            "argon2__memory_cost": params["argon2_memory_cost"],  # KiB
+            "argon2__time_cost": params["argon2_time_cost"],
+            "argon2__parallelism": params["argon2_parallelism"],
+        }
+        if params["bcrypt_rounds_bounds"]:
+            options["bcrypt__min_rounds"], options["bcrypt__max_rounds"] = params[
+                "bcrypt_rounds_bounds"
+            ]
+        if params["argon2_time_cost_bounds"]:
+            options["argon2__min_rounds"], options["argon2__max_rounds"] = params[
+                "argon2_time_cost_bounds"
+            ]
+        return CryptContext(
+            schemes=[scheme, *(s for s in SCHEMES if s != scheme)],
+            default=scheme,
             deprecated="auto",
-            bcrypt__rounds=rounds,
+            **options,
         )
 
-    @staticmethod
-    def _looks_like_bcrypt(value: str) -> bool:
-        # bcrypt-хеши начинаются на $2a$ / $2b$ / $2y$
-        return isinstance(value, str) and value.startswith("$2")
+    def configure(self, scheme: str | None = None, **params) -> None:
+        """Пересобрать контекст с новыми параметрами (например, после калибровки)."""
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise TypeError(f"Unknown hasher params: {sorted(unknown)}")
+        scheme = scheme or self.scheme
+        merged = {**self.params, **params}
+        self._ctx = self._build_context(scheme, merged)
+        self.scheme, self.params = scheme, merged
+        self._dummy_hash = None  # параметры поменялись — служебный хеш тоже
+        self._verify_ewma = None
+
+    def is_hashed(self, stored: str) -> bool:
+        """False — в БД лежит «сырой» (plaintext) пароль."""
+        return bool(stored) and self.ctx.identify(stored, required=False) is not None
 
     def hash(self, raw_password: str) -> str:
-        return self.ctx.hash(raw_password)
+        with PASSWORD_HASH_SECONDS.time(op="hash", scheme=self.scheme):
+            return self.ctx.hash(raw_password)
 
     def verify(self, raw_password: str, stored: str) -> bool:
+        scheme = self.ctx.identify(stored, required=False) if stored else None
         # Мягкая миграция: если в БД лежит «сырой» пароль — сравниваем напрямую
-        if not stored or not self._looks_like_bcrypt(stored):
-            return raw_password == stored
-        return self.ctx.verify(raw_password, stored)
+        if scheme is None:
+            return hmac.compare_digest(raw_password.encode(), stored.encode())
+        with PASSWORD_HASH_SECONDS.time(op="verify", scheme=scheme):
+            return self.ctx.verify(raw_password, stored)
+
+    def dummy_verify(self, raw_password: str) -> bool:
+        """Проверка впустую (пользователь не найден); всегда False."""
+        self.verify(raw_password, self.dummy_hash)
+        return False
 
     def needs_rehash(self, stored: str) -> bool:
         # Для plaintext всегда True — перехешируем при первом успешном логине
-        if not stored or not self._looks_like_bcrypt(stored):
+        if not self.is_hashed(stored):
             return True
         return self.ctx.needs_update(stored)
 
+    # ---- async-обёртки (пул потоков) ----
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._threads, thread_name_prefix="pwd-hash"
+            )
+        return self._executor
+
+    async def ahash(self, raw_password: str) -> str:
+        loop = asyncio.get_running_loop()
+        with tracing.span("password.hash", **{"password.scheme": self.scheme}):
+            return await loop.run_in_executor(self.executor, self.hash, raw_password)
+
+    async def averify(self, raw_password: str, stored: str) -> bool:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with tracing.span("password.verify"):
+            ok = await loop.run_in_executor(
+                self.executor, self.verify, raw_password, stored
+            )
+        self._observe(time.perf_counter() - started)
+        return ok
+
+    def _observe(self, seconds: float, alpha: float = 0.1) -> None:
+        prev = self._verify_ewma
+        self._verify_ewma = seconds if prev is None else prev + alpha * (seconds - prev)
+
+    async def adummy_verify(self, raw_password: str) -> bool:
+        """Пользователь не найден: потратить столько же, сколько averify (см. timing)."""
+        if self.timing == "off":
+            return False
+        # sleep без замеров ещё не знает, сколько ждать, — первый раз как dummy
+        if self.timing == "sleep" and self._verify_ewma is not None:
+            with tracing.span("password.verify", **{"password.timing": "sleep"}):
+                await asyncio.sleep(self._verify_ewma)
+            return False
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with tracing.span("password.verify", **{"password.timing": "dummy"}):
+            await loop.run_in_executor(self.executor, self.dummy_verify, raw_password)
+        self._observe(time.perf_counter() - started)
+        return False
+
+    def shutdown(self) -> None:
+        """Остановить пул потоков (вызывать на shutdown приложения)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
 
 # Экземпляр
-pwd_hasher = PasswordHasher()
+pwd_hasher = PasswordHasher(
+    settings.PASSWORD.scheme,
+    bcrypt_rounds=settings.PASSWORD.bcrypt_rounds,
+    argon2_memory_cost=settings.PASSWORD.argon2_memory_cost,
+    argon2_time_cost=settings.PASSWORD.argon2_time_cost,
+    argon2_parallelism=settings.PASSWORD.argon2_parallelism,
+    threads=settings.PASSWORD.hash_threads,
+    timing=settings.PASSWORD.timing,
+)
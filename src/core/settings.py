@@ -1,16 +1,10 @@
-import os
-
 from pathlib import Path
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from dotenv import load_dotenv
-
-
-load_dotenv()  # загрузка переменных окружения
-
 
+# .env читает сам pydantic-settings (env_file) — без load_dotenv() и os.getenv на импорте
 BASE_DIR = Path(__file__).parent.parent
 
 
@@ -20,13 +14,43 @@ class SettingsDataBase(BaseSettings):
         env_file_encoding="utf-8",
         extra="ignore",
     )
-    DB_NAME: str = os.getenv("POSTGRES_DB")
-    DB_USER: str = os.getenv("POSTGRES_USER")
-    DB_PASSWORD: str = os.getenv("POSTGRES_PASSWORD")
-    DB_HOST: str = os.getenv("POSTGRES_HOST")
-    DB_PORT: int = os.getenv("POSTGRES_PORT")
+    DB_NAME: str | None = Field(default=None, validation_alias="POSTGRES_DB")
+    DB_USER: str | None = Field(default=None, validation_alias="POSTGRES_USER")
+    DB_PASSWORD: str | None = Field(default=None, validation_alias="POSTGRES_PASSWORD")
+    DB_HOST: str | None = Field(default=None, validation_alias="POSTGRES_HOST")
+    DB_PORT: int | None = Field(default=None, validation_alias="POSTGRES_PORT")
 
-    ECHO: int = os.getenv("ECHO")
+    ECHO: int = 0
+
+    # пул соединений на воркер; с DB_CONNECTION_BUDGET делится между воркерами
+    # (db_manager.pool_limits): сумма по всем воркерам пода не превышает бюджет
+    POOL_SIZE: int = Field(default=5, validation_alias="DB_POOL_SIZE")
+    MAX_OVERFLOW: int = Field(default=10, validation_alias="DB_MAX_OVERFLOW")
+    CONNECTION_BUDGET: int | None = Field(
+        default=None, validation_alias="DB_CONNECTION_BUDGET"
+    )
+    # readiness: воркер не принимает трафик, пока engine не ответит на ping
+    # (server.py включает по умолчанию)
+    WAIT_ON_STARTUP: bool = Field(default=False, validation_alias="DB_WAIT_ON_STARTUP")
+    STARTUP_TIMEOUT: float = Field(
+        default=30, validation_alias="DB_STARTUP_TIMEOUT_SEC"
+    )
+    # /health/ready: результат проверки БД живёт столько секунд (не чаще одного ping
+    # на воркер за это время), таймаут самого ping
+    HEALTH_CACHE_SEC: float = Field(default=2, validation_alias="DB_HEALTH_CACHE_SEC")
+    HEALTH_TIMEOUT_SEC: float = Field(
+        default=1, validation_alias="DB_HEALTH_TIMEOUT_SEC"
+    )
+
+    # жёсткий лимит на запрос поиска пользователей (admin): SET LOCAL statement_timeout
+    SEARCH_TIMEOUT_MS: int = Field(default=250, validation_alias="DB_SEARCH_TIMEOUT_MS")
+
+    # статистика SQL по отпечаткам + лог медленных запросов (0 — не логировать)
+    SQL_STATS: bool = Field(default=True, validation_alias="DB_SQL_STATS")
+    SLOW_QUERY_MS: float = Field(default=200, validation_alias="DB_SLOW_QUERY_MS")
+    SQL_STATS_MAX_FINGERPRINTS: int = Field(
+        default=500, validation_alias="DB_SQL_STATS_MAX_FINGERPRINTS"
+    )
 
     @property
     def url(self) -> str:
@@ -61,6 +85,197 @@ class SettingsAuth(BaseSettings):
     )
 
 
+class SettingsPassword(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # основная схема хеширования: bcrypt | argon2 (argon2id); вторая — только verify + rehash
+    scheme: str = Field(default="bcrypt", validation_alias="PWD_SCHEME")
+    bcrypt_rounds: int = Field(default=12, validation_alias="PWD_BCRYPT_ROUNDS")
+    argon2_memory_cost: int = Field(  # KiB
+        default=64 * 1024, validation_alias="PWD_ARGON2_MEMORY_KIB"
+    )
+    argon2_time_cost: int = Field(default=3, validation_alias="PWD_ARGON2_TIME_COST")
+    argon2_parallelism: int = Field(
+        default=4, validation_alias="PWD_ARGON2_PARALLELISM"
+    )
+
+    # калибровка cost под железо: PWD_CALIBRATE=1 — подобрать и применить на старте
+    calibrate: bool = Field(default=False, validation_alias="PWD_CALIBRATE")
+    target_verify_ms: float = Field(
+        default=250, validation_alias="PWD_TARGET_VERIFY_MS"
+    )
+    bcrypt_rounds_min: int = Field(default=10, validation_alias="PWD_BCRYPT_ROUNDS_MIN")
+    bcrypt_rounds_max: int = Field(default=14, validation_alias="PWD_BCRYPT_ROUNDS_MAX")
+    argon2_time_cost_min: int = Field(
+        default=2, validation_alias="PWD_ARGON2_TIME_COST_MIN"
+    )
+    argon2_time_cost_max: int = Field(
+        default=10, validation_alias="PWD_ARGON2_TIME_COST_MAX"
+    )
+
+    # пул потоков для хеширования (None — по умолчанию ThreadPoolExecutor)
+    hash_threads: int | None = Field(default=None, validation_alias="PWD_HASH_THREADS")
+    # уравнивание времени логина для неизвестных email: dummy | sleep | off
+    timing: str = Field(default="dummy", validation_alias="PWD_TIMING_EQUALIZATION")
+
+    # фоновая перехеширование при логине (мягкая миграция)
+    rehash_queue_size: int = Field(default=1000, validation_alias="REHASH_QUEUE_SIZE")
+    rehash_workers: int = Field(default=2, validation_alias="REHASH_WORKERS")
+
+
+class SettingsCache(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # read-through кэш профилей (/users/me)
+    user_enabled: bool = Field(default=True, validation_alias="USER_CACHE_ENABLED")
+    user_ttl: float = Field(default=60, validation_alias="USER_CACHE_TTL_SEC")
+    user_maxsize: int = Field(default=10_000, validation_alias="USER_CACHE_MAXSIZE")
+    # негативный кэш логина: email, для которых нет пользователя (перебор по базам утечек)
+    unknown_email_enabled: bool = Field(
+        default=True, validation_alias="UNKNOWN_EMAIL_CACHE_ENABLED"
+    )
+    unknown_email_ttl: float = Field(
+        default=30, validation_alias="UNKNOWN_EMAIL_CACHE_TTL_SEC"
+    )
+    unknown_email_maxsize: int = Field(
+        default=100_000, validation_alias="UNKNOWN_EMAIL_CACHE_MAXSIZE"
+    )
+    # версии токенов (claim ver): с общим бэкендом bump пишется в него сразу,
+    # TTL лишь ограничивает чтения из БД
+    token_version_ttl: float = Field(
+        default=30, validation_alias="TOKEN_VERSION_CACHE_TTL_SEC"
+    )
+    # memory:// и несколько воркеров: другой воркер видит глобальный выход не позже
+    # чем через этот TTL — верхняя граница задержки отзыва (TTL выше урезается до него)
+    token_version_local_ttl: float = Field(
+        default=2, validation_alias="TOKEN_VERSION_LOCAL_TTL_SEC"
+    )
+    token_version_maxsize: int = Field(
+        default=100_000, validation_alias="TOKEN_VERSION_CACHE_MAXSIZE"
+    )
+
+
+class SettingsRateLimit(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # троттлинг /auth/login до проверки пароля (token bucket: всплеск + пополнение в минуту)
+    login_enabled: bool = Field(
+        default=True, validation_alias="LOGIN_RATE_LIMIT_ENABLED"
+    )
+    login_ip_burst: int = Field(default=20, validation_alias="LOGIN_RATE_IP_BURST")
+    login_ip_per_min: float = Field(
+        default=10, validation_alias="LOGIN_RATE_IP_PER_MIN"
+    )
+    login_email_burst: int = Field(default=5, validation_alias="LOGIN_RATE_EMAIL_BURST")
+    login_email_per_min: float = Field(
+        default=2, validation_alias="LOGIN_RATE_EMAIL_PER_MIN"
+    )
+    # корзины в памяти воркера; при общем STATE_BACKEND_URL — в нём
+    maxsize: int = Field(default=100_000, validation_alias="RATE_LIMIT_MAXSIZE")
+
+
+class SettingsAudit(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    enabled: bool = Field(default=True, validation_alias="AUDIT_ENABLED")
+    # буфер событий в памяти воркера и пачка одного INSERT
+    queue_size: int = Field(default=10_000, validation_alias="AUDIT_QUEUE_SIZE")
+    batch_size: int = Field(default=500, validation_alias="AUDIT_BATCH_SIZE")
+    flush_interval_ms: float = Field(
+        default=200, validation_alias="AUDIT_FLUSH_INTERVAL_MS"
+    )
+    # при переполнении буфера: drop_new | drop_oldest
+    overflow: str = Field(default="drop_new", validation_alias="AUDIT_OVERFLOW")
+    # месячные секции auditevents, создаваемые наперёд (на старте и раз в interval)
+    partitions_ahead: int = Field(default=2, validation_alias="AUDIT_PARTITIONS_AHEAD")
+    partitions_interval_sec: float = Field(
+        default=3600, validation_alias="AUDIT_PARTITIONS_INTERVAL_SEC"
+    )
+
+
+class SettingsRevokeAll(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # глобальный выход — всегда +1 к users.token_version; строки сессий/refresh:
+    # inline — два UPDATE в запросе (204); chunked — фоновая задача пачками (202 + статус),
+    # статус задачи должен быть виден всем воркерам — только с общим STATE_BACKEND_URL
+    mode: str = Field(default="inline", validation_alias="REVOKE_ALL_MODE")
+    batch_size: int = Field(default=1000, validation_alias="REVOKE_ALL_BATCH_SIZE")
+    # пауза между пачками (реплики/autovacuum успевают за WAL)
+    pause_ms: float = Field(default=20, validation_alias="REVOKE_ALL_PAUSE_MS")
+    # сколько хранить статус задачи
+    status_ttl: int = Field(
+        default=86_400, validation_alias="REVOKE_ALL_STATUS_TTL_SEC"
+    )
+
+
+class SettingsState(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # общее состояние (кэши, множества отзыва, лимиты): memory:// | redis://… | fakeredis://
+    url: str = Field(default="memory://", validation_alias="STATE_BACKEND_URL")
+    prefix: str = Field(default="auth:", validation_alias="STATE_KEY_PREFIX")
+    memory_maxsize: int = Field(
+        default=100_000, validation_alias="STATE_MEMORY_MAXSIZE"
+    )
+
+
+class SettingsTracing(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # OpenTelemetry (нужны пакеты opentelemetry-sdk / -exporter-otlp-proto-http)
+    enabled: bool = Field(default=False, validation_alias="TRACING_ENABLED")
+    # otlp | console | memory
+    exporter: str = Field(default="otlp", validation_alias="TRACING_EXPORTER")
+    otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces",
+        validation_alias="OTEL_EXPORTER_OTLP_TRACES_ENDPOINT",
+    )
+    service_name: str = Field(
+        default="auth-service", validation_alias="OTEL_SERVICE_NAME"
+    )
+    sample_ratio: float = Field(default=1.0, validation_alias="TRACING_SAMPLE_RATIO")
+
+
+class SettingsProfiling(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=str(BASE_DIR / ".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+    # сэмплирующий профайлер (admin-эндпоинты и заголовок на запрос) — только явно
+    enabled: bool = Field(default=False, validation_alias="PROFILING_ENABLED")
+    max_seconds: float = Field(default=60, validation_alias="PROFILING_MAX_SECONDS")
+    interval_ms: float = Field(default=5, validation_alias="PROFILING_INTERVAL_MS")
+    # запрос короткий — для профиля по заголовку сэмплируем чаще
+    request_interval_ms: float = Field(
+        default=1, validation_alias="PROFILING_REQUEST_INTERVAL_MS"
+    )
+    header: str = Field(default="X-Profile", validation_alias="PROFILING_HEADER")
+    keep_last: int = Field(default=20, validation_alias="PROFILING_KEEP_LAST")
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"),
@@ -68,18 +283,49 @@ class Settings(BaseSettings):
         extra="ignore",
     )
     # == базовые настройки запуска сервиса
-    SERVICE_HOST: str = os.getenv("SERVICE_HOST")
-    SERVICE_PORT: int = os.getenv("SERVICE_PORT")
-    SERVICE_RELOAD: int = os.getenv("SERVICE_RELOAD")
+    SERVICE_HOST: str | None = None
+    SERVICE_PORT: int | None = None
+    SERVICE_RELOAD: int = 0
+    # прод-режим (server.py): число воркеров (None — по числу CPU) и время на
+    # дообработку запросов при остановке/рестарте воркера
+    SERVICE_WORKERS: int | None = None
+    SERVICE_GRACEFUL_TIMEOUT: int = 30
+    # адреса прокси, которым uvicorn доверяет X-Forwarded-For (через запятую, "*" — всем);
+    # от остальных заголовок игнорируется и IP клиента — адрес соединения
+    SERVICE_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
 
     #  == настройки префиксов роутинга
     API_V1_PREFIX: str = "/auth_api/v1"
 
     # == DataBase
-    DATABASE: SettingsDataBase = SettingsDataBase()
+    DATABASE: SettingsDataBase = Field(default_factory=SettingsDataBase)
 
     # == JWT
-    AUTH_JWT: SettingsAuth = SettingsAuth()
+    AUTH_JWT: SettingsAuth = Field(default_factory=SettingsAuth)
+
+    # == Пароли
+    PASSWORD: SettingsPassword = Field(default_factory=SettingsPassword)
+
+    # == Кэши
+    CACHE: SettingsCache = Field(default_factory=SettingsCache)
+
+    # == Ограничение частоты
+    RATE_LIMIT: SettingsRateLimit = Field(default_factory=SettingsRateLimit)
+
+    # == Журнал событий auth
+    AUDIT: SettingsAudit = Field(default_factory=SettingsAudit)
+
+    # == Глобальный выход
+    REVOKE_ALL: SettingsRevokeAll = Field(default_factory=SettingsRevokeAll)
+
+    # == Общее состояние
+    STATE: SettingsState = Field(default_factory=SettingsState)
+
+    # == Трассировка
+    TRACING: SettingsTracing = Field(default_factory=SettingsTracing)
+
+    # == Профилирование
+    PROFILING: SettingsProfiling = Field(default_factory=SettingsProfiling)
 
 
 settings = Settings()
@@ -0,0 +1,185 @@
+"""
+Статистика SQL по «отпечаткам» запросов + лог медленных запросов.
+
+Хуки before/after_cursor_execute на engine (вместо echo=, который печатает всё подряд):
+- время каждого запроса агрегируется по нормализованному тексту (параметры/литералы → ?,
+  списки IN (...) и VALUES (...), (...) схлопываются);
+- по отпечатку: calls, total/mean/max, p99 по последним N замерам, rows;
+- запросы дольше порога пишутся в лог вместе с методом репозитория, из которого пришли
+  (SQLAlchemyRepository._execute кладёт его в execution_options["origin"]).
+
+Текст параметров в лог не попадает (там бывают хеши паролей и refresh).
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.settings import settings
+
+
+logger = logging.getLogger("sql.slow")
+
+_OTHER = "<other>"
+
+_NORMALIZE = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # строковые литералы
+    (
+        re.compile(r"\$\d+|%\(\w+\)s|(?<!:):(?!:)\w+\b|\?"),
+        "?",
+    ),  # плейсхолдеры драйверов
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), "?"),  # числа
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)*\s*\)"), "(...)"),
+    (re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+"), "(...)"),
+)
+
+
+def fingerprint(statement: str) -> str:
+    """Нормализованный текст запроса: одинаковый для вызовов с разными параметрами."""
+    for pattern, repl in _NORMALIZE:
+        statement = pattern.sub(repl, statement)
+    return statement.strip()
+
+
+@dataclass(slots=True)
+class StatementStats:
+    fingerprint: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    origins: set[str] = field(default_factory=set)
+    recent: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    def add(self, elapsed_ms: float, rows: int, origin: str | None) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rows > 0:  # -1 — драйвер не знает (SELECT до fetch у части драйверов)
+            self.rows += rows
+        if origin and len(self.origins) < 10:
+            self.origins.add(origin)
+        self.recent.append(elapsed_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    @property
+    def p99_ms(self) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "origins": sorted(self.origins),
+        }
+
+
+class SQLStats:
+    ORDER_FIELDS = ("total_ms", "mean_ms", "p99_ms", "max_ms", "calls", "rows")
+
+    def __init__(
+        self,
+        *,
+        slow_ms: float = 200,
+        max_fingerprints: int = 500,
+        reservoir: int = 1000,
+    ) -> None:
+        self.slow_ms = slow_ms
+        self.max_fingerprints = max_fingerprints
+        self.reservoir = reservoir
+        self._stats: dict[str, StatementStats] = {}
+        self._fingerprints: dict[str, str] = {}  # сырой текст → отпечаток (кэш regex)
+        self.since = datetime.now(timezone.utc)
+
+    # ---- engine hooks ----
+    def attach(self, engine: Engine) -> None:
+        """Подключить к sync-engine (для AsyncEngine — engine.sync_engine)."""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._stats_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_stats_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        origin = context.execution_options.get("origin")
+        self.record(statement, elapsed_ms, cursor.rowcount, origin)
+
+    # ---- агрегаты ----
+    def _fingerprint(self, statement: str) -> str:
+        fp = self._fingerprints.get(statement)
+        if fp is None:
+            fp = fingerprint(statement)
+            if len(self._fingerprints) < self.max_fingerprints * 4:
+                self._fingerprints[statement] = fp
+        return fp
+
+    def record(
+        self, statement: str, elapsed_ms: float, rows: int, origin: str | None = None
+    ) -> None:
+        fp = self._fingerprint(statement)
+        stats = self._stats.get(fp)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                fp = _OTHER  # не даём словарю расти без границ
+                stats = self._stats.get(fp)
+            if stats is None:
+                stats = self._stats[fp] = StatementStats(
+                    fp, recent=deque(maxlen=self.reservoir)
+                )
+        stats.add(elapsed_ms, rows, origin)
+
+        if self.slow_ms and elapsed_ms >= self.slow_ms:
+            logger.warning(
+                "Slow SQL %.1fms origin=%s rows=%s: %s",
+                elapsed_ms,
+                origin or "-",
+                rows,
+                fp,
+            )
+
+    def snapshot(
+        self, order_by: str = "total_ms", limit: int | None = 50
+    ) -> list[dict]:
+        if order_by not in self.ORDER_FIELDS:
+            raise ValueError(f"order_by must be one of {self.ORDER_FIELDS}")
+        items = sorted(
+            self._stats.values(), key=lambda s: getattr(s, order_by), reverse=True
+        )
+        return [s.as_dict() for s in items[:limit]]
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self.since = datetime.now(timezone.utc)
+
+
+# Экземпляр
+sql_stats = SQLStats(
+    slow_ms=settings.DATABASE.SLOW_QUERY_MS,
+    max_fingerprints=settings.DATABASE.SQL_STATS_MAX_FINGERPRINTS,
+)
@@ -0,0 +1,125 @@
+"""
+Трассировка OpenTelemetry (опционально).
+
+Пакеты opentelemetry-* не обязательны: без них или при TRACING_ENABLED=0
+span() возвращает общий nullcontext, а @traced — одну проверку флага на вызов.
+Модули SDK импортируются только в setup() при включённой трассировке (не на старте).
+
+- tracing.setup(cfg) — провайдер + экспортер (otlp | console | memory), вызывается в lifespan;
+- tracing.server_span(...) — корневой спан запроса (TracingMiddleware);
+- tracing.span(name, **attrs) — контекст-менеджер вокруг стадии;
+- @traced(name) — то же для async-методов (сервисы);
+- tracing.memory_exporter — собранные спаны при TRACING_EXPORTER=memory (проверки/отладка).
+"""
+
+import functools
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Awaitable, Callable, TypeVar
+
+from core.settings import SettingsTracing
+
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+_NOOP = nullcontext()
+
+
+class Tracing:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.tracer = None
+        self.provider = None
+        self.memory_exporter = None
+        self._extract = None
+        self._server_kind = None
+
+    def setup(self, cfg: SettingsTracing) -> None:
+        if not cfg.enabled:
+            return
+        try:
+            from opentelemetry import propagate, trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import (
+                BatchSpanProcessor,
+                ConsoleSpanExporter,
+                SimpleSpanProcessor,
+            )
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+                InMemorySpanExporter,
+            )
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        except ImportError as e:  # pragma: no cover - зависит от окружения
+            raise RuntimeError(
+                "TRACING_ENABLED=1, но opentelemetry-sdk не установлен "
+                "(pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http)"
+            ) from e
+
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": cfg.service_name}),
+            sampler=ParentBased(TraceIdRatioBased(cfg.sample_ratio)),
+        )
+        if cfg.exporter == "memory":
+            self.memory_exporter = InMemorySpanExporter()
+            provider.add_span_processor(SimpleSpanProcessor(self.memory_exporter))
+        elif cfg.exporter == "console":
+            provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            provider.add_span_processor(
+                BatchSpanProcessor(OTLPSpanExporter(endpoint=cfg.otlp_endpoint))
+            )
+
+        # свой провайдер, без глобального set_tracer_provider: setup можно звать повторно
+        self.provider = provider
+        self.tracer = provider.get_tracer("auth-service")
+        self._extract = propagate.extract
+        self._server_kind = trace.SpanKind.SERVER
+        self.enabled = True
+
+    def shutdown(self) -> None:
+        if self.provider is not None:
+            self.provider.shutdown()
+        self.enabled = False
+        self.tracer = self.provider = None
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager:
+        if not self.enabled:
+            return _NOOP
+        return self.tracer.start_as_current_span(name, attributes=attributes or None)
+
+    def server_span(
+        self, name: str, carrier: dict[str, str], **attributes: Any
+    ) -> AbstractContextManager:
+        """Корневой спан запроса; родитель — из заголовка traceparent, если он есть."""
+        if not self.enabled:
+            return _NOOP
+        return self.tracer.start_as_current_span(
+            name,
+            context=self._extract(carrier),
+            kind=self._server_kind,
+            attributes=attributes or None,
+        )
+
+
+# Экземпляр
+tracing = Tracing()
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Спан вокруг async-функции (при выключенной трассировке — прямой вызов)."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracing.enabled:
+                return await fn(*args, **kwargs)
+            with tracing.tracer.start_as_current_span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
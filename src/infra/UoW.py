@@ -1,12 +1,22 @@
+import inspect
+import logging
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from core.metrics import UOW_COMMIT_SECONDS
+from core.tracing import tracing
+
 # ропозитории приложений
 from apps.users.repository import UsersRepo
 from apps.auth.repository import AuthSessionsRepo, RefreshTokensRepo
+from apps.audit.repository import AuditRepo
+from infra.repository import AfterCommit, AFTER_COMMIT_KEY
+
+
+logger = logging.getLogger(__name__)
 
 
 class IUnitOfWork(ABC):
@@ -28,6 +38,8 @@ class UnitOfWork(IUnitOfWork):
     - Открывает сессию в __aenter__, закрывает в __aexit__
     - Авто-commit при отсутствии исключений, иначе rollback
     - Репозитории создаются лениво и используют единую сессию
+    - after_commit(): действия, которые можно выполнять только после COMMIT
+      (инвалидация кэшей, аудит); при rollback они отбрасываются
     """
 
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
@@ -38,6 +50,7 @@ class UnitOfWork(IUnitOfWork):
         self._users_repo: Optional[UsersRepo] = None
         self._sessions_repo: Optional[AuthSessionsRepo] = None
         self._refresh_repo: Optional[RefreshTokensRepo] = None
+        self._audit_repo: Optional[AuditRepo] = None
 
     # Репозитории как свойства (ленивая инициализация)
     @property
@@ -61,24 +74,48 @@ class UnitOfWork(IUnitOfWork):
             self._refresh_repo = RefreshTokensRepo(self.session)
         return self._refresh_repo
 
+    @property
+    def audit(self) -> AuditRepo:
+        assert self.session is not None, "UoW not entered"
+        if self._audit_repo is None:
+            self._audit_repo = AuditRepo(self.session)
+        return self._audit_repo
+
     async def __aenter__(self) -> "UnitOfWork":
-        self.session = self._session_factory()
+        with tracing.span("uow.enter"):
+            self.session = self._session_factory()
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        try:
-            if exc_type is None:
-                await self.session.commit()
-            else:
-                await self.session.rollback()
-        finally:
-            await self.session.close()
+        with tracing.span("uow.exit", **{"uow.rollback": exc_type is not None}):
+            try:
+                if exc_type is None:
+                    await self.commit()
+                else:
+                    await self.rollback()
+            finally:
+                await self.session.close()
+
+    def after_commit(self, callback: AfterCommit) -> None:
+        """Вызвать callback (sync или async) после ближайшего успешного COMMIT."""
+        assert self.session is not None, "UoW not entered"
+        self.session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
 
     async def commit(self) -> None:
-        await self.session.commit()
+        with tracing.span("uow.commit"), UOW_COMMIT_SECONDS.time():
+            await self.session.commit()
+        # данные уже зафиксированы: ошибка колбэка не должна превращаться в ошибку запроса
+        for callback in self.session.info.pop(AFTER_COMMIT_KEY, ()):
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("after_commit callback %r failed", callback)
 
     async def rollback(self) -> None:
         await self.session.rollback()
+        self.session.info.pop(AFTER_COMMIT_KEY, None)
 
     @asynccontextmanager
     async def savepoint(self) -> AsyncIterator[None]:
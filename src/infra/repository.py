@@ -1,12 +1,51 @@
-from typing import Any, ClassVar, Generic, Optional, Sequence, TypeVar
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, ClassVar, Generic, Optional, Sequence
+from typing import TypeVar
 
 import sqlalchemy as sa
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Load
 
+from core.metrics import DB_STATEMENT_SECONDS
+from core.tracing import tracing
+
 T = TypeVar("T")  # ORM-модель
 
+# действия после COMMIT копятся в session.info (см. UnitOfWork.after_commit)
+AfterCommit = Callable[[], Awaitable[None] | None]
+AFTER_COMMIT_KEY = "after_commit"
+
+
+# (репозиторий, метод), с которого начался вызов: get_by_email → one_or_none → _execute
+# отчитывается как get_by_email. Ставит внешний публичный метод, вложенные вызовы
+# того же репозитория его не перетирают.
+_ORIGIN: ContextVar[tuple[object, str] | None] = ContextVar("repo_origin", default=None)
+
+
+def _with_origin(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(fn)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        current = _ORIGIN.get()
+        if current is not None and current[0] is self:
+            return await fn(self, *args, **kwargs)
+        token = _ORIGIN.set((self, fn.__name__))
+        try:
+            return await fn(self, *args, **kwargs)
+        finally:
+            _ORIGIN.reset(token)
+
+    return wrapper
+
+
+def _trace_origins(cls: type) -> None:
+    """Обернуть публичные async-методы класса (один раз, при создании класса)."""
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            setattr(cls, name, _with_origin(attr))
+
 
 class NotFoundError(Exception):
     pass
@@ -20,10 +59,37 @@ class SQLAlchemyRepository(Generic[T]):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _trace_origins(cls)
+
+    def _after_commit(self, callback: AfterCommit) -> None:
+        """Выполнить после COMMIT текущей транзакции (UnitOfWork.commit)."""
+        self.session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+    async def _execute(self, stmt: sa.Executable, *args: Any, **kwargs: Any) -> Result:
+        """
+        session.execute с замером времени по (репозиторий, метод);
+        origin уходит в execution_options — его видят хуки core.sql_stats.
+        """
+        current = _ORIGIN.get()
+        method = (
+            current[1] if current is not None and current[0] is self else "_execute"
+        )
+        repo = type(self).__name__
+        kwargs["execution_options"] = {
+            **kwargs.get("execution_options", {}),
+            "origin": f"{repo}.{method}",
+        }
+        with tracing.span(
+            f"{repo}.{method}", **{"db.system": "postgresql", "code.namespace": repo}
+        ), DB_STATEMENT_SECONDS.time(repo=repo, method=method):
+            return await self.session.execute(stmt, *args, **kwargs)
+
     # ---- CREATE ----
     async def create(self, data: dict[str, Any]) -> T:
         stmt = sa.insert(self.model).values(**data).returning(self.model)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return res.scalar_one()
 
     # ---- READ ----
@@ -36,7 +102,7 @@ class SQLAlchemyRepository(Generic[T]):
         stmt = sa.select(self.model).where(self.model.id == id_)
         for opt in options:
             stmt = stmt.options(opt)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return res.scalar_one_or_none()
 
     async def one_or_none(
@@ -47,7 +113,7 @@ class SQLAlchemyRepository(Generic[T]):
         stmt = sa.select(self.model).where(*where)
         for opt in options:
             stmt = stmt.options(opt)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return res.scalar_one_or_none()
 
     async def find_many(
@@ -67,19 +133,19 @@ class SQLAlchemyRepository(Generic[T]):
             stmt = stmt.offset(offset)
         for opt in options:
             stmt = stmt.options(opt)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return list(res.scalars())
 
     async def count(self, *where: sa.sql.ClauseElement) -> int:
         stmt = sa.select(sa.func.count()).select_from(self.model).where(*where)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return int(res.scalar_one())
 
     async def exists(self, *where: sa.sql.ClauseElement) -> bool:
         stmt = (
             sa.select(sa.literal(True)).select_from(self.model).where(*where).limit(1)
         )
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return res.scalar_one_or_none() is True
 
     # ---- UPDATE ----
@@ -90,7 +156,7 @@ class SQLAlchemyRepository(Generic[T]):
             .values(**data)
             .returning(self.model)
         )
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         obj = res.scalar_one_or_none()
         if obj is None:
             raise NotFoundError(f"{self.model.__name__} id={id_} not found")
@@ -102,17 +168,20 @@ class SQLAlchemyRepository(Generic[T]):
         *where: sa.sql.ClauseElement,
     ) -> list[T]:
         stmt = sa.update(self.model).where(*where).values(**data).returning(self.model)
-        res: Result = await self.session.execute(stmt)
+        res: Result = await self._execute(stmt)
         return list(res.scalars())
 
     # ---- DELETE ----
     async def delete_by_id(self, id_: int) -> None:
         stmt = sa.delete(self.model).where(self.model.id == id_)
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         if (res.rowcount or 0) == 0:
             raise NotFoundError(f"{self.model.__name__} id={id_} not found")
 
     async def delete_where(self, *where: sa.sql.ClauseElement) -> int:
         stmt = sa.delete(self.model).where(*where)
-        res = await self.session.execute(stmt)
+        res = await self._execute(stmt)
         return int(res.rowcount or 0)
+
+
+_trace_origins(SQLAlchemyRepository)
@@ -0,0 +1,153 @@
+"""
+Общее состояние сервиса (кэши, отметки отзыва, статусы задач, корзины лимитов)
+за одним интерфейсом.
+
+Бэкенд выбирается URL'ом (STATE_BACKEND_URL) и открывается в lifespan → app.state.state:
+- memory://             — в памяти воркера (по умолчанию; у каждого воркера своё);
+- redis://, rediss://, unix:// — общий Redis (или совместимый: KeyDB, Valkey), пакет redis;
+- fakeredis://          — Redis-протокол в памяти процесса (пакет fakeredis, для тестов/локально):
+                          тот же RedisStateBackend, те же команды и Lua, без сервера.
+
+Значения — строки (JSON и т.п.); интерфейс — ровно то, что нужно кэшам
+(core.cache.CacheBackend) и троттлингу (buckets).
+"""
+
+from typing import Any, Protocol
+
+from core.cache import TTLCache
+from core.rate_limit import MemoryTokenBuckets, TokenBuckets
+from core.settings import SettingsState
+
+
+class StateBackend(Protocol):
+    local: bool  # True — данные видит только этот воркер
+    buckets: TokenBuckets
+
+    async def get(self, key: str) -> str | None: ...
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None: ...
+    async def delete(self, *keys: str) -> None: ...
+    async def aclose(self) -> None: ...
+
+
+class MemoryStateBackend:
+    local = True
+
+    def __init__(self, *, maxsize: int = 100_000, ttl: float = 3600) -> None:
+        self._kv = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.buckets = MemoryTokenBuckets(maxsize)
+
+    async def get(self, key: str) -> str | None:
+        return self._kv.get_nowait(key)
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self._kv.set_nowait(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self._kv.delete_nowait(*keys)
+
+    async def aclose(self) -> None:
+        self._kv.clear()
+
+
+# время берём у Redis (TIME) — часы воркеров/подов могут расходиться
+_TAKE_LUA = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisTokenBuckets:
+    """Token bucket в Redis: одна Lua-операция на take() (см. core.rate_limit)."""
+
+    def __init__(self, client: Any, *, prefix: str) -> None:
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_LUA)
+
+    async def take(
+        self, key: str, *, capacity: float, refill_per_sec: float, cost: float = 1
+    ) -> float:
+        retry_after = await self._take(
+            keys=[self.prefix + key], args=[capacity, refill_per_sec, cost]
+        )
+        return float(retry_after)
+
+    async def reset(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+
+def _ttl_ms(ttl: float | None) -> int | None:
+    return max(1, int(ttl * 1000)) if ttl is not None else None
+
+
+class RedisStateBackend:
+    """client — redis.asyncio.Redis (или совместимый) с decode_responses=True."""
+
+    local = False
+
+    def __init__(self, client: Any, *, prefix: str = "auth:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self.buckets = RedisTokenBuckets(client, prefix=f"{prefix}rl:")
+
+    def _k(self, key: str) -> str:
+        return self.prefix + key
+
+    async def get(self, key: str) -> str | None:
+        return await self.client.get(self._k(key))
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        await self.client.set(self._k(key), value, px=_ttl_ms(ttl))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self._k(key) for key in keys))
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def open_state(cfg: SettingsState) -> StateBackend:
+    """Бэкенд по STATE_BACKEND_URL; соединение Redis открывается лениво, на первой команде."""
+    scheme = cfg.url.split("://", 1)[0]
+    if scheme == "memory":
+        return MemoryStateBackend(maxsize=cfg.memory_maxsize)
+    if scheme == "fakeredis":
+        try:
+            from fakeredis import FakeAsyncRedis
+        except ImportError as e:  # pragma: no cover - зависит от окружения
+            raise RuntimeError(
+                "STATE_BACKEND_URL=fakeredis://, но пакет fakeredis не установлен"
+            ) from e
+        return RedisStateBackend(
+            FakeAsyncRedis(decode_responses=True), prefix=cfg.prefix
+        )
+    if scheme in ("redis", "rediss", "unix"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:  # pragma: no cover - зависит от окружения
+            raise RuntimeError(
+                f"STATE_BACKEND_URL={scheme}://, но пакет redis не установлен "
+                "(pip install authservice[redis])"
+            ) from e
+        return RedisStateBackend(
+            Redis.from_url(cfg.url, decode_responses=True), prefix=cfg.prefix
+        )
+    raise ValueError(f"Unknown state backend {cfg.url!r}")
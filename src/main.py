@@ -1,32 +1,184 @@
+import asyncio
+import logging
+import time
+
 import uvicorn
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
 from core.settings import settings
-from core.db_manager import DataBaseManager
+from core.db_manager import DataBaseManager, pool_limits
+from core.sql_stats import sql_stats
+from core.tracing import tracing
+from core.metrics import STARTUP_SECONDS
+from core.responses import FastJSONResponse
+from core.security import pwd_hasher
+from apps.auth.utils import jwt_util
+from apps.auth.throttling import login_limiter
+from apps.auth.revocation import revoked_before, token_versions
+from apps.auth.revoke_jobs import RevokeAllJobs
+from apps.users.rehash import RehashQueue
+from apps.audit.writer import AuditWriter
+from apps.users.cache import user_cache, unknown_emails
+from infra.state import open_state
 
+from api.middlewares import MetricsMiddleware, TracingMiddleware, ProfilingMiddleware
+from api.ops.views import router as ops_router, register_app_metrics
 from api.v1.ruotings import router as router_v1
-from api.v1.errors import user_errors_handlers, auth_errors_handlers
+from api.v1.errors import (
+    user_errors_handlers,
+    auth_errors_handlers,
+    admin_errors_handlers,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def warmup() -> None:
+    # ленивые синглтоны — до готовности пода, а не на первом логине/refresh
+    jwt_util.load_keys()
+    pwd_hasher.warmup()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    tracing.setup(settings.TRACING)
+
+    # калибровка cost хеширования под железо пода (опционально);
+    # под server.py её уже выполнил мастер-процесс
+    if settings.PASSWORD.calibrate:
+        from core.hash_calibration import (
+            calibrate,
+            apply_calibration,
+            exported_result,
+        )
+
+        stage = time.perf_counter()
+        result = exported_result() or await asyncio.to_thread(
+            calibrate, settings.PASSWORD
+        )
+        apply_calibration(pwd_hasher, result, settings.PASSWORD)
+        STARTUP_SECONDS.set(time.perf_counter() - stage, stage="calibration")
+        logger.info("Password hashing calibrated: %s", result.as_dict())
+
+    stage = time.perf_counter()
+    await asyncio.to_thread(warmup)
+    STARTUP_SECONDS.set(time.perf_counter() - stage, stage="warmup")
+
     # старт приложения: создаём engine + фабрику сессий
+    pool_size, max_overflow = pool_limits(
+        settings.DATABASE, settings.SERVICE_WORKERS or 1
+    )
     app.state.db = DataBaseManager(
-        url=settings.DATABASE.url, echo=settings.DATABASE.ECHO
+        url=settings.DATABASE.url,
+        echo=settings.DATABASE.ECHO,
+        sql_stats=sql_stats if settings.DATABASE.SQL_STATS else None,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+    )
+    # readiness: без ответа БД воркер не начнёт принимать соединения
+    if settings.DATABASE.WAIT_ON_STARTUP:
+        stage = time.perf_counter()
+        await app.state.db.wait_ready(settings.DATABASE.STARTUP_TIMEOUT)
+        STARTUP_SECONDS.set(time.perf_counter() - stage, stage="db")
+    # фоновое перехеширование паролей (мягкая миграция)
+    app.state.rehash_queue = RehashQueue(
+        app.state.db.session_factory,
+        maxsize=settings.PASSWORD.rehash_queue_size,
+        workers=settings.PASSWORD.rehash_workers,
+    )
+    await app.state.rehash_queue.start()
+    # журнал событий auth: пачками в фоне, вне транзакций запросов
+    app.state.audit = None
+    if settings.AUDIT.enabled:
+        app.state.audit = AuditWriter(
+            app.state.db.session_factory,
+            maxsize=settings.AUDIT.queue_size,
+            batch_size=settings.AUDIT.batch_size,
+            flush_interval=settings.AUDIT.flush_interval_ms / 1000,
+            policy=settings.AUDIT.overflow,
+            partitions_ahead=settings.AUDIT.partitions_ahead,
+            partitions_interval=settings.AUDIT.partitions_interval_sec,
+        )
+        await app.state.audit.start()
+    # глобальный выход пачками (REVOKE_ALL_MODE=chunked)
+    app.state.revoke_jobs = RevokeAllJobs(
+        app.state.db.session_factory,
+        batch_size=settings.REVOKE_ALL.batch_size,
+        pause=settings.REVOKE_ALL.pause_ms / 1000,
+        status_ttl=settings.REVOKE_ALL.status_ttl,
     )
+    # общее состояние: при общем бэкенде кэш профилей и корзины лимитов — в нём,
+    # иначе остаются свои в каждом воркере
+    app.state.state = open_state(settings.STATE)
+    if not app.state.state.local:
+        user_cache.use_backend(app.state.state)
+        unknown_emails.use_backend(app.state.state)
+        token_versions.use_backend(app.state.state)
+        revoked_before.use_backend(app.state.state)
+        app.state.revoke_jobs.use_backend(app.state.state)
+        login_limiter.use_buckets(app.state.state.buckets)
+    elif (settings.SERVICE_WORKERS or 1) > 1:
+        # статус задачи остался бы в одном воркере: Location из 202 отдавал бы 404
+        if settings.REVOKE_ALL.mode == "chunked":
+            raise RuntimeError(
+                "REVOKE_ALL_MODE=chunked with several workers requires a shared "
+                "STATE_BACKEND_URL (redis://...)"
+            )
+        # register() другого воркера не удалит адрес из этого кэша
+        unknown_emails.enabled = False
+        # выход на другом воркере сюда не доходит: задержка отзыва — не больше TTL версий
+        token_versions.ttl = min(
+            token_versions.ttl, settings.CACHE.token_version_local_ttl
+        )
+        logger.warning(
+            "STATE_BACKEND_URL=%s with %d workers: caches, login rate limits and "
+            "token versions are per worker (limits multiply, revocations reach other "
+            "workers within %.1fs, unknown-email cache disabled); "
+            "set a shared backend (redis://...)",
+            settings.STATE.url,
+            settings.SERVICE_WORKERS,
+            token_versions.ttl,
+        )
+    register_app_metrics(app)
+    STARTUP_SECONDS.set(time.perf_counter() - started, stage="lifespan")
+    logger.info("Startup took %.3fs", time.perf_counter() - started)
     try:
         yield
     finally:
+        await app.state.rehash_queue.stop()
+        await app.state.revoke_jobs.stop()
+        if app.state.audit is not None:
+            await app.state.audit.stop()
+        user_cache.use_backend(None)
+        unknown_emails.use_backend(None)
+        token_versions.use_backend(None)
+        revoked_before.use_backend(None)
+        app.state.revoke_jobs.use_backend(None)
+        login_limiter.use_buckets(None)
+        await app.state.state.aclose()
+        pwd_hasher.shutdown()
         # закрываем пул соединений
         await app.state.db.dispose()
+        tracing.shutdown()
 
 
-app = FastAPI(title="Auth Service", lifespan=lifespan)
+app = FastAPI(
+    title="Auth Service",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+app.include_router(router=ops_router)
 app.include_router(router=router_v1, prefix=settings.API_V1_PREFIX)
 user_errors_handlers.register_on_app(app)
 auth_errors_handlers.register_on_app(app)
+admin_errors_handlers.register_on_app(app)
 
 
 @app.get("/")
@@ -40,4 +192,6 @@ if __name__ == "__main__":
         host=settings.SERVICE_HOST,
         port=settings.SERVICE_PORT,
         reload=settings.SERVICE_RELOAD,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVICE_FORWARDED_ALLOW_IPS,
     )
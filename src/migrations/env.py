@@ -22,12 +22,29 @@ from core.models_mixins import Base
 # ВАЖНО: импортировать модели, чтобы они попали в Base.metadata
 from apps.users import models as users_models
 from apps.auth import models as auth_models
+from apps.audit import models as audit_models
 
 target_metadata = Base.metadata
 
 # Подставляем URL БД из настроек в конфиг
 config.set_main_option("sqlalchemy.url", settings.DATABASE.url)
 
+# секции auditevents (DEFAULT из миграции и месячные от AuditWriter) в моделях не описаны
+AUDIT_PARTITION_PREFIX = f"{audit_models.AuditEvents.__tablename__}_"
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Не сравнивать с моделями секции auditevents и их индексы — иначе autogenerate их удалит."""
+    table = object if type_ == "table" else getattr(object, "table", None)
+    if (
+        reflected
+        and compare_to is None
+        and table is not None
+        and table.name.startswith(AUDIT_PARTITION_PREFIX)
+    ):
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     """Генерация SQL без подключения к БД."""
@@ -39,6 +56,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -50,6 +68,7 @@ def do_run_migrations(connection: Connection) -> None:
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,59 @@
+"""partial indexes: active sessions / refresh tokens by user
+
+Revision ID: 3f9a1c2e7b4d
+Revises: b791a564d5ca
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2e7b4d'
+down_revision: Union[str, Sequence[str], None] = 'b791a564d5ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY — без блокировки записи в живые таблицы; вне транзакции миграции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_auth_sessions_user_active',
+            'authsessions',
+            ['user_id'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_refresh_tokens_user_active',
+            'refreshtokens',
+            ['user_id'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_refresh_tokens_user_active',
+            table_name='refreshtokens',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_auth_sessions_user_active',
+            table_name='authsessions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
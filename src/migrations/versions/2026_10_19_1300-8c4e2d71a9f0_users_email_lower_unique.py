@@ -0,0 +1,69 @@
+"""users: case-insensitive unique email (lower(email))
+
+Revision ID: 8c4e2d71a9f0
+Revises: 3f9a1c2e7b4d
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2d71a9f0'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2e7b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # адреса, различающиеся только регистром, уникальный индекс не пропустит —
+    # такие аккаунты нужно слить вручную до миграции
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+        )
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"users.email has case-insensitive duplicates, resolve them first: {duplicates}"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # точный unique-индекс больше не нужен: lower(email) строже
+        op.drop_index(
+            'ix_users_email',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email',
+            'users',
+            ['email'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ux_users_email_lower',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
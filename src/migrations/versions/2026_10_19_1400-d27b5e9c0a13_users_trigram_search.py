@@ -0,0 +1,61 @@
+"""users: pg_trgm GIN indexes for admin search
+
+Revision ID: d27b5e9c0a13
+Revises: 8c4e2d71a9f0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27b5e9c0a13'
+down_revision: Union[str, Sequence[str], None] = '8c4e2d71a9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # расширение — из contrib; роли миграций нужны права CREATE на базу
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_trgm',
+            'users',
+            [sa.text('lower(email) gin_trgm_ops')],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_full_name_trgm',
+            'users',
+            [sa.text('lower(full_name) gin_trgm_ops')],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_full_name_trgm',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_users_email_trgm',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    # pg_trgm не удаляем: им могут пользоваться другие схемы базы
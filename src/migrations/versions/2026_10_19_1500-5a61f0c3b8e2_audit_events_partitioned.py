@@ -0,0 +1,46 @@
+"""audit events: append-only table partitioned by month
+
+Revision ID: 5a61f0c3b8e2
+Revises: d27b5e9c0a13
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5a61f0c3b8e2'
+down_revision: Union[str, Sequence[str], None] = 'd27b5e9c0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auditevents',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('event', sa.Enum('LOGIN', 'REFRESH', 'LOGOUT', 'LOGOUT_ALL', 'REUSE_DETECTED', 'PASSWORD_CHANGE', name='audit_event_enum'), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=True),
+    sa.Column('session_id', sa.UUID(), nullable=True),
+    sa.Column('ip_address', postgresql.INET(), nullable=True),
+    sa.Column('user_agent', sa.String(length=255), nullable=True),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)',
+    )
+    op.create_index('ix_audit_events_user', 'auditevents', ['user_id', 'occurred_at'], unique=False)
+    # месячные секции создаёт AuditWriter (AUDIT_PARTITIONS_AHEAD);
+    # DEFAULT — страховка, чтобы вставка не падала, если секции месяца ещё нет
+    op.execute('CREATE TABLE auditevents_default PARTITION OF auditevents DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # секции удаляются вместе с родительской таблицей
+    op.drop_index('ix_audit_events_user', table_name='auditevents')
+    op.drop_table('auditevents')
+    sa.Enum(name='audit_event_enum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""users.token_version: per-user token epoch (ver claim)
+
+Revision ID: 9e3b7c4a2f61
+Revises: 5a61f0c3b8e2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b7c4a2f61'
+down_revision: Union[str, Sequence[str], None] = '5a61f0c3b8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # константный DEFAULT (PostgreSQL 11+) — только метаданные, без перезаписи таблицы;
+    # уже выданные токены без ver считаются версией 0 и остаются валидными
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,80 @@
+"""
+Прод-запуск: несколько воркеров uvicorn на одном сокете.
+
+    python -m server                              # из src/ (в образе PYTHONPATH=/app/src)
+    python -m server --workers 4 --port 9998
+
+bcrypt/argon2 и подпись RS256 упираются в CPU, а один процесс Python занимает одно ядро,
+поэтому под запускает SERVICE_WORKERS воркеров (по умолчанию — по числу CPU):
+- пул БД воркера считается из DB_CONNECTION_BUDGET (db_manager.pool_limits) —
+  сумма соединений пода не выходит за бюджет;
+- каждый воркер принимает трафик только после ping'а своего engine
+  (DB_WAIT_ON_STARTUP, здесь включён по умолчанию); до этого запросы берут готовые воркеры;
+- калибровка хеширования (PWD_CALIBRATE=1) выполняется один раз здесь, воркеры получают результат;
+- SIGHUP — поочерёдный рестарт воркеров (каждый дорабатывает запросы до
+  SERVICE_GRACEFUL_TIMEOUT), SIGTERM/SIGINT — остановка; упавший воркер поднимается заново.
+
+Для разработки — `python main.py` (один процесс, SERVICE_RELOAD).
+"""
+
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from core.settings import settings
+from core.db_manager import pool_limits
+
+
+logger = logging.getLogger("server")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Auth Service with N workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=settings.SERVICE_PORT or 9998)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVICE_WORKERS or os.cpu_count() or 1,
+        help="число воркеров (по умолчанию SERVICE_WORKERS или число CPU)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    # воркеры стартуют через spawn и читают настройки заново — передаём через окружение
+    os.environ["SERVICE_WORKERS"] = str(args.workers)
+    if "WAIT_ON_STARTUP" not in settings.DATABASE.model_fields_set:
+        os.environ["DB_WAIT_ON_STARTUP"] = "1"
+
+    if settings.PASSWORD.calibrate:
+        from core.hash_calibration import calibrate, export_result
+
+        result = calibrate(settings.PASSWORD)
+        export_result(result)
+        logger.info("Password hashing calibrated: %s", result.as_dict())
+
+    pool_size, max_overflow = pool_limits(settings.DATABASE, args.workers)
+    logger.info(
+        "Starting %d worker(s): DB pool %d + overflow %d per worker (up to %d connections)",
+        args.workers,
+        pool_size,
+        max_overflow,
+        (pool_size + max_overflow) * args.workers,
+    )
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",  # ошибка старта (нет БД) роняет воркер, а не открывает его для трафика
+        timeout_graceful_shutdown=settings.SERVICE_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVICE_FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()